@@ -2,4 +2,5 @@
 
 pytest_plugins = [
     "qa_tests.fixtures",
+    "qa_tests.slo",
 ]
@@ -0,0 +1,919 @@
+"""Асинхронные Client Object для REST API (на базе httpx).
+
+Повторяют набор методов клиентов из http_client.py и возвращают тот же ApiResponse,
+но не блокируют event loop: один loop может одновременно вести тысячи REST-вызовов
+и WebSocket-соединения.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass, field
+from http.cookiejar import CookieJar, DefaultCookiePolicy
+from pathlib import Path
+from typing import Any, AsyncIterator, ClassVar, Dict, Optional, Sequence, Union
+
+import httpx
+
+from .circuit_breaker import breaker_for
+from .config import ApiPaths
+from .http_client import STREAM_CHUNK_SIZE, ApiResponse, history_path, search_path, tickets_path
+from .json_stream import ArrayItemDecoder
+from .logging_utils import get_logger
+from .metrics import measure_request
+from .retry import RetryConfig, retry_on_exceptions
+
+logger = get_logger(__name__)
+
+
+def _build_client(pool_size: int) -> httpx.AsyncClient:
+    """Создаёт httpx.AsyncClient с пулом keep-alive соединений заданного размера."""
+    # Как и в синхронных клиентах, cookies между вызовами не сохраняются
+    cookies = httpx.Cookies(CookieJar(policy=DefaultCookiePolicy(allowed_domains=[])))
+    return httpx.AsyncClient(
+        cookies=cookies,
+        limits=httpx.Limits(max_connections=pool_size, max_keepalive_connections=pool_size),
+        # pool=None: при тысячах конкурентных вызовов запросы ждут свободное соединение,
+        # а не падают с PoolTimeout
+        timeout=httpx.Timeout(10.0, pool=None),
+    )
+
+
+@dataclass
+class AsyncBaseApiClient:
+    base_url: str
+    default_headers: Optional[Dict[str, str]] = None
+    pool_size: int = 10
+    # Отпускать тело ответа (ApiResponse.raw) после разбора JSON — для потоков в миллионы ответов
+    release_raw: bool = False
+
+    # Метка service в метриках задержек; наследники задают имя своего сервиса
+    service_name: ClassVar[str] = "api"
+
+    _client: Optional[httpx.AsyncClient] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    _client_loop: Optional[asyncio.AbstractEventLoop] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
+    def _http(self) -> httpx.AsyncClient:
+        """Пул соединений клиента, привязанный к текущему event loop.
+
+        pytest-asyncio может создавать новый loop на каждый тест: соединения старого
+        loop использовать нельзя, поэтому для нового loop создаётся новый пул.
+        """
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._client_loop is not loop:
+            self._release_foreign()
+            self._client = _build_client(self.pool_size)
+            self._client_loop = loop
+        return self._client
+
+    def _release_foreign(self) -> None:
+        """Отпускает пул, созданный в другом event loop.
+
+        Соединения httpx привязаны к своему loop: если он ещё работает (в другом потоке),
+        пул закрывается в нём; закрыть пул остановленного loop нельзя — утечка логируется.
+        """
+        client, loop = self._client, self._client_loop
+        self._client, self._client_loop = None, None
+        if client is None or loop is None:
+            return
+        if loop.is_running() and not loop.is_closed():
+            asyncio.run_coroutine_threadsafe(client.aclose(), loop)
+            return
+        logger.warning(
+            "Async HTTP client pool left open: its event loop is no longer running",
+            extra={"base_url": self.base_url},
+        )
+
+    async def aclose(self) -> None:
+        """Закрывает соединения пула (пул другого event loop — через _release_foreign)."""
+        if self._client is not None and self._client_loop is asyncio.get_running_loop():
+            client, self._client, self._client_loop = self._client, None, None
+            await client.aclose()
+            return
+        self._release_foreign()
+
+    async def __aenter__(self) -> "AsyncBaseApiClient":
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        await self.aclose()
+
+    def _url(self, path: str) -> str:
+        if path.startswith("http://") or path.startswith("https://"):
+            return path
+        return f"{self.base_url.rstrip('/')}/{path.lstrip('/')}"
+
+    @retry_on_exceptions(exceptions=[httpx.TransportError], config=RetryConfig())
+    async def _request(
+        self,
+        method: str,
+        path: str,
+        *,
+        json_body: Optional[Dict[str, Any]] = None,
+        headers: Optional[Dict[str, str]] = None,
+        expected_status: Optional[Union[int, Sequence[int]]] = None,
+    ) -> ApiResponse:
+        url = self._url(path)
+        merged_headers = {**(self.default_headers or {}), **(headers or {})}
+
+        resp_status = "unknown"
+
+        def get_status() -> str:
+            return resp_status
+
+        logger.info(
+            "HTTP request started",
+            extra={
+                "method": method.upper(),
+                "url": url,
+                "path": path,
+                "operation": f"{method.upper()} {path}",
+            },
+        )
+
+        # Общий с синхронными клиентами автомат по base_url (circuit_breaker.py)
+        with (
+            breaker_for(self.base_url).guard((httpx.TransportError,)),
+            measure_request(self.service_name, f"{method.upper()} {path}", get_status),
+        ):
+            resp = await self._http().request(method, url, json=json_body, headers=merged_headers)
+            resp_status = str(resp.status_code)
+
+        if expected_status is not None:
+            allowed = (
+                (expected_status,) if isinstance(expected_status, int) else tuple(expected_status)
+            )
+            if resp.status_code not in allowed:
+                logger.error(
+                    "Unexpected status code",
+                    extra={
+                        "url": url,
+                        "method": method,
+                        "expected_status": expected_status,
+                        "actual_status": resp.status_code,
+                        "body": resp.text,
+                    },
+                )
+
+        return ApiResponse(resp.status_code, resp, release_raw=self.release_raw)
+
+    async def get(self, path: str, **kwargs: Any) -> ApiResponse:
+        """GET запрос по относительному path (например /health, /ready)."""
+        return await self._request("GET", path, **kwargs)
+
+    @retry_on_exceptions(exceptions=[httpx.TransportError], config=RetryConfig())
+    async def _open_stream(self, path: str) -> httpx.Response:
+        """GET path без чтения тела; метрика STREAM <path> — время до заголовков ответа."""
+        url = self._url(path)
+        resp_status = "unknown"
+
+        def get_status() -> str:
+            return resp_status
+
+        logger.info(
+            "HTTP request started",
+            extra={"method": "GET", "url": url, "path": path, "operation": f"STREAM {path}"},
+        )
+        http = self._http()
+        with (
+            breaker_for(self.base_url).guard((httpx.TransportError,)),
+            measure_request(self.service_name, f"STREAM {path}", get_status),
+        ):
+            request = http.build_request("GET", url, headers=self.default_headers)
+            resp = await http.send(request, stream=True)
+            resp_status = str(resp.status_code)
+        return resp
+
+
+class AsyncItemStream:
+    """Асинхронный аналог http_client.ItemStream: элементы массива key по мере прихода.
+
+    Запрос отправляется при входе в ``async with`` (или с первым элементом ``async for``):
+
+        async with client.iter_tickets(limit=100_000) as tickets:
+            assert tickets.status_code == 200
+            async for ticket in tickets:
+                ...
+    """
+
+    def __init__(
+        self, client: AsyncBaseApiClient, path: str, key: str, chunk_size: int = STREAM_CHUNK_SIZE
+    ) -> None:
+        self.client = client
+        self.path = path
+        self.key = key
+        self.status_code: Optional[int] = None
+        self.headers: Optional[httpx.Headers] = None
+        # Прочитано байт тела
+        self.size = 0
+        self._chunk_size = chunk_size
+        self._decoder = ArrayItemDecoder(key)
+        self._resp: Optional[httpx.Response] = None
+
+    @property
+    def items(self) -> int:
+        """Сколько элементов уже отдано."""
+        return self._decoder.items
+
+    async def open(self) -> "AsyncItemStream":
+        if self._resp is None:
+            self._resp = await self.client._open_stream(self.path)
+            self.status_code = self._resp.status_code
+            self.headers = self._resp.headers
+        return self
+
+    def __aiter__(self) -> AsyncIterator[Any]:
+        return self._iter_items()
+
+    async def _iter_items(self) -> AsyncIterator[Any]:
+        try:
+            await self.open()
+            assert self._resp is not None
+            if self.status_code != 200:
+                body = (await self._resp.aread())[:500].decode("utf-8", "replace")
+                raise RuntimeError(f"Cannot stream {self.key!r}: HTTP {self.status_code}: {body}")
+            async for chunk in self._resp.aiter_bytes(self._chunk_size):
+                self.size += len(chunk)
+                for item in self._decoder.feed(chunk):
+                    yield item
+            for item in self._decoder.close():
+                yield item
+        finally:
+            await self.aclose()
+
+    async def aclose(self) -> None:
+        if self._resp is not None:
+            await self._resp.aclose()
+
+    async def __aenter__(self) -> "AsyncItemStream":
+        return await self.open()
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        await self.aclose()
+
+
+class AsyncApiGatewayClient(AsyncBaseApiClient):
+    """Client Object для API Gateway. Пути эндпоинтов задаются через api_paths (из конфига)."""
+
+    service_name = "api_gateway"
+
+    def __init__(
+        self,
+        base_url: str,
+        default_headers: Optional[Dict[str, str]] = None,
+        api_paths: Optional[ApiPaths] = None,
+        pool_size: int = 10,
+        release_raw: bool = False,
+    ) -> None:
+        super().__init__(
+            base_url=base_url,
+            default_headers=default_headers,
+            pool_size=pool_size,
+            release_raw=release_raw,
+        )
+        self._paths = api_paths
+
+    def _p(self, key: str, **kwargs: str) -> str:
+        if self._paths is None:
+            raise ValueError("AsyncApiGatewayClient requires api_paths")
+        path = getattr(self._paths, key)
+        return str(path.format(**kwargs)) if kwargs else path
+
+    async def register_user(self, payload: Dict[str, Any]) -> ApiResponse:
+        # User Service возвращает 200, классический REST — 201
+        return await self._request(
+            "POST", self._p("users_register"), json_body=payload, expected_status=(200, 201)
+        )
+
+    async def authenticate(self, payload: Dict[str, Any]) -> ApiResponse:
+        return await self._request(
+            "POST", self._p("auth_login"), json_body=payload, expected_status=200
+        )
+
+    async def auth_refresh(self, payload: Dict[str, Any]) -> ApiResponse:
+        return await self._request(
+            "POST", self._p("auth_refresh"), json_body=payload, expected_status=200
+        )
+
+    async def auth_logout(self, token: str) -> ApiResponse:
+        # Сервис может вернуть 200 или 204
+        return await self._request(
+            "POST",
+            self._p("auth_logout"),
+            headers={"Authorization": f"Bearer {token}"},
+            expected_status=(200, 204),
+        )
+
+    async def get_me(self, token: str) -> ApiResponse:
+        return await self._request(
+            "GET",
+            self._p("users_me"),
+            headers={"Authorization": f"Bearer {token}"},
+            expected_status=200,
+        )
+
+    async def update_me(self, token: str, payload: Dict[str, Any]) -> ApiResponse:
+        return await self._request(
+            "PUT",
+            self._p("users_me"),
+            json_body=payload,
+            headers={"Authorization": f"Bearer {token}"},
+            expected_status=200,
+        )
+
+    async def get_user(self, token: str, user_id: str) -> ApiResponse:
+        return await self._request(
+            "GET",
+            self._p("users_by_id", id=user_id),
+            headers={"Authorization": f"Bearer {token}"},
+            expected_status=200,
+        )
+
+    async def update_user_by_id(
+        self, token: str, user_id: str, payload: Dict[str, Any]
+    ) -> ApiResponse:
+        return await self._request(
+            "PUT",
+            self._p("users_by_id", id=user_id),
+            json_body=payload,
+            headers={"Authorization": f"Bearer {token}"},
+            expected_status=200,
+        )
+
+    async def delete_user(self, token: str, user_id: str) -> ApiResponse:
+        return await self._request(
+            "DELETE",
+            self._p("users_by_id", id=user_id),
+            headers={"Authorization": f"Bearer {token}"},
+            expected_status=(200, 204),
+        )
+
+    async def update_presence(self, token: str, user_id: str, is_online: bool) -> ApiResponse:
+        return await self._request(
+            "PUT",
+            self._p("users_presence", user_id=user_id),
+            json_body={"is_online": is_online},
+            headers={"Authorization": f"Bearer {token}"},
+            expected_status=200,
+        )
+
+    async def list_user_sessions(
+        self,
+        token: str,
+        user_id: str,
+        limit: Optional[int] = None,
+        offset: Optional[int] = None,
+    ) -> ApiResponse:
+        path = self._p("users_sessions", id=user_id)
+        if limit is not None or offset is not None:
+            parts = []
+            if limit is not None:
+                parts.append(f"limit={limit}")
+            if offset is not None:
+                parts.append(f"offset={offset}")
+            path = f"{path}?{'&'.join(parts)}"
+        return await self._request(
+            "GET",
+            path,
+            headers={"Authorization": f"Bearer {token}"},
+            expected_status=200,
+        )
+
+    async def list_active_sessions(self, token: str, user_id: str) -> ApiResponse:
+        return await self._request(
+            "GET",
+            self._p("users_active_sessions", id=user_id),
+            headers={"Authorization": f"Bearer {token}"},
+            expected_status=200,
+        )
+
+    async def create_session(
+        self, token: str, user_id: str, payload: Dict[str, Any]
+    ) -> ApiResponse:
+        # Сервис может вернуть 200 или 201
+        return await self._request(
+            "POST",
+            self._p("users_sessions", id=user_id),
+            json_body=payload,
+            headers={"Authorization": f"Bearer {token}"},
+            expected_status=(200, 201),
+        )
+
+    async def validate_session(self, payload: Dict[str, Any]) -> ApiResponse:
+        return await self._request(
+            "POST",
+            self._p("sessions_validate"),
+            json_body=payload,
+            expected_status=200,
+        )
+
+    async def operators_available(
+        self,
+        limit: Optional[int] = None,
+        offset: Optional[int] = None,
+    ) -> ApiResponse:
+        path = self._p("operators_available")
+        if limit is not None or offset is not None:
+            parts = []
+            if limit is not None:
+                parts.append(f"limit={limit}")
+            if offset is not None:
+                parts.append(f"offset={offset}")
+            path = f"{path}?{'&'.join(parts)}"
+        return await self._request("GET", path, expected_status=200)
+
+    async def operators_availability(self, token: str, available: bool) -> ApiResponse:
+        return await self._request(
+            "PUT",
+            self._p("operators_availability"),
+            json_body={"available": available},
+            headers={"Authorization": f"Bearer {token}"},
+            expected_status=200,
+        )
+
+    async def operators_stats(self) -> ApiResponse:
+        return await self._request("GET", self._p("operators_stats"), expected_status=200)
+
+    async def operators_verify(self, token: str, operator_id: str, status: str) -> ApiResponse:
+        return await self._request(
+            "POST",
+            self._p("operators_verify", id=operator_id),
+            json_body={"status": status},
+            headers={"Authorization": f"Bearer {token}"},
+            expected_status=200,
+        )
+
+    async def operators_availability_by_id(
+        self, token: str, user_id: str, is_available: bool
+    ) -> ApiResponse:
+        return await self._request(
+            "PUT",
+            self._p("operators_availability_by_id", user_id=user_id),
+            json_body={"is_available": is_available},
+            headers={"Authorization": f"Bearer {token}"},
+            expected_status=200,
+        )
+
+    async def create_video_session(self, token: str, payload: Dict[str, Any]) -> ApiResponse:
+        headers = {"Authorization": f"Bearer {token}"}
+        return await self._request(
+            "POST",
+            self._p("video_sessions"),
+            json_body=payload,
+            headers=headers,
+            expected_status=201,
+        )
+
+    async def join_video_session(
+        self, token: str, session_id: str, operator_id: str
+    ) -> ApiResponse:
+        headers = {"Authorization": f"Bearer {token}"}
+        return await self._request(
+            "POST",
+            self._p("video_sessions_join", session_id=session_id),
+            json_body={"operator_id": operator_id},
+            headers=headers,
+            expected_status=200,
+        )
+
+    async def rate_limited_endpoint(self, token: str) -> ApiResponse:
+        headers = {"Authorization": f"Bearer {token}"}
+        return await self._request("GET", self._p("limits_rate_limited"), headers=headers)
+
+
+class AsyncUserServiceClient(AsyncBaseApiClient):
+    """Client Object для пользовательского сервиса.
+
+    В большинстве сценариев доступ к нему идёт через API Gateway, но прямой клиент
+    может быть полезен для health-check и подготовки данных.
+    """
+
+    service_name = "user"
+
+    async def health(self) -> ApiResponse:
+        return await self.get("/health")
+
+    async def ready(self) -> ApiResponse:
+        return await self.get("/ready")
+
+
+class AsyncStreamingServiceClient(AsyncBaseApiClient):
+    """Client Object для микросервиса streaming-service (REST часть).
+
+    Используется для создания/завершения сессий и чтения операторов.
+    """
+
+    service_name = "streaming"
+
+    async def health(self) -> ApiResponse:
+        return await self.get("/health")
+
+    async def ready(self) -> ApiResponse:
+        return await self.get("/ready")
+
+    async def create_session(self, client_id: str) -> ApiResponse:
+        payload: Dict[str, Any] = {"client_id": client_id}
+        # 201 — как указано в README streaming-service
+        return await self._request("POST", "/sessions", json_body=payload, expected_status=201)
+
+    async def delete_session(
+        self, session_id: str, *, x_user_id: Optional[str] = None
+    ) -> ApiResponse:
+        headers = {"X-User-ID": x_user_id} if x_user_id else None
+        return await self._request(
+            "DELETE",
+            f"/sessions/{session_id}",
+            headers=headers,
+            expected_status=(204, 404),
+        )
+
+    async def get_session_operators(
+        self, session_id: str, *, x_user_id: Optional[str] = None
+    ) -> ApiResponse:
+        headers = {"X-User-ID": x_user_id} if x_user_id else None
+        return await self._request(
+            "GET",
+            f"/sessions/{session_id}/operators",
+            headers=headers,
+            expected_status=(200, 404),
+        )
+
+
+class AsyncOperatorDirectoryServiceClient(AsyncBaseApiClient):
+    """Client для operator-directory-service: /health, /ready, /api/v1/operators (CRUD)."""
+
+    service_name = "operator_directory"
+
+    async def health(self) -> ApiResponse:
+        return await self.get("/health")
+
+    async def ready(self) -> ApiResponse:
+        return await self.get("/ready")
+
+    async def list_operators(
+        self,
+        region: Optional[str] = None,
+        role: Optional[str] = None,
+        status: Optional[str] = None,
+        limit: int = 20,
+        offset: int = 0,
+    ) -> ApiResponse:
+        params: Dict[str, Any] = {"limit": limit, "offset": offset}
+        if region is not None:
+            params["region"] = region
+        if role is not None:
+            params["role"] = role
+        if status is not None:
+            params["status"] = status
+        qs = "&".join(f"{k}={v}" for k, v in params.items())
+        path = f"/api/v1/operators?{qs}"
+        return await self._request("GET", path, expected_status=200)
+
+    async def get_operator(self, operator_id: str) -> ApiResponse:
+        return await self._request(
+            "GET",
+            f"/api/v1/operators/{operator_id}",
+            expected_status=(200, 400, 404),
+        )
+
+    async def create_operator(self, payload: Dict[str, Any]) -> ApiResponse:
+        return await self._request(
+            "POST",
+            "/api/v1/operators",
+            json_body=payload,
+            expected_status=(201, 400, 409),
+        )
+
+    async def update_operator(self, operator_id: str, payload: Dict[str, Any]) -> ApiResponse:
+        return await self._request(
+            "PUT",
+            f"/api/v1/operators/{operator_id}",
+            json_body=payload,
+            expected_status=(200, 400, 404),
+        )
+
+
+class AsyncOperatorPoolServiceClient(AsyncBaseApiClient):
+    """Client для operator-pool-service: /health, /ready, /operator/status, next, stats, list."""
+
+    service_name = "operator_pool"
+
+    async def health(self) -> ApiResponse:
+        return await self.get("/health")
+
+    async def ready(self) -> ApiResponse:
+        return await self.get("/ready")
+
+    async def set_status(self, payload: Dict[str, Any]) -> ApiResponse:
+        """POST /operator/status — user_id, available, max_sessions."""
+        return await self._request(
+            "POST",
+            "/operator/status",
+            json_body=payload,
+            expected_status=(200, 400, 500),
+        )
+
+    async def next_operator(self) -> ApiResponse:
+        """GET /operator/next — 200 { operator_id } или 404."""
+        return await self._request("GET", "/operator/next", expected_status=(200, 404, 500))
+
+    async def stats(self) -> ApiResponse:
+        """GET /operator/stats — 200 { available, total }."""
+        return await self._request("GET", "/operator/stats", expected_status=(200, 500))
+
+    async def list_operators(self) -> ApiResponse:
+        """GET /operator/list — 200 { operators: [...] }."""
+        return await self._request("GET", "/operator/list", expected_status=(200, 500))
+
+    def iter_operators(self) -> AsyncItemStream:
+        """GET /operator/list — операторы по мере чтения ответа."""
+        return AsyncItemStream(self, "/operator/list", "operators")
+
+
+class AsyncNotificationServiceClient(AsyncBaseApiClient):
+    """Client для notification-service: /health, /ready, POST /notify/session/:id."""
+
+    service_name = "notification"
+
+    async def health(self) -> ApiResponse:
+        return await self.get("/health")
+
+    async def ready(self) -> ApiResponse:
+        return await self.get("/ready")
+
+    async def notify_session(self, session_id: str, payload: Dict[str, Any]) -> ApiResponse:
+        """POST /notify/session/:id — body: event (required), payload (optional)."""
+        return await self._request(
+            "POST",
+            f"/notify/session/{session_id}",
+            json_body=payload,
+            expected_status=(200, 400),
+        )
+
+
+class AsyncSearchServiceClient(AsyncBaseApiClient):
+    """search-service: /health, /ready,
+    GET /search/tickets|sessions|operators, POST /search/index/*."""
+
+    service_name = "search"
+
+    async def health(self) -> ApiResponse:
+        return await self.get("/health")
+
+    async def ready(self) -> ApiResponse:
+        return await self.get("/ready")
+
+    async def search(
+        self,
+        query: str,
+        type_filter: Optional[str] = None,
+        limit: int = 20,
+        offset: int = 0,
+    ) -> ApiResponse:
+        """GET /search/{tickets|sessions|operators}?q=...; type_filter picks which."""
+        path = search_path(query, type_filter, limit, offset)
+        return await self._request("GET", path, expected_status=(200, 500))
+
+    async def index_ticket(self, payload: Dict[str, Any]) -> ApiResponse:
+        """POST /search/index/ticket."""
+        return await self._request(
+            "POST",
+            "/search/index/ticket",
+            json_body=payload,
+            expected_status=(200, 400, 500),
+        )
+
+    async def index_session(self, payload: Dict[str, Any]) -> ApiResponse:
+        """POST /search/index/session."""
+        return await self._request(
+            "POST",
+            "/search/index/session",
+            json_body=payload,
+            expected_status=(200, 400, 500),
+        )
+
+    async def index_operator(self, payload: Dict[str, Any]) -> ApiResponse:
+        """POST /search/index/operator."""
+        return await self._request(
+            "POST",
+            "/search/index/operator",
+            json_body=payload,
+            expected_status=(200, 400, 500),
+        )
+
+
+class AsyncTicketServiceClient(AsyncBaseApiClient):
+    """Client для ticket-service: /health, /ready, /api/v1/tickets (CRUD)."""
+
+    service_name = "ticket"
+
+    async def health(self) -> ApiResponse:
+        return await self.get("/health")
+
+    async def ready(self) -> ApiResponse:
+        return await self.get("/ready")
+
+    async def create_ticket(self, payload: Dict[str, Any]) -> ApiResponse:
+        """POST /api/v1/tickets — возвращает 201 Created."""
+        return await self._request(
+            "POST",
+            "/api/v1/tickets",
+            json_body=payload,
+            expected_status=(201, 400, 500),
+        )
+
+    async def get_ticket(self, ticket_id: str) -> ApiResponse:
+        """GET /api/v1/tickets/:id — id должен быть числом (uint64)."""
+        return await self._request(
+            "GET",
+            f"/api/v1/tickets/{ticket_id}",
+            expected_status=(200, 400, 404, 500),
+        )
+
+    async def list_tickets(
+        self,
+        limit: Optional[int] = None,
+        offset: Optional[int] = None,
+    ) -> ApiResponse:
+        """GET /api/v1/tickets?limit=...&offset=..."""
+        return await self._request("GET", tickets_path(limit, offset), expected_status=(200, 500))
+
+    def iter_tickets(
+        self,
+        limit: Optional[int] = None,
+        offset: Optional[int] = None,
+    ) -> AsyncItemStream:
+        """GET /api/v1/tickets — тикеты по мере чтения ответа."""
+        return AsyncItemStream(self, tickets_path(limit, offset), "tickets")
+
+    async def update_ticket(
+        self,
+        ticket_id: str,
+        payload: Dict[str, Any],
+        *,
+        caller_id: Optional[str] = None,
+    ) -> ApiResponse:
+        """PUT /api/v1/tickets/:id — id должен быть числом (uint64).
+        caller_id передаётся как Grpc-Metadata-X-Caller-Id для проверки прав
+        (клиент или оператор тикета)."""
+        # grpc-gateway forwards headers with prefix Grpc-Metadata- into gRPC
+        # metadata (key lowercased).
+        headers: Optional[Dict[str, str]] = None
+        if caller_id is not None:
+            headers = {"Grpc-Metadata-X-Caller-Id": caller_id}
+        return await self._request(
+            "PUT",
+            f"/api/v1/tickets/{ticket_id}",
+            json_body=payload,
+            headers=headers,
+            expected_status=(200, 400, 403, 404, 500),
+        )
+
+
+class AsyncDataChannelServiceClient(AsyncBaseApiClient):
+    """Client для data-channel-service: /health, /ready, GET /data/:session_id/history, POST /data/file."""  # noqa: E501
+
+    service_name = "data_channel"
+
+    async def health(self) -> ApiResponse:
+        return await self.get("/health")
+
+    async def ready(self) -> ApiResponse:
+        return await self.get("/ready")
+
+    async def get_history(
+        self,
+        session_id: str,
+        limit: Optional[int] = None,
+    ) -> ApiResponse:
+        """GET /data/:session_id/history?limit=..."""
+        return await self._request(
+            "GET", history_path(session_id, limit), expected_status=(200, 400, 500)
+        )
+
+    def iter_history(self, session_id: str, limit: Optional[int] = None) -> AsyncItemStream:
+        """GET /data/:session_id/history — сообщения по мере чтения ответа."""
+        return AsyncItemStream(self, history_path(session_id, limit), "messages")
+
+    async def upload_file(
+        self,
+        session_id: str,
+        user_id: str,
+        file_path: str,
+        filename: Optional[str] = None,
+    ) -> ApiResponse:
+        """POST /data/file — multipart/form-data с session_id, user_id, file."""
+        url = self._url("/data/file")
+        if filename is None:
+            filename = Path(file_path).name
+
+        with open(file_path, "rb") as f:
+            files = {"file": (filename, f, "application/octet-stream")}
+            data = {"session_id": session_id, "user_id": user_id}
+
+            resp_status = "unknown"
+
+            def get_status() -> str:
+                return resp_status
+
+            logger.info(
+                "HTTP request started",
+                extra={
+                    "method": "POST",
+                    "url": url,
+                    "path": "/data/file",
+                    "operation": "POST /data/file",
+                },
+            )
+
+            with measure_request(self.service_name, "POST /data/file", get_status):
+                resp = await self._http().post(url, files=files, data=data, timeout=30)
+                resp_status = str(resp.status_code)
+
+        return ApiResponse(resp.status_code, resp, release_raw=self.release_raw)
+
+
+class AsyncSessionManagerServiceClient(AsyncBaseApiClient):
+    """Client для session-manager-service: /health, /ready, POST /session, GET /session/{id}, GET /session/{id}/participants, POST /session/join, POST /session/{id}/invite, POST /session/{id}/control."""  # noqa: E501
+
+    service_name = "session_manager"
+
+    async def health(self) -> ApiResponse:
+        return await self.get("/health")
+
+    async def ready(self) -> ApiResponse:
+        return await self.get("/ready")
+
+    async def create_session(
+        self, client_id: str, stream_session_id: Optional[str] = None
+    ) -> ApiResponse:
+        """POST /session — создать сессию консультации."""
+        payload: Dict[str, Any] = {"clientId": client_id}
+        if stream_session_id:
+            payload["streamSessionId"] = stream_session_id
+        return await self._request(
+            "POST",
+            "/session",
+            json_body=payload,
+            expected_status=(200, 201, 400, 500),
+        )
+
+    async def get_session(self, session_id: str) -> ApiResponse:
+        """GET /session/{id} — получить сессию."""
+        return await self._request(
+            "GET",
+            f"/session/{session_id}",
+            expected_status=(200, 400, 404, 500),
+        )
+
+    async def get_participants(self, session_id: str) -> ApiResponse:
+        """GET /session/{id}/participants — получить участников сессии."""
+        return await self._request(
+            "GET",
+            f"/session/{session_id}/participants",
+            expected_status=(200, 400, 404, 500),
+        )
+
+    async def join_session(self, session_id: str, pin: str, user_id: str) -> ApiResponse:
+        """POST /session/join — присоединиться к сессии."""
+        payload: Dict[str, Any] = {
+            "sessionId": session_id,
+            "pin": pin,
+            "userId": user_id,
+        }
+        return await self._request(
+            "POST",
+            "/session/join",
+            json_body=payload,
+            expected_status=(200, 400, 404, 500),
+        )
+
+    async def invite_operator(self, session_id: str, operator_id: str) -> ApiResponse:
+        """POST /session/{id}/invite — пригласить оператора."""
+        payload: Dict[str, Any] = {"operatorId": operator_id}
+        return await self._request(
+            "POST",
+            f"/session/{session_id}/invite",
+            json_body=payload,
+            expected_status=(200, 400, 404, 500),
+        )
+
+    async def control_session(
+        self, session_id: str, action: str, caller_id: Optional[str] = None
+    ) -> ApiResponse:
+        """POST /session/{id}/control. Optional caller_id -> X-Caller-Id."""
+        payload: Dict[str, Any] = {"action": action}
+        headers: Optional[Dict[str, str]] = None
+        if caller_id is not None:
+            headers = {"X-Caller-Id": caller_id}
+        return await self._request(
+            "POST",
+            f"/session/{session_id}/control",
+            json_body=payload,
+            headers=headers,
+            expected_status=(200, 400, 403, 404, 500),
+        )
@@ -0,0 +1,481 @@
+"""Локальное хранилище результатов прогонов (SQLite) и сравнение прогонов между собой.
+
+В конце каждой сессии контроллер pytest сохраняет в ``BENCHMARK_DB``:
+
+- HDR-гистограммы задержек запросов по (service, operation, status);
+- длительности ``measure_test_case`` по (test_name, status).
+
+Прогон помечается окружением (``TestEnv``) и git-ревизией. Команда ``compare`` сравнивает
+два прогона одного окружения односторонним U-критерием Манна — Уитни по гистограммам
+и отмечает статистически значимые замедления:
+
+    python -m qa_tests.benchmark_store runs --env staging
+    python -m qa_tests.benchmark_store compare --env staging            # последний vs предыдущий
+    python -m qa_tests.benchmark_store compare --baseline 12 --candidate 15
+"""
+
+from __future__ import annotations
+
+import argparse
+import math
+import os
+import sqlite3
+import subprocess
+import sys
+import time
+from contextlib import closing
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from .config import TestEnv, get_settings
+from .hdr_histogram import LatencyHistogram
+from .logging_utils import get_logger
+from .metrics import LatencyKey, TestDurationKey
+
+logger = get_logger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    env TEXT NOT NULL,
+    git_revision TEXT NOT NULL,
+    started_at REAL NOT NULL,
+    label TEXT NOT NULL DEFAULT ''
+);
+CREATE INDEX IF NOT EXISTS runs_env_idx ON runs (env, id);
+CREATE TABLE IF NOT EXISTS request_latency (
+    run_id INTEGER NOT NULL REFERENCES runs (id) ON DELETE CASCADE,
+    service TEXT NOT NULL,
+    operation TEXT NOT NULL,
+    status TEXT NOT NULL,
+    count INTEGER NOT NULL,
+    mean_ms REAL NOT NULL,
+    p50_ms REAL NOT NULL,
+    p95_ms REAL NOT NULL,
+    p99_ms REAL NOT NULL,
+    max_ms REAL NOT NULL,
+    hdr TEXT NOT NULL,
+    PRIMARY KEY (run_id, service, operation, status)
+);
+CREATE TABLE IF NOT EXISTS test_durations (
+    run_id INTEGER NOT NULL REFERENCES runs (id) ON DELETE CASCADE,
+    test_name TEXT NOT NULL,
+    status TEXT NOT NULL,
+    count INTEGER NOT NULL,
+    mean_ms REAL NOT NULL,
+    p50_ms REAL NOT NULL,
+    max_ms REAL NOT NULL,
+    hdr TEXT NOT NULL,
+    PRIMARY KEY (run_id, test_name, status)
+);
+"""
+
+
+def current_git_revision() -> str:
+    """Ревизия тестируемого кода: GIT_REVISION / GITHUB_SHA, иначе HEAD текущего репозитория."""
+    for name in ("GIT_REVISION", "GITHUB_SHA"):
+        value = os.getenv(name)
+        if value:
+            return value
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            capture_output=True,
+            text=True,
+            timeout=5,
+            check=True,
+        )
+    except (OSError, subprocess.SubprocessError):
+        return "unknown"
+    return result.stdout.strip() or "unknown"
+
+
+@dataclass(frozen=True)
+class BenchmarkRun:
+    id: int
+    env: str
+    git_revision: str
+    started_at: float
+    label: str
+
+    def describe(self) -> str:
+        started = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(self.started_at))
+        label = f" [{self.label}]" if self.label else ""
+        return f"#{self.id} {self.env} {self.git_revision[:12]} {started}{label}"
+
+
+class BenchmarkStore:
+    """Файл SQLite с прогонами; схема создаётся при первом обращении."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+
+    def _connect(self) -> sqlite3.Connection:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(str(self.path), timeout=30)
+        conn.execute("PRAGMA foreign_keys = ON")
+        conn.executescript(_SCHEMA)
+        return conn
+
+    def save_run(
+        self,
+        env: TestEnv,
+        git_revision: str,
+        request_latency: Dict[LatencyKey, LatencyHistogram],
+        test_durations: Dict[TestDurationKey, LatencyHistogram],
+        label: str = "",
+        started_at: Optional[float] = None,
+    ) -> int:
+        """Сохраняет прогон целиком в одной транзакции и возвращает его id."""
+        with closing(self._connect()) as conn, conn:
+            cursor = conn.execute(
+                "INSERT INTO runs (env, git_revision, started_at, label) VALUES (?, ?, ?, ?)",
+                (env.value, git_revision, started_at or time.time(), label),
+            )
+            run_id = int(cursor.lastrowid or 0)
+            conn.executemany(
+                "INSERT INTO request_latency VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (
+                        run_id,
+                        service,
+                        operation,
+                        status,
+                        h.total_count,
+                        h.mean * 1000,
+                        h.value_at_percentile(50) * 1000,
+                        h.value_at_percentile(95) * 1000,
+                        h.value_at_percentile(99) * 1000,
+                        h.max * 1000,
+                        h.encode(),
+                    )
+                    for (service, operation, status), h in request_latency.items()
+                ],
+            )
+            conn.executemany(
+                "INSERT INTO test_durations VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (
+                        run_id,
+                        test_name,
+                        status,
+                        h.total_count,
+                        h.mean * 1000,
+                        h.value_at_percentile(50) * 1000,
+                        h.max * 1000,
+                        h.encode(),
+                    )
+                    for (test_name, status), h in test_durations.items()
+                ],
+            )
+        logger.info(
+            "Benchmark run saved",
+            extra={
+                "path": str(self.path),
+                "run_id": run_id,
+                "env": env.value,
+                "git_revision": git_revision,
+                "operations": len(request_latency),
+                "test_cases": len(test_durations),
+            },
+        )
+        return run_id
+
+    def runs(
+        self, env: Optional[str] = None, limit: int = 20, before_id: Optional[int] = None
+    ) -> List[BenchmarkRun]:
+        """Последние прогоны (новые первыми): при необходимости одного окружения и до before_id."""
+        query = "SELECT id, env, git_revision, started_at, label FROM runs"
+        conditions: List[str] = []
+        params: Tuple[object, ...] = ()
+        if env:
+            conditions.append("env = ?")
+            params += (env,)
+        if before_id is not None:
+            conditions.append("id < ?")
+            params += (before_id,)
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        query += " ORDER BY id DESC LIMIT ?"
+        with closing(self._connect()) as conn:
+            rows = conn.execute(query, (*params, limit)).fetchall()
+        return [BenchmarkRun(*row) for row in rows]
+
+    def get_run(self, run_id: int) -> BenchmarkRun:
+        with closing(self._connect()) as conn:
+            row = conn.execute(
+                "SELECT id, env, git_revision, started_at, label FROM runs WHERE id = ?",
+                (run_id,),
+            ).fetchone()
+        if row is None:
+            raise LookupError(f"Benchmark run #{run_id} not found in {self.path}")
+        return BenchmarkRun(*row)
+
+    def request_latency(self, run_id: int) -> Dict[LatencyKey, LatencyHistogram]:
+        with closing(self._connect()) as conn:
+            rows = conn.execute(
+                "SELECT service, operation, status, hdr FROM request_latency WHERE run_id = ?",
+                (run_id,),
+            ).fetchall()
+        return {(s, o, st): LatencyHistogram.decode(hdr) for s, o, st, hdr in rows}
+
+    def test_durations(self, run_id: int) -> Dict[TestDurationKey, LatencyHistogram]:
+        with closing(self._connect()) as conn:
+            rows = conn.execute(
+                "SELECT test_name, status, hdr FROM test_durations WHERE run_id = ?",
+                (run_id,),
+            ).fetchall()
+        return {(t, st): LatencyHistogram.decode(hdr) for t, st, hdr in rows}
+
+
+# --- сравнение прогонов ---
+
+
+def mann_whitney_greater(baseline: LatencyHistogram, candidate: LatencyHistogram) -> float:
+    """p-value одностороннего U-критерия: «задержки candidate стохастически больше baseline».
+
+    Ранги считаются прямо по бакетам гистограмм (значения одного бакета — связки),
+    дисперсия — с поправкой на связки, распределение U — нормальная аппроксимация.
+    """
+    n_base, n_cand = baseline.total_count, candidate.total_count
+    if n_base == 0 or n_cand == 0:
+        return 1.0
+    counts: Dict[float, List[int]] = {}
+    for value, count in baseline.iter_buckets():
+        counts.setdefault(value, [0, 0])[0] += count
+    for value, count in candidate.iter_buckets():
+        counts.setdefault(value, [0, 0])[1] += count
+
+    total = n_base + n_cand
+    rank_sum_cand = 0.0
+    tie_term = 0.0
+    seen = 0
+    for value in sorted(counts):
+        in_base, in_cand = counts[value]
+        ties = in_base + in_cand
+        rank_sum_cand += in_cand * (seen + (ties + 1) / 2)
+        tie_term += ties**3 - ties
+        seen += ties
+
+    u_cand = rank_sum_cand - n_cand * (n_cand + 1) / 2
+    mean = n_base * n_cand / 2
+    variance = n_base * n_cand / 12 * ((total + 1) - tie_term / (total * (total - 1) or 1))
+    if variance <= 0:
+        return 1.0
+    z = (u_cand - mean - 0.5) / math.sqrt(variance)
+    return 0.5 * math.erfc(z / math.sqrt(2))
+
+
+@dataclass(frozen=True)
+class Comparison:
+    kind: str  # "request" | "test"
+    name: str
+    baseline: Optional[LatencyHistogram]
+    candidate: Optional[LatencyHistogram]
+    p_value: Optional[float]
+    status: str  # REGRESSION | IMPROVED | OK | LOW DATA | NEW | MISSING
+
+    @property
+    def median_ratio(self) -> Optional[float]:
+        if self.baseline is None or self.candidate is None:
+            return None
+        base = self.baseline.value_at_percentile(50)
+        return self.candidate.value_at_percentile(50) / base if base > 0 else None
+
+
+def _merge_statuses(histograms: Dict[Any, LatencyHistogram]) -> Dict[str, LatencyHistogram]:
+    """Объединяет статусы: ключ без последнего элемента -> одна гистограмма."""
+    merged: Dict[str, LatencyHistogram] = {}
+    for key, histogram in histograms.items():
+        name = " ".join(key[:-1])
+        if name not in merged:
+            merged[name] = LatencyHistogram(histogram.significant_figures)
+        merged[name].merge(histogram)
+    return merged
+
+
+def _compare_one(
+    kind: str,
+    name: str,
+    baseline: Optional[LatencyHistogram],
+    candidate: Optional[LatencyHistogram],
+    alpha: float,
+    min_slowdown: float,
+    min_samples: int,
+) -> Comparison:
+    if baseline is None or candidate is None:
+        status = "NEW" if baseline is None else "MISSING"
+        return Comparison(kind, name, baseline, candidate, None, status)
+    if min(baseline.total_count, candidate.total_count) < min_samples:
+        return Comparison(kind, name, baseline, candidate, None, "LOW DATA")
+
+    p_slower = mann_whitney_greater(baseline, candidate)
+    p_faster = mann_whitney_greater(candidate, baseline)
+    base_median = baseline.value_at_percentile(50)
+    cand_median = candidate.value_at_percentile(50)
+    # Значимость без заметного размера эффекта (на больших выборках) не считается регрессией
+    if p_slower < alpha and cand_median >= base_median * (1 + min_slowdown):
+        return Comparison(kind, name, baseline, candidate, p_slower, "REGRESSION")
+    if p_faster < alpha and base_median >= cand_median * (1 + min_slowdown):
+        return Comparison(kind, name, baseline, candidate, p_faster, "IMPROVED")
+    return Comparison(kind, name, baseline, candidate, p_slower, "OK")
+
+
+def compare_runs(
+    store: BenchmarkStore,
+    baseline_id: int,
+    candidate_id: int,
+    *,
+    alpha: float = 0.01,
+    min_slowdown: float = 0.1,
+    min_samples: int = 20,
+) -> List[Comparison]:
+    """Сравнивает операции и тест-кейсы двух прогонов (статусы объединяются).
+
+    Замедление считается регрессией, если p-value < alpha и медиана выросла
+    не менее чем на min_slowdown (доля); операции с числом измерений меньше
+    min_samples хотя бы в одном прогоне помечаются LOW DATA.
+    """
+    results: List[Comparison] = []
+    pairs = (
+        ("request", store.request_latency(baseline_id), store.request_latency(candidate_id)),
+        ("test", store.test_durations(baseline_id), store.test_durations(candidate_id)),
+    )
+    for kind, base_raw, cand_raw in pairs:
+        base, cand = _merge_statuses(base_raw), _merge_statuses(cand_raw)
+        for name in sorted(set(base) | set(cand)):
+            results.append(
+                _compare_one(
+                    kind, name, base.get(name), cand.get(name), alpha, min_slowdown, min_samples
+                )
+            )
+    return results
+
+
+def _ms(histogram: Optional[LatencyHistogram], pct: float) -> str:
+    if histogram is None:
+        return "-"
+    return f"{histogram.value_at_percentile(pct) * 1000:.2f}"
+
+
+def format_comparison(results: Sequence[Comparison]) -> str:
+    """Текстовая таблица сравнения: медиана и p95 (мс) в обоих прогонах, p-value, статус."""
+    rows = [["status", "kind", "name", "n", "p50 base", "p50 new", "p95 base", "p95 new", "p"]]
+    for r in results:
+        counts = "/".join(str(h.total_count) if h else "0" for h in (r.baseline, r.candidate))
+        rows.append(
+            [
+                r.status,
+                r.kind,
+                r.name,
+                counts,
+                _ms(r.baseline, 50),
+                _ms(r.candidate, 50),
+                _ms(r.baseline, 95),
+                _ms(r.candidate, 95),
+                "-" if r.p_value is None else f"{r.p_value:.2g}",
+            ]
+        )
+    widths = [max(len(row[i]) for row in rows) for i in range(len(rows[0]))]
+    return "\n".join("  ".join(c.ljust(w) for c, w in zip(row, widths)).rstrip() for row in rows)
+
+
+# --- CLI ---
+
+
+def _default_store() -> BenchmarkStore:
+    path = get_settings().benchmark_db
+    if path is None:
+        raise SystemExit("BENCHMARK_DB is empty: pass --db explicitly")
+    return BenchmarkStore(path)
+
+
+def _pick_runs(
+    store: BenchmarkStore, args: argparse.Namespace
+) -> Tuple[BenchmarkRun, BenchmarkRun]:
+    """(baseline, candidate) для compare.
+
+    Оба id — как указаны; только --baseline — кандидат: последний прогон его окружения после
+    базового; только --candidate — базовый: предыдущий прогон окружения кандидата; без id —
+    два последних прогона.
+    """
+    if args.baseline is not None and args.candidate is not None:
+        return store.get_run(args.baseline), store.get_run(args.candidate)
+    if args.baseline is not None:
+        baseline = store.get_run(args.baseline)
+        env = args.env or baseline.env
+        newest = store.runs(env=env, limit=1)
+        if not newest or newest[0].id <= baseline.id:
+            raise SystemExit(f"No runs for env {env!r} after baseline #{baseline.id}")
+        return baseline, newest[0]
+    if args.candidate is not None:
+        candidate = store.get_run(args.candidate)
+        env = args.env or candidate.env
+        previous = store.runs(env=env, limit=1, before_id=candidate.id)
+        if not previous:
+            raise SystemExit(f"No runs for env {env!r} before candidate #{candidate.id}")
+        return previous[0], candidate
+    env = args.env or get_settings().env.value
+    recent = store.runs(env=env, limit=2)
+    if len(recent) < 2:
+        raise SystemExit(f"Need at least two runs for env {env!r} to compare")
+    return recent[1], recent[0]
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m qa_tests.benchmark_store",
+        description="Хранилище результатов прогонов и сравнение прогонов между собой",
+    )
+    parser.add_argument("--db", type=Path, help="Файл SQLite (по умолчанию BENCHMARK_DB)")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    runs_cmd = commands.add_parser("runs", help="Список последних прогонов")
+    runs_cmd.add_argument("--env", choices=[e.value for e in TestEnv])
+    runs_cmd.add_argument("--limit", type=int, default=20)
+
+    compare_cmd = commands.add_parser(
+        "compare", help="Сравнить два прогона; код выхода 1 при регрессии"
+    )
+    compare_cmd.add_argument("--env", choices=[e.value for e in TestEnv])
+    compare_cmd.add_argument("--baseline", type=int, help="id базового прогона")
+    compare_cmd.add_argument("--candidate", type=int, help="id сравниваемого прогона")
+    compare_cmd.add_argument("--alpha", type=float, default=0.01)
+    compare_cmd.add_argument(
+        "--min-slowdown", type=float, default=0.1, help="Минимальный рост медианы (доля)"
+    )
+    compare_cmd.add_argument("--min-samples", type=int, default=20)
+    compare_cmd.add_argument(
+        "--all", action="store_true", help="Показывать и операции без изменений"
+    )
+
+    args = parser.parse_args(argv)
+    store = BenchmarkStore(args.db) if args.db else _default_store()
+
+    if args.command == "runs":
+        for run in store.runs(env=args.env, limit=args.limit):
+            print(run.describe())
+        return 0
+
+    baseline, candidate = _pick_runs(store, args)
+    results = compare_runs(
+        store,
+        baseline.id,
+        candidate.id,
+        alpha=args.alpha,
+        min_slowdown=args.min_slowdown,
+        min_samples=args.min_samples,
+    )
+    shown = results if args.all else [r for r in results if r.status != "OK"]
+    print(f"baseline:  {baseline.describe()}")
+    print(f"candidate: {candidate.describe()}")
+    if shown:
+        print(format_comparison(shown))
+    regressions = [r for r in results if r.status == "REGRESSION"]
+    print(f"{len(regressions)} regression(s) out of {len(results)} compared")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
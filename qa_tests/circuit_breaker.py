@@ -0,0 +1,158 @@
+"""Circuit breaker для REST-клиентов: один автомат на base_url сервиса.
+
+closed -> open: ``failure_threshold`` подряд ошибок соединения (отказ в подключении,
+таймаут) — дальше вызовы сразу получают CircuitOpenError, без сетевых попыток и
+пауз retry. open -> half_open: через ``reset_timeout_seconds`` один пробный вызов
+пропускается к сервису; успех закрывает автомат, ошибка снова открывает.
+
+Ответ с любым HTTP-статусом — успех: сервис доступен, проверять статусы — дело тестов.
+Переходы состояний пишутся в лог и в метрики ``psds_test_circuit_breaker_*``.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional, Tuple, Type
+
+from .logging_utils import get_logger
+from .metrics import record_circuit_transition
+
+logger = get_logger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(RuntimeError):
+    """Сервис недоступен: вызов отклонён без обращения к сети (не повторяется retry)."""
+
+    def __init__(self, target: str, failures: int, retry_in: float, last_error: str) -> None:
+        self.target = target
+        self.failures = failures
+        self.retry_in = retry_in
+        super().__init__(
+            f"Circuit open for {target}: {failures} consecutive connection failures "
+            f"(last: {last_error}); next probe in {retry_in:.1f}s"
+        )
+
+
+class CircuitBreaker:
+    """Потокобезопасный автомат closed/open/half_open одного сервиса."""
+
+    def __init__(
+        self, target: str, failure_threshold: int = 5, reset_timeout_seconds: float = 10.0
+    ) -> None:
+        self.target = target
+        self.failure_threshold = failure_threshold
+        self.reset_timeout_seconds = reset_timeout_seconds
+        self.state = CLOSED
+        self.failures = 0
+        self.last_error = ""
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+
+    def _transition(self, new_state: str) -> None:
+        old_state, self.state = self.state, new_state
+        record_circuit_transition(self.target, old_state, new_state)
+        logger.warning(
+            "Circuit breaker state changed",
+            extra={
+                "target": self.target,
+                "from_state": old_state,
+                "to_state": new_state,
+                "failures": self.failures,
+            },
+        )
+
+    def before_call(self) -> None:
+        """Пропускает вызов или бросает CircuitOpenError."""
+        if self.failure_threshold <= 0:
+            return
+        with self._lock:
+            if self.state == CLOSED:
+                return
+            retry_in = self._opened_at + self.reset_timeout_seconds - time.monotonic()
+            if self.state == OPEN and retry_in <= 0:
+                self._transition(HALF_OPEN)
+            if self.state == HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return
+            raise CircuitOpenError(self.target, self.failures, max(retry_in, 0.0), self.last_error)
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._probe_in_flight = False
+            self.failures = 0
+            if self.state != CLOSED:
+                self._transition(CLOSED)
+
+    def record_failure(self, error: BaseException) -> None:
+        with self._lock:
+            self._probe_in_flight = False
+            self.failures += 1
+            self.last_error = repr(error)
+            if self.state == HALF_OPEN or (
+                self.state == CLOSED and 0 < self.failure_threshold <= self.failures
+            ):
+                self._opened_at = time.monotonic()
+                self._transition(OPEN)
+
+    def release_probe(self) -> None:
+        """Вызов завершился ошибкой не уровня соединения: пробный слот снова свободен."""
+        with self._lock:
+            self._probe_in_flight = False
+
+    @contextmanager
+    def guard(self, failures: Tuple[Type[BaseException], ...]) -> Iterator[None]:
+        """Оборачивает один сетевой вызов; исключения из failures считаются отказом сервиса."""
+        self.before_call()
+        try:
+            yield
+        except failures as exc:
+            self.record_failure(exc)
+            raise
+        except BaseException:
+            self.release_probe()
+            raise
+        self.record_success()
+
+
+_breakers: Dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+
+def breaker_for(base_url: str) -> CircuitBreaker:
+    """Общий для всех клиентов процесса автомат сервиса (CIRCUIT_* из настроек)."""
+    target = base_url.rstrip("/")
+    with _breakers_lock:
+        breaker = _breakers.get(target)
+        if breaker is None:
+            from .config import get_settings
+
+            settings = get_settings()
+            breaker = _breakers[target] = CircuitBreaker(
+                target,
+                failure_threshold=settings.circuit_failure_threshold,
+                reset_timeout_seconds=settings.circuit_reset_seconds,
+            )
+        return breaker
+
+
+def breaker_states() -> Dict[str, Dict[str, object]]:
+    """Снимок автоматов процесса: {base_url: {"state", "failures"}}."""
+    with _breakers_lock:
+        breakers = list(_breakers.values())
+    return {b.target: {"state": b.state, "failures": b.failures} for b in breakers}
+
+
+def reset_breakers(target: Optional[str] = None) -> None:
+    """Забывает состояние автоматов (всех или одного base_url)."""
+    with _breakers_lock:
+        if target is None:
+            _breakers.clear()
+        else:
+            _breakers.pop(target.rstrip("/"), None)
@@ -4,7 +4,7 @@ from dataclasses import dataclass
 from enum import Enum
 from functools import lru_cache
 from pathlib import Path
-from typing import Literal, Optional
+from typing import Literal, Optional, Tuple
 
 from dotenv import load_dotenv
 
@@ -19,6 +19,8 @@ class TestEnv(str, Enum):
 @dataclass(frozen=True)
 class ServiceConfig:
     base_url: str
+    # Максимальное число keep-alive соединений в пуле HTTP-клиента сервиса
+    pool_size: int = 10
 
 
 @dataclass(frozen=True)
@@ -53,6 +55,62 @@ class DbConfig:
     password: str
 
 
+@dataclass(frozen=True)
+class LoadConfig:
+    """Параметры нагрузочных тестов (маркер load): open-loop профиль и пул воркеров."""
+
+    target_rps: float
+    ramp_up_seconds: float
+    steady_seconds: float
+    ramp_down_seconds: float
+    max_workers: int
+    # Fan-out WebSocket streaming-service (qa_tests/ws_fanout.py)
+    ws_sessions: int
+    ws_publishers: int
+    ws_subscribers: int
+    ws_frames: int
+    ws_frame_rate: float
+    ws_payload_bytes: int
+    ws_binary_frames: bool
+    # Рой подписчиков notification-service (qa_tests/notify_swarm.py)
+    notify_subscribers: int
+    notify_sessions: int
+    notify_bursts: int
+    notify_events_per_burst: int
+    notify_idle_seconds: float
+    # Бенчмарк загрузки POST /data/file (qa_tests/upload_bench.py)
+    upload_sizes_mb: Tuple[float, ...]
+    upload_concurrency: Tuple[int, ...]
+    upload_repeats: int
+    upload_sessions: int
+    upload_chunk_kb: int
+    # Обход list-эндпоинтов (qa_tests/pagination.py)
+    pagination_page_size: int
+    pagination_max_pages: int
+    # Матрица задержек поиска (qa_tests/search_bench.py)
+    search_index_sizes: Tuple[int, ...]
+    search_limits: Tuple[int, ...]
+    search_queries: int
+    search_concurrency: int
+    # Конкуренция за GET /operator/next (qa_tests/operator_pool_bench.py); waves 0 — авто
+    operator_pool_operators: int
+    operator_pool_max_sessions: Tuple[int, ...]
+    operator_pool_callers: int
+    operator_pool_waves: int
+    # Join storm session-manager-service (qa_tests/join_storm.py)
+    join_storm_sessions: int
+    join_storm_joins: int
+    join_storm_pin_share: float
+    join_storm_burst_seconds: float
+    join_storm_concurrency: int
+    # Характеризация rate limiter'а gateway (qa_tests/rate_limit_bench.py)
+    rate_limit_tokens: int
+    rate_limit_rates: Tuple[float, ...]
+    rate_limit_step_seconds: float
+    rate_limit_burst_requests: int
+    rate_limit_cooldown_seconds: float
+
+
 @dataclass(frozen=True)
 class ApiPaths:
     """Пути эндпоинтов API. Задаются через env для совместимости с разными версиями gateway."""
@@ -96,11 +154,43 @@ class Settings:
     streaming_ws: WebSocketConfig
     api_paths: ApiPaths
     allure_results_dir: Path
+    # Сколько ждать готовности (/health, /ready) сервисов перед прогоном
+    service_ready_timeout_seconds: float
+    # Файл с HDR-гистограммами задержек, сохраняемый в конце прогона (None — не сохранять)
+    latency_histogram_file: Optional[Path]
+    # SQLite-база результатов прогонов для сравнения между деплоями (None — не сохранять)
+    benchmark_db: Optional[Path]
+    # Бюджеты задержек вида "SESSION_MANAGER:POST /session/join:p95<120ms"
+    latency_slos: Tuple[str, ...]
+    # Бюджет без данных (NO DATA) валит прогон, а не только выводит предупреждение
+    latency_slo_strict: bool
     jira: Optional[JiraConfig]
     slack: Optional[SlackConfig]
     teams: Optional[TeamsConfig]
     db: Optional[DbConfig]
     rate_limit_test_user: Optional[str]
+    # Настроенная квота gateway на токен: пополнение (rps) и ёмкость бакета; 0 — не сверять
+    rate_limit_expected_rps: float
+    rate_limit_expected_burst: int
+    # Пользователей роли client, создаваемых в пуле user_pool при старте (на воркер xdist)
+    user_pool_size: int
+    # Срок вызова со всеми повторами (retry_on_exceptions); 0 — без дедлайна
+    retry_deadline_seconds: float
+    # Общий бюджет повторов: доля от числа вызовов и минимальный запас в секунду
+    retry_budget_ratio: float
+    retry_budget_min_per_second: float
+    # Circuit breaker REST-клиентов: подряд ошибок соединения до открытия (0 — выключен)
+    # и пауза до пробного вызова
+    circuit_failure_threshold: int
+    circuit_reset_seconds: float
+    # Манифест наполнения данными (qa_tests.seeding) и датасет по умолчанию
+    seed_manifest: Optional[Path]
+    seed_dataset: str
+    # Seed генерации тестовых данных (data_factory.set_seed); None — случайные данные
+    data_factory_seed: Optional[int]
+    # Корпус payload'ов регистрации (qa_tests.payload_corpus); None — генерация Faker
+    data_factory_corpus: Optional[Path]
+    load: LoadConfig
 
 
 def _load_dotenv() -> None:
@@ -174,6 +264,30 @@ def get_settings() -> Settings:
     allure_dir_raw = _get_env("ALLURE_RESULTS_DIR", "allure-results")
     allure_dir = Path(allure_dir_raw or "allure-results").resolve()
 
+    ready_timeout = float(_get_env("SERVICE_READY_TIMEOUT_SECONDS", "30") or "30")
+
+    latency_file_raw = _get_env("LATENCY_HISTOGRAM_FILE", "latency-results/latency-histograms.json")
+    latency_file = Path(latency_file_raw).resolve() if latency_file_raw else None
+
+    benchmark_db_raw = _get_env("BENCHMARK_DB", "latency-results/benchmarks.sqlite3")
+    benchmark_db = Path(benchmark_db_raw).resolve() if benchmark_db_raw else None
+
+    seed_manifest_raw = _get_env("SEED_MANIFEST", "latency-results/seed-manifest.sqlite3")
+    seed_manifest = Path(seed_manifest_raw).resolve() if seed_manifest_raw else None
+
+    data_seed_raw = _get_env("DATA_FACTORY_SEED", "")
+    data_corpus_raw = _get_env("DATA_FACTORY_CORPUS", "")
+
+    # LATENCY_SLO — бюджеты через ";" или перевод строки; LATENCY_SLO_FILE — по одному на строку
+    slo_lines = (_get_env("LATENCY_SLO", "") or "").replace(";", "\n").splitlines()
+    slo_file = _get_env("LATENCY_SLO_FILE")
+    if slo_file:
+        slo_lines.extend(Path(slo_file).read_text(encoding="utf-8").splitlines())
+    latency_slos = tuple(
+        line.strip() for line in slo_lines if line.strip() and not line.strip().startswith("#")
+    )
+    latency_slo_strict = (_get_env("LATENCY_SLO_STRICT", "") or "").lower() in {"1", "true", "yes"}
+
     jira_base = _get_env("JIRA_BASE_URL")
     jira_project_key = _get_env("JIRA_PROJECT_KEY")
     jira_username = _get_env("JIRA_USERNAME")
@@ -214,6 +328,76 @@ def get_settings() -> Settings:
 
     rate_limit_user = _get_env("RATE_LIMIT_TEST_USER")
 
+    load = LoadConfig(
+        target_rps=float(_get_env("LOAD_TARGET_RPS", "20") or "20"),
+        ramp_up_seconds=float(_get_env("LOAD_RAMP_UP_SECONDS", "5") or "5"),
+        steady_seconds=float(_get_env("LOAD_STEADY_SECONDS", "20") or "20"),
+        ramp_down_seconds=float(_get_env("LOAD_RAMP_DOWN_SECONDS", "5") or "5"),
+        max_workers=int(_get_env("LOAD_MAX_WORKERS", "64") or "64"),
+        ws_sessions=int(_get_env("LOAD_WS_SESSIONS", "10") or "10"),
+        ws_publishers=int(_get_env("LOAD_WS_PUBLISHERS", "1") or "1"),
+        ws_subscribers=int(_get_env("LOAD_WS_SUBSCRIBERS", "3") or "3"),
+        ws_frames=int(_get_env("LOAD_WS_FRAMES", "100") or "100"),
+        ws_frame_rate=float(_get_env("LOAD_WS_FRAME_RATE", "25") or "25"),
+        ws_payload_bytes=int(_get_env("LOAD_WS_PAYLOAD_BYTES", "1024") or "1024"),
+        ws_binary_frames=(_get_env("LOAD_WS_BINARY", "") or "").lower() in {"1", "true", "yes"},
+        notify_subscribers=int(_get_env("LOAD_NOTIFY_SUBSCRIBERS", "1000") or "1000"),
+        notify_sessions=int(_get_env("LOAD_NOTIFY_SESSIONS", "10") or "10"),
+        notify_bursts=int(_get_env("LOAD_NOTIFY_BURSTS", "3") or "3"),
+        notify_events_per_burst=int(_get_env("LOAD_NOTIFY_EVENTS_PER_BURST", "10") or "10"),
+        notify_idle_seconds=float(_get_env("LOAD_NOTIFY_IDLE_SECONDS", "5") or "5"),
+        upload_sizes_mb=tuple(
+            float(v) for v in (_get_env("LOAD_UPLOAD_SIZES_MB", "1,16,64") or "").split(",") if v
+        ),
+        upload_concurrency=tuple(
+            int(v) for v in (_get_env("LOAD_UPLOAD_CONCURRENCY", "1,4") or "").split(",") if v
+        ),
+        upload_repeats=int(_get_env("LOAD_UPLOAD_REPEATS", "2") or "2"),
+        upload_sessions=int(_get_env("LOAD_UPLOAD_SESSIONS", "2") or "2"),
+        upload_chunk_kb=int(_get_env("LOAD_UPLOAD_CHUNK_KB", "1024") or "1024"),
+        pagination_page_size=int(_get_env("LOAD_PAGINATION_PAGE_SIZE", "100") or "100"),
+        pagination_max_pages=int(_get_env("LOAD_PAGINATION_MAX_PAGES", "2000") or "2000"),
+        search_index_sizes=tuple(
+            int(v)
+            for v in (_get_env("LOAD_SEARCH_INDEX_SIZES", "1000,10000") or "").split(",")
+            if v
+        ),
+        search_limits=tuple(
+            int(v) for v in (_get_env("LOAD_SEARCH_LIMITS", "10,100") or "").split(",") if v
+        ),
+        search_queries=int(_get_env("LOAD_SEARCH_QUERIES", "20") or "20"),
+        search_concurrency=int(_get_env("LOAD_SEARCH_CONCURRENCY", "4") or "4"),
+        operator_pool_operators=int(_get_env("LOAD_OPERATOR_POOL_OPERATORS", "200") or "200"),
+        operator_pool_max_sessions=tuple(
+            int(v)
+            for v in (_get_env("LOAD_OPERATOR_POOL_MAX_SESSIONS", "1,2,3,5") or "").split(",")
+            if v
+        ),
+        operator_pool_callers=int(_get_env("LOAD_OPERATOR_POOL_CALLERS", "100") or "100"),
+        operator_pool_waves=int(_get_env("LOAD_OPERATOR_POOL_WAVES", "0") or "0"),
+        join_storm_sessions=int(_get_env("LOAD_JOIN_STORM_SESSIONS", "3") or "3"),
+        join_storm_joins=int(_get_env("LOAD_JOIN_STORM_JOINS", "1000") or "1000"),
+        join_storm_pin_share=float(_get_env("LOAD_JOIN_STORM_PIN_SHARE", "0.5") or "0.5"),
+        join_storm_burst_seconds=float(_get_env("LOAD_JOIN_STORM_BURST_SECONDS", "2") or "2"),
+        join_storm_concurrency=int(_get_env("LOAD_JOIN_STORM_CONCURRENCY", "500") or "500"),
+        rate_limit_tokens=int(_get_env("LOAD_RATE_LIMIT_TOKENS", "4") or "4"),
+        rate_limit_rates=tuple(
+            float(v)
+            for v in (_get_env("LOAD_RATE_LIMIT_RATES", "2,5,10,20,40") or "").split(",")
+            if v
+        ),
+        rate_limit_step_seconds=float(_get_env("LOAD_RATE_LIMIT_STEP_SECONDS", "6") or "6"),
+        rate_limit_burst_requests=int(_get_env("LOAD_RATE_LIMIT_BURST_REQUESTS", "60") or "60"),
+        rate_limit_cooldown_seconds=float(_get_env("LOAD_RATE_LIMIT_COOLDOWN_SECONDS", "5") or "5"),
+    )
+
+    default_pool_size = int(_get_env("HTTP_POOL_SIZE", "10") or "10")
+
+    def _service(prefix: str, base_url: str) -> ServiceConfig:
+        # Размер пула можно переопределить для каждого сервиса: <PREFIX>_POOL_SIZE
+        pool_size = int(_get_env(f"{prefix}_POOL_SIZE", "") or default_pool_size)
+        return ServiceConfig(base_url=base_url, pool_size=pool_size)
+
     def _path(key: str, default: str) -> str:
         return _get_env(key, default) or default
 
@@ -249,25 +433,46 @@ def get_settings() -> Settings:
 
     return Settings(
         env=TestEnv(env),
-        api_gateway=ServiceConfig(base_url=api_gateway_base),
-        user_service=ServiceConfig(base_url=user_service_base),
-        streaming_service=ServiceConfig(base_url=streaming_base),
-        operator_directory_service=ServiceConfig(base_url=operator_directory_base),
-        operator_pool_service=ServiceConfig(base_url=operator_pool_base),
-        notification_service=ServiceConfig(base_url=notification_base),
+        api_gateway=_service("API_GATEWAY", api_gateway_base),
+        user_service=_service("USER_SERVICE", user_service_base),
+        streaming_service=_service("STREAMING_SERVICE", streaming_base),
+        operator_directory_service=_service(
+            "OPERATOR_DIRECTORY_SERVICE",
+            operator_directory_base,
+        ),
+        operator_pool_service=_service("OPERATOR_POOL_SERVICE", operator_pool_base),
+        notification_service=_service("NOTIFICATION_SERVICE", notification_base),
         notification_ws=WebSocketConfig(base_url=notification_ws_base),
-        search_service=ServiceConfig(base_url=search_base),
-        ticket_service=ServiceConfig(base_url=ticket_base),
-        data_channel_service=ServiceConfig(base_url=data_channel_base),
+        search_service=_service("SEARCH_SERVICE", search_base),
+        ticket_service=_service("TICKET_SERVICE", ticket_base),
+        data_channel_service=_service("DATA_CHANNEL_SERVICE", data_channel_base),
         data_channel_ws=WebSocketConfig(base_url=data_channel_ws_base),
-        session_manager_service=ServiceConfig(base_url=session_manager_base),
+        session_manager_service=_service("SESSION_MANAGER_SERVICE", session_manager_base),
         websocket=WebSocketConfig(base_url=websocket_base),
         streaming_ws=WebSocketConfig(base_url=streaming_ws_base),
         api_paths=api_paths,
         allure_results_dir=allure_dir,
+        service_ready_timeout_seconds=ready_timeout,
+        latency_histogram_file=latency_file,
+        benchmark_db=benchmark_db,
+        latency_slos=latency_slos,
+        latency_slo_strict=latency_slo_strict,
         jira=jira,
         slack=slack,
         teams=teams,
         db=db,
         rate_limit_test_user=rate_limit_user,
+        rate_limit_expected_rps=float(_get_env("RATE_LIMIT_EXPECTED_RPS", "0") or "0"),
+        rate_limit_expected_burst=int(_get_env("RATE_LIMIT_EXPECTED_BURST", "0") or "0"),
+        user_pool_size=int(_get_env("USER_POOL_SIZE", "4") or "4"),
+        retry_deadline_seconds=float(_get_env("RETRY_DEADLINE_SECONDS", "30") or "30"),
+        retry_budget_ratio=float(_get_env("RETRY_BUDGET_RATIO", "0.2") or "0.2"),
+        retry_budget_min_per_second=float(_get_env("RETRY_BUDGET_MIN_PER_SECOND", "1") or "1"),
+        circuit_failure_threshold=int(_get_env("CIRCUIT_FAILURE_THRESHOLD", "5") or "5"),
+        circuit_reset_seconds=float(_get_env("CIRCUIT_RESET_SECONDS", "10") or "10"),
+        seed_manifest=seed_manifest,
+        seed_dataset=_get_env("SEED_DATASET", "perf") or "perf",
+        data_factory_seed=int(data_seed_raw) if data_seed_raw else None,
+        data_factory_corpus=Path(data_corpus_raw).resolve() if data_corpus_raw else None,
+        load=load,
     )
@@ -1,22 +1,77 @@
 from __future__ import annotations
 
+import random
 import uuid
-from typing import Any, Dict, Optional
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
 
 from faker import Faker
 
 from .models import UserRegistrationRequest
+from .payload_corpus import CorpusCursor, PayloadCorpus
 
 faker = Faker()
 
+# Задаётся set_seed: email'ы тоже воспроизводимы (UUID из seeded-генератора)
+_seeded_rng: Optional[random.Random] = None
+# Метка процесса: делает email'ы записей корпуса уникальными между прогонами и воркерами
+_RUN_TOKEN = uuid.uuid4().hex[:12]
+_registration_corpus: Optional[PayloadCorpus] = None
+_registration_cursor: Optional[CorpusCursor] = None
+
+
+def set_seed(seed: Optional[int]) -> None:
+    """Детерминированные данные: при том же seed генерируются те же payload'ы.
+
+    None возвращает случайную генерацию. С seed email'ы повторяются между прогонами —
+    против персистентной БД нужен другой seed (или корпус, см. use_registration_corpus).
+    """
+    global _seeded_rng
+    faker.seed_instance(seed)
+    _seeded_rng = random.Random(seed) if seed is not None else None
+
 
 def _unique_email() -> str:
     # faker.unique is per-process only; UUID ensures uniqueness across re-runs with persistent DB.
+    if _seeded_rng is not None:
+        return f"qa+{uuid.UUID(int=_seeded_rng.getrandbits(128), version=4)}@example.com"
     return f"qa+{uuid.uuid4()}@example.com"
 
 
+def use_registration_corpus(
+    path: Optional[Path], worker: int = 0, workers: int = 1
+) -> Optional[PayloadCorpus]:
+    """Переключает build_user_registration на записи корпуса (None — обратно на Faker).
+
+    Воркер получает свою долю корпуса и проходит её по кругу; email каждой выдачи
+    заменяется на уникальный (метка процесса + номер выдачи).
+    """
+    global _registration_corpus, _registration_cursor
+    if _registration_corpus is not None:
+        _registration_cursor = None
+        _registration_corpus.close()
+        _registration_corpus = None
+    if path is not None:
+        corpus = PayloadCorpus(path)
+        if corpus.kind != "user_registration":
+            corpus.close()
+            raise ValueError(f"{path}: expected user_registration corpus, got {corpus.kind!r}")
+        _registration_corpus = corpus
+        _registration_cursor = corpus.cursor(worker, workers)
+    return _registration_corpus
+
+
 def build_user_registration() -> Dict[str, str]:
     """Валидные данные для регистрации (User Service: username, email, password, role)."""
+    cursor = _registration_cursor
+    if cursor is not None:
+        served, payload = cursor.next()
+        payload["email"] = f"qa+{_RUN_TOKEN}.{served}@example.com"
+        return payload
+    return _generate_user_registration()
+
+
+def _generate_user_registration() -> Dict[str, str]:
     user = UserRegistrationRequest(
         email=_unique_email(),
         password=faker.password(length=12),
@@ -102,3 +157,9 @@ def build_validate_session_payload(
         "session_external_id": session_external_id or faker.uuid4(),
         "participant_role": participant_role,
     }
+
+
+# Виды корпусов payload'ов (python -m qa_tests.payload_corpus build --kind ...)
+CORPUS_BUILDERS: Dict[str, Callable[[], Dict[str, Any]]] = {
+    "user_registration": _generate_user_registration,
+}
@@ -1,12 +1,16 @@
 from __future__ import annotations
 
 import asyncio
+import os
 from pathlib import Path
-from typing import Iterator
+from typing import AsyncIterator, Iterator
 
 import allure
 import pytest
 
+from . import data_factory
+from .async_http_client import AsyncApiGatewayClient
+from .benchmark_store import BenchmarkStore, current_git_revision
 from .config import get_settings
 from .http_client import (
     ApiGatewayClient,
@@ -20,13 +24,25 @@ from .http_client import (
     TicketServiceClient,
     UserServiceClient,
 )
-from .logging_utils import configure_root_logger
+from .logging_utils import configure_root_logger, get_logger, shutdown_logging
+from .metrics import (
+    dump_latency_histograms,
+    export_latency_histograms,
+    latency_histograms,
+    merge_latency_histograms,
+    test_duration_histograms,
+)
+from .user_pool import PooledUser, UserPool
+
+logger = get_logger(__name__)
 
 
 @pytest.fixture(scope="session", autouse=True)
-def configure_logging() -> None:
+def configure_logging() -> Iterator[None]:
     """Глобальная настройка логирования для всех тестов."""
     configure_root_logger()
+    yield
+    shutdown_logging()
 
 
 @pytest.fixture(scope="session")
@@ -35,67 +51,173 @@ def settings():
     return get_settings()
 
 
+@pytest.fixture(scope="session", autouse=True)
+def configure_data_factory(settings) -> Iterator[None]:
+    """Seed генерации данных и корпус payload'ов регистрации из настроек.
+
+    Воркеры xdist получают непересекающиеся доли корпуса и собственный seed
+    (seed * 1000 + номер воркера): с общим seed они генерировали бы одни и те же
+    email'ы, и регистрации падали бы с 409.
+    """
+    worker_raw = os.getenv("PYTEST_XDIST_WORKER", "gw0").removeprefix("gw")
+    workers_raw = os.getenv("PYTEST_XDIST_WORKER_COUNT", "1")
+    worker = int(worker_raw) if worker_raw.isdigit() else 0
+    workers = int(workers_raw) if workers_raw.isdigit() else 1
+    seed = settings.data_factory_seed
+    data_factory.set_seed(None if seed is None else seed * 1000 + worker)
+    if settings.data_factory_corpus is not None:
+        data_factory.use_registration_corpus(
+            settings.data_factory_corpus, worker=worker, workers=workers
+        )
+    yield
+    data_factory.use_registration_corpus(None)
+
+
 @pytest.fixture(scope="session")
-def api_gateway_client(settings) -> ApiGatewayClient:
+def api_gateway_client(settings) -> Iterator[ApiGatewayClient]:
     """Client Object для API Gateway / User Service (пути из settings.api_paths)."""
-    return ApiGatewayClient(
+    client = ApiGatewayClient(
+        base_url=settings.api_gateway.base_url,
+        api_paths=settings.api_paths,
+        pool_size=settings.api_gateway.pool_size,
+    )
+    yield client
+    client.close()
+
+
+@pytest.fixture(scope="session")
+def user_pool(settings, api_gateway_client: ApiGatewayClient) -> Iterator[UserPool]:
+    """Пул зарегистрированных и залогиненных пользователей (создаётся параллельно, один раз)."""
+    pool = UserPool(api_gateway_client)
+    pool.fill("client", settings.user_pool_size)
+    yield pool
+    logger.info("User pool stats", extra=pool.stats())
+
+
+@pytest.fixture
+def pooled_user(request, user_pool: UserPool) -> Iterator[PooledUser]:
+    """Пользователь роли client из пула в эксклюзивной аренде на время теста.
+
+    После упавшего теста пользователь в пул не возвращается; тест, меняющий
+    состояние пользователя, должен вызвать user.retire().
+    """
+    user = user_pool.acquire("client")
+    yield user
+    rep = getattr(request.node, "rep_call", None)
+    if rep is None or rep.failed:
+        user.retire()
+    user_pool.release(user)
+
+
+@pytest.fixture
+async def async_api_gateway_client(settings) -> AsyncIterator[AsyncApiGatewayClient]:
+    """Асинхронный Client Object для API Gateway (не блокирует event loop async-тестов)."""
+    client = AsyncApiGatewayClient(
         base_url=settings.api_gateway.base_url,
         api_paths=settings.api_paths,
+        pool_size=settings.api_gateway.pool_size,
     )
+    yield client
+    await client.aclose()
 
 
 @pytest.fixture(scope="session")
-def user_service_client(settings) -> UserServiceClient:
+def user_service_client(settings) -> Iterator[UserServiceClient]:
     """Client Object для user-service."""
-    return UserServiceClient(base_url=settings.user_service.base_url)
+    client = UserServiceClient(
+        base_url=settings.user_service.base_url,
+        pool_size=settings.user_service.pool_size,
+    )
+    yield client
+    client.close()
 
 
 @pytest.fixture(scope="session")
-def streaming_service_client(settings) -> StreamingServiceClient:
+def streaming_service_client(settings) -> Iterator[StreamingServiceClient]:
     """Client Object для streaming-service (REST)."""
-    return StreamingServiceClient(base_url=settings.streaming_service.base_url)
+    client = StreamingServiceClient(
+        base_url=settings.streaming_service.base_url,
+        pool_size=settings.streaming_service.pool_size,
+    )
+    yield client
+    client.close()
 
 
 @pytest.fixture(scope="session")
-def operator_directory_service_client(settings) -> OperatorDirectoryServiceClient:
+def operator_directory_service_client(settings) -> Iterator[OperatorDirectoryServiceClient]:
     """Client для operator-directory-service (health, /api/v1/operators CRUD)."""
-    return OperatorDirectoryServiceClient(base_url=settings.operator_directory_service.base_url)
+    client = OperatorDirectoryServiceClient(
+        base_url=settings.operator_directory_service.base_url,
+        pool_size=settings.operator_directory_service.pool_size,
+    )
+    yield client
+    client.close()
 
 
 @pytest.fixture(scope="session")
-def operator_pool_service_client(settings) -> OperatorPoolServiceClient:
+def operator_pool_service_client(settings) -> Iterator[OperatorPoolServiceClient]:
     """Client для operator-pool-service (health, /operator/status, next, stats, list)."""
-    return OperatorPoolServiceClient(base_url=settings.operator_pool_service.base_url)
+    client = OperatorPoolServiceClient(
+        base_url=settings.operator_pool_service.base_url,
+        pool_size=settings.operator_pool_service.pool_size,
+    )
+    yield client
+    client.close()
 
 
 @pytest.fixture(scope="session")
-def notification_service_client(settings) -> NotificationServiceClient:
+def notification_service_client(settings) -> Iterator[NotificationServiceClient]:
     """Client для notification-service (health, /notify/session/:id)."""
-    return NotificationServiceClient(base_url=settings.notification_service.base_url)
+    client = NotificationServiceClient(
+        base_url=settings.notification_service.base_url,
+        pool_size=settings.notification_service.pool_size,
+    )
+    yield client
+    client.close()
 
 
 @pytest.fixture(scope="session")
-def search_service_client(settings) -> SearchServiceClient:
+def search_service_client(settings) -> Iterator[SearchServiceClient]:
     """Client для search-service (health, /search, /search/index/*)."""
-    return SearchServiceClient(base_url=settings.search_service.base_url)
+    client = SearchServiceClient(
+        base_url=settings.search_service.base_url,
+        pool_size=settings.search_service.pool_size,
+    )
+    yield client
+    client.close()
 
 
 @pytest.fixture(scope="session")
-def ticket_service_client(settings) -> TicketServiceClient:
+def ticket_service_client(settings) -> Iterator[TicketServiceClient]:
     """Client для ticket-service (health, /api/v1/tickets CRUD)."""
-    return TicketServiceClient(base_url=settings.ticket_service.base_url)
+    client = TicketServiceClient(
+        base_url=settings.ticket_service.base_url,
+        pool_size=settings.ticket_service.pool_size,
+    )
+    yield client
+    client.close()
 
 
 @pytest.fixture(scope="session")
-def data_channel_service_client(settings) -> DataChannelServiceClient:
+def data_channel_service_client(settings) -> Iterator[DataChannelServiceClient]:
     """Client для data-channel-service (health, /data/:session_id/history, /data/file)."""
-    return DataChannelServiceClient(base_url=settings.data_channel_service.base_url)
+    client = DataChannelServiceClient(
+        base_url=settings.data_channel_service.base_url,
+        pool_size=settings.data_channel_service.pool_size,
+    )
+    yield client
+    client.close()
 
 
 @pytest.fixture(scope="session")
-def session_manager_service_client(settings) -> SessionManagerServiceClient:
+def session_manager_service_client(settings) -> Iterator[SessionManagerServiceClient]:
     """Client для session-manager-service (health, /ready, /session/*)."""
-    return SessionManagerServiceClient(base_url=settings.session_manager_service.base_url)
+    client = SessionManagerServiceClient(
+        base_url=settings.session_manager_service.base_url,
+        pool_size=settings.session_manager_service.pool_size,
+    )
+    yield client
+    client.close()
 
 
 @pytest.fixture(scope="session")
@@ -123,6 +245,39 @@ def pytest_runtest_makereport(item, call):
     setattr(item, "rep_" + rep.when, rep)
 
 
+def pytest_sessionfinish(session: pytest.Session, exitstatus: int) -> None:
+    """Сохраняет HDR-гистограммы задержек прогона.
+
+    Воркер xdist передаёт свои гистограммы контроллеру через workeroutput;
+    контроллер (или единственный процесс без xdist) объединяет их, пишет файл
+    и добавляет прогон в базу бенчмарков.
+    """
+    workeroutput = getattr(session.config, "workeroutput", None)
+    if workeroutput is not None:
+        workeroutput["latency_histograms"] = export_latency_histograms()
+        return
+    settings = get_settings()
+    if settings.latency_histogram_file is not None:
+        dump_latency_histograms(settings.latency_histogram_file)
+    request_latency = latency_histograms()
+    test_durations = test_duration_histograms()
+    if settings.benchmark_db is not None and (request_latency or test_durations):
+        BenchmarkStore(settings.benchmark_db).save_run(
+            settings.env,
+            current_git_revision(),
+            request_latency,
+            test_durations,
+        )
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_testnodedown(node, error) -> None:
+    """Контроллер xdist: вливает гистограммы завершившегося воркера."""
+    exported = getattr(node, "workeroutput", {}).get("latency_histograms")
+    if exported:
+        merge_latency_histograms(exported)
+
+
 @pytest.fixture(autouse=True)
 def attach_artifacts_on_failure(request, video_artifacts_tmpdir: Path) -> Iterator[None]:
     """Автоматическое прикрепление артефактов при падении теста.
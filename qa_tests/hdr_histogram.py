@@ -0,0 +1,171 @@
+"""High-dynamic-range гистограмма задержек (схема бакетов HdrHistogram).
+
+Значения хранятся в микросекундах с заданным числом значащих цифр: при 3 цифрах
+относительная погрешность любого перцентиля не превышает 0.1% — и для /health за
+доли миллисекунды, и для загрузки файла за десятки секунд. Счётчики разреженные
+(только непустые бакеты), поэтому гистограммы дёшево объединять между воркерами
+xdist и компактно сериализовать.
+"""
+
+from __future__ import annotations
+
+import base64
+import json
+import math
+import zlib
+from typing import Dict, Iterator, List, Optional, Tuple
+
+_MICROS_PER_SECOND = 1_000_000
+
+
+class LatencyHistogram:
+    """Гистограмма задержек с логарифмически-линейными бакетами."""
+
+    def __init__(self, significant_figures: int = 3) -> None:
+        if not 1 <= significant_figures <= 5:
+            raise ValueError("significant_figures must be in range 1..5")
+        self.significant_figures = significant_figures
+        largest_single_unit = 2 * 10**significant_figures
+        magnitude = max(int(math.ceil(math.log2(largest_single_unit))), 1)
+        self._sub_bucket_half_count_magnitude = magnitude - 1
+        self._sub_bucket_half_count = 1 << (magnitude - 1)
+        self._sub_bucket_mask = (1 << magnitude) - 1
+        self.counts: Dict[int, int] = {}
+        self.total_count = 0
+        self.total_micros = 0
+        self.min_micros: Optional[int] = None
+        self.max_micros: Optional[int] = None
+
+    # --- индексация бакетов ---
+
+    def _index_for(self, value: int) -> int:
+        bucket = max(
+            (value | self._sub_bucket_mask).bit_length()
+            - (self._sub_bucket_half_count_magnitude + 1),
+            0,
+        )
+        sub_bucket = value >> bucket
+        return ((bucket + 1) << self._sub_bucket_half_count_magnitude) + (
+            sub_bucket - self._sub_bucket_half_count
+        )
+
+    def _range_for(self, index: int) -> Tuple[int, int]:
+        """Минимальное и максимальное значение, попадающие в бакет index."""
+        bucket = (index >> self._sub_bucket_half_count_magnitude) - 1
+        sub_bucket = (index & (self._sub_bucket_half_count - 1)) + self._sub_bucket_half_count
+        if bucket < 0:
+            sub_bucket -= self._sub_bucket_half_count
+            bucket = 0
+        lowest = sub_bucket << bucket
+        return lowest, lowest + (1 << bucket) - 1
+
+    # --- запись и чтение ---
+
+    def record(self, seconds: float, count: int = 1) -> None:
+        """Записывает задержку в секундах (отрицательные значения приводятся к 0)."""
+        value = max(int(round(seconds * _MICROS_PER_SECOND)), 0)
+        index = self._index_for(value)
+        self.counts[index] = self.counts.get(index, 0) + count
+        self.total_count += count
+        self.total_micros += value * count
+        if self.min_micros is None or value < self.min_micros:
+            self.min_micros = value
+        if self.max_micros is None or value > self.max_micros:
+            self.max_micros = value
+
+    def merge(self, other: "LatencyHistogram") -> None:
+        """Добавляет к гистограмме значения другой (с той же точностью)."""
+        if other.significant_figures != self.significant_figures:
+            raise ValueError("Cannot merge histograms with different significant_figures")
+        for index, count in other.counts.items():
+            self.counts[index] = self.counts.get(index, 0) + count
+        self.total_count += other.total_count
+        self.total_micros += other.total_micros
+        for value in (other.min_micros, other.max_micros):
+            if value is None:
+                continue
+            if self.min_micros is None or value < self.min_micros:
+                self.min_micros = value
+            if self.max_micros is None or value > self.max_micros:
+                self.max_micros = value
+
+    def value_at_percentile(self, percentile: float) -> float:
+        """Значение (секунды), не меньше которого percentile% записанных задержек."""
+        if self.total_count == 0:
+            return 0.0
+        target = max(int(math.ceil(percentile / 100.0 * self.total_count)), 1)
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= target:
+                _, highest = self._range_for(index)
+                assert self.max_micros is not None
+                return min(highest, self.max_micros) / _MICROS_PER_SECOND
+        return self.max
+
+    def iter_buckets(self) -> Iterator[Tuple[float, int]]:
+        """Непустые бакеты по возрастанию: (характерное значение в секундах, количество)."""
+        for index in sorted(self.counts):
+            lowest, highest = self._range_for(index)
+            yield (lowest + highest) / 2 / _MICROS_PER_SECOND, self.counts[index]
+
+    @property
+    def min(self) -> float:
+        return (self.min_micros or 0) / _MICROS_PER_SECOND
+
+    @property
+    def max(self) -> float:
+        return (self.max_micros or 0) / _MICROS_PER_SECOND
+
+    @property
+    def mean(self) -> float:
+        if self.total_count == 0:
+            return 0.0
+        return self.total_micros / self.total_count / _MICROS_PER_SECOND
+
+    def summary(self, percentiles: Tuple[float, ...] = (50, 90, 95, 99, 99.9)) -> Dict[str, float]:
+        """Сводка в миллисекундах: count, min, mean, max и перцентили."""
+        result: Dict[str, float] = {
+            "count": self.total_count,
+            "min_ms": round(self.min * 1000, 3),
+            "mean_ms": round(self.mean * 1000, 3),
+            "max_ms": round(self.max * 1000, 3),
+        }
+        for pct in percentiles:
+            result[f"p{pct:g}_ms"] = round(self.value_at_percentile(pct) * 1000, 3)
+        return result
+
+    # --- сериализация ---
+
+    def encode(self) -> str:
+        """Компактное представление: delta-кодированные бакеты, zlib, base64."""
+        flat: List[int] = []
+        previous = 0
+        for index in sorted(self.counts):
+            flat.extend((index - previous, self.counts[index]))
+            previous = index
+        body = {
+            "sig": self.significant_figures,
+            "n": self.total_count,
+            "sum": self.total_micros,
+            "min": self.min_micros,
+            "max": self.max_micros,
+            "c": flat,
+        }
+        raw = json.dumps(body, separators=(",", ":")).encode("ascii")
+        return base64.b64encode(zlib.compress(raw, 9)).decode("ascii")
+
+    @classmethod
+    def decode(cls, data: str) -> "LatencyHistogram":
+        body = json.loads(zlib.decompress(base64.b64decode(data)))
+        histogram = cls(significant_figures=body["sig"])
+        index = 0
+        flat = body["c"]
+        for i in range(0, len(flat), 2):
+            index += flat[i]
+            histogram.counts[index] = flat[i + 1]
+        histogram.total_count = body["n"]
+        histogram.total_micros = body["sum"]
+        histogram.min_micros = body["min"]
+        histogram.max_micros = body["max"]
+        return histogram
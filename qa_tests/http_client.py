@@ -1,32 +1,242 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Any, Dict, Optional, Sequence, TypeVar, Union
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from http.cookiejar import DefaultCookiePolicy
+from typing import TYPE_CHECKING, Any, ClassVar, Dict, Iterator, Optional, Sequence, TypeVar, Union
+from urllib.parse import urlencode
 
 import requests
 from requests import Response
+from requests.adapters import HTTPAdapter
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
 
+from .circuit_breaker import breaker_for
 from .config import ApiPaths
+from .json_stream import ArrayItemDecoder
 from .logging_utils import get_logger
-from .metrics import measure_request
+from .metrics import measure_request, record_http_connection
+from .multipart import DEFAULT_CHUNK_SIZE, MultipartFileStream
 from .retry import RetryConfig, retry_on_exceptions
 
+if TYPE_CHECKING:
+    import httpx
+
 T = TypeVar("T")
 
 logger = get_logger(__name__)
 
+# Ошибки, по которым circuit breaker считает сервис недоступным
+_CONNECTION_FAILURES = (requests.ConnectionError, requests.Timeout)
+
+
+class _ConnectionReuseMixin:
+    """Учитывает в метриках, выдано ли из пула живое keep-alive соединение или новое."""
+
+    host: str
+    port: Optional[int]
+
+    def _get_conn(self, timeout: Optional[float] = None) -> Any:
+        conn = super()._get_conn(timeout)  # type: ignore[misc]
+        # У ещё не подключённого (или сброшенного пулом) соединения sock = None
+        reused = getattr(conn, "sock", None) is not None
+        record_http_connection(f"{self.host}:{self.port}", reused=reused)
+        return conn
+
+
+class _InstrumentedHTTPConnectionPool(_ConnectionReuseMixin, HTTPConnectionPool):
+    pass
+
+
+class _InstrumentedHTTPSConnectionPool(_ConnectionReuseMixin, HTTPSConnectionPool):
+    pass
+
+
+class _PooledHTTPAdapter(HTTPAdapter):
+    def init_poolmanager(self, *args: Any, **kwargs: Any) -> None:
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": _InstrumentedHTTPConnectionPool,
+            "https": _InstrumentedHTTPSConnectionPool,
+        }
+
+
+def _build_session(pool_size: int) -> requests.Session:
+    """Создаёт requests.Session с пулом keep-alive соединений заданного размера."""
+    session = requests.Session()
+    # Как и у requests.request, cookies между вызовами не сохраняются:
+    # иначе, например, cookie после логина подмешивалась бы в «неавторизованные» запросы.
+    session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+    adapter = _PooledHTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+# Маркер «JSON ещё не разбирался» (None — уже разобран: тело не JSON)
+_UNDECODED: Any = object()
+
 
-@dataclass
 class ApiResponse:
-    status_code: int
-    json: Dict[str, Any] | None
-    raw: Response
+    """Ответ Client Object.
+
+    JSON тела разбирается при первом обращении к ``json`` (None — тело не JSON): код,
+    которому достаточно ``status_code`` и ``size`` (нагрузочные сценарии), не тратит CPU
+    на декодирование. С ``release_raw=True`` ответ после разбора JSON отпускает ``raw``
+    вместе с телом; ``status_code``, ``size`` и ``headers`` остаются доступны.
+    """
+
+    __slots__ = ("status_code", "size", "release_raw", "_raw", "_headers", "_json")
+
+    def __init__(
+        self,
+        status_code: int,
+        raw: Union[Response, "httpx.Response"],
+        *,
+        release_raw: bool = False,
+    ) -> None:
+        self.status_code = status_code
+        # Размер тела в байтах: тело уже прочитано клиентом, len() не копирует его
+        self.size: int = len(raw.content)
+        self.release_raw = release_raw
+        # requests.Response у синхронных клиентов, httpx.Response — у async_http_client
+        self._raw: Union[Response, "httpx.Response", None] = raw
+        self._headers = raw.headers
+        self._json: Any = _UNDECODED
+
+    @property
+    def json(self) -> Dict[str, Any] | None:
+        if self._json is _UNDECODED:
+            raw = self.raw
+            try:
+                self._json = raw.json() if self.size else None
+            except ValueError:
+                self._json = None
+            if self.release_raw:
+                self._raw = None
+        payload: Dict[str, Any] | None = self._json
+        return payload
+
+    @property
+    def decoded(self) -> bool:
+        """Разбирался ли уже JSON тела."""
+        return self._json is not _UNDECODED
+
+    @property
+    def raw(self) -> Union[Response, "httpx.Response"]:
+        if self._raw is None:
+            raise RuntimeError("ApiResponse.raw was released after JSON decoding (release_raw)")
+        return self._raw
+
+    @property
+    def headers(self) -> Any:
+        """Заголовки ответа (регистронезависимый словарь requests/httpx)."""
+        return self._headers
+
+    def __repr__(self) -> str:
+        return f"ApiResponse(status_code={self.status_code}, size={self.size})"
+
+
+# Размер куска, которым ItemStream читает тело из сокета
+STREAM_CHUNK_SIZE = 64 * 1024
+
+
+class ItemStream:
+    """Элементы JSON-массива ``key`` ответа, читаемые из сокета по мере прихода.
+
+    Ответ открыт с ``stream=True``: тело не собирается в памяти целиком, элементы
+    отдаются по одному (json_stream.ArrayItemDecoder), и проверки начинаются до конца
+    ответа:
+
+        with ticket_service_client.iter_tickets(limit=100_000) as tickets:
+            assert tickets.status_code == 200
+            for ticket in tickets:
+                ...
+
+    Итерация ответа со статусом не 200 бросает RuntimeError с началом тела. Соединение
+    возвращается в пул после последнего элемента или при выходе из with.
+    """
+
+    def __init__(self, resp: Response, key: str, chunk_size: int = STREAM_CHUNK_SIZE) -> None:
+        self.status_code = resp.status_code
+        self.headers = resp.headers
+        self.key = key
+        # Прочитано байт тела
+        self.size = 0
+        self._resp = resp
+        self._chunk_size = chunk_size
+        self._decoder = ArrayItemDecoder(key)
+
+    @property
+    def items(self) -> int:
+        """Сколько элементов уже отдано."""
+        return self._decoder.items
+
+    def __iter__(self) -> Iterator[Any]:
+        try:
+            if self.status_code != 200:
+                raise RuntimeError(
+                    f"Cannot stream {self.key!r}: HTTP {self.status_code}: {self._resp.text[:500]}"
+                )
+            for chunk in self._resp.iter_content(self._chunk_size):
+                self.size += len(chunk)
+                yield from self._decoder.feed(chunk)
+            yield from self._decoder.close()
+        finally:
+            self.close()
+
+    def close(self) -> None:
+        self._resp.close()
+
+    def __enter__(self) -> "ItemStream":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
 
 
 @dataclass
 class BaseApiClient:
     base_url: str
     default_headers: Optional[Dict[str, str]] = None
+    pool_size: int = 10
+    # Отпускать тело ответа (ApiResponse.raw) после разбора JSON — для потоков в миллионы ответов
+    release_raw: bool = False
+
+    # Метка service в метриках задержек; наследники задают имя своего сервиса
+    service_name: ClassVar[str] = "api"
+
+    _session: Optional[requests.Session] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    _session_pid: int = field(default=0, init=False, repr=False, compare=False)
+    _session_lock: threading.Lock = field(
+        default_factory=threading.Lock, init=False, repr=False, compare=False
+    )
+
+    def _http(self) -> requests.Session:
+        """Пул keep-alive соединений клиента.
+
+        Пул принадлежит процессу: воркеры xdist — отдельные процессы, и после fork
+        каждый из них создаёт собственный пул, не разделяя сокеты с родителем.
+        Внутри процесса сессию безопасно использовать из нескольких потоков.
+        """
+        pid = os.getpid()
+        if self._session is None or self._session_pid != pid:
+            with self._session_lock:
+                if self._session is None or self._session_pid != pid:
+                    self._session = _build_session(self.pool_size)
+                    self._session_pid = pid
+        return self._session
+
+    def close(self) -> None:
+        """Закрывает соединения пула (клиент можно использовать снова — пул пересоздастся)."""
+        with self._session_lock:
+            if self._session is not None and self._session_pid == os.getpid():
+                self._session.close()
+            self._session = None
 
     def _url(self, path: str) -> str:
         if path.startswith("http://") or path.startswith("https://"):
@@ -43,6 +253,20 @@ class BaseApiClient:
         headers: Optional[Dict[str, str]] = None,
         expected_status: Optional[Union[int, Sequence[int]]] = None,
     ) -> ApiResponse:
+        return self._request_once(
+            method, path, json_body=json_body, headers=headers, expected_status=expected_status
+        )
+
+    def _request_once(
+        self,
+        method: str,
+        path: str,
+        *,
+        json_body: Optional[Dict[str, Any]] = None,
+        headers: Optional[Dict[str, str]] = None,
+        expected_status: Optional[Union[int, Sequence[int]]] = None,
+    ) -> ApiResponse:
+        """Один запрос без повторов — для неидемпотентных вызовов (POST без ключа)."""
         url = self._url(path)
         merged_headers = {**(self.default_headers or {}), **(headers or {})}
 
@@ -58,11 +282,18 @@ class BaseApiClient:
                 "method": method.upper(),
                 "url": url,
                 "path": path,
+                "operation": f"{method.upper()} {path}",
             },
         )
 
-        with measure_request("api", f"{method.upper()} {path}", get_status):
-            resp = requests.request(method, url, json=json_body, headers=merged_headers, timeout=10)
+        # Открытый автомат бросает CircuitOpenError до сетевого вызова; retry его не повторяет
+        with (
+            breaker_for(self.base_url).guard(_CONNECTION_FAILURES),
+            measure_request(self.service_name, f"{method.upper()} {path}", get_status),
+        ):
+            resp = self._http().request(
+                method, url, json=json_body, headers=merged_headers, timeout=10
+            )
             resp_status = str(resp.status_code)
 
         if expected_status is not None:
@@ -81,28 +312,57 @@ class BaseApiClient:
                     },
                 )
 
-        try:
-            payload = resp.json()
-        except ValueError:
-            payload = None
-
-        return ApiResponse(status_code=resp.status_code, json=payload, raw=resp)
+        return ApiResponse(resp.status_code, resp, release_raw=self.release_raw)
 
     def get(self, path: str, **kwargs: Any) -> ApiResponse:
         """GET запрос по относительному path (например /health, /ready)."""
         return self._request("GET", path, **kwargs)
 
+    @retry_on_exceptions(exceptions=[requests.RequestException], config=RetryConfig())
+    def _stream_items(self, path: str, key: str) -> ItemStream:
+        """GET path в потоковом режиме: элементы массива key читаются при итерации.
+
+        Метрика STREAM <path> — время до заголовков ответа: чтение тела идёт в темпе
+        вызывающего кода и в задержку запроса не входит.
+        """
+        url = self._url(path)
+        resp_status = "unknown"
+
+        def get_status() -> str:
+            return resp_status
+
+        logger.info(
+            "HTTP request started",
+            extra={"method": "GET", "url": url, "path": path, "operation": f"STREAM {path}"},
+        )
+        with (
+            breaker_for(self.base_url).guard(_CONNECTION_FAILURES),
+            measure_request(self.service_name, f"STREAM {path}", get_status),
+        ):
+            resp = self._http().get(url, headers=self.default_headers, timeout=10, stream=True)
+            resp_status = str(resp.status_code)
+        return ItemStream(resp, key)
+
 
 class ApiGatewayClient(BaseApiClient):
     """Client Object для API Gateway. Пути эндпоинтов задаются через api_paths (из конфига)."""
 
+    service_name = "api_gateway"
+
     def __init__(
         self,
         base_url: str,
         default_headers: Optional[Dict[str, str]] = None,
         api_paths: Optional[ApiPaths] = None,
+        pool_size: int = 10,
+        release_raw: bool = False,
     ) -> None:
-        super().__init__(base_url=base_url, default_headers=default_headers)
+        super().__init__(
+            base_url=base_url,
+            default_headers=default_headers,
+            pool_size=pool_size,
+            release_raw=release_raw,
+        )
         self._paths = api_paths
 
     def _p(self, key: str, **kwargs: str) -> str:
@@ -312,6 +572,8 @@ class UserServiceClient(BaseApiClient):
     может быть полезен для health-check и подготовки данных.
     """
 
+    service_name = "user"
+
     def health(self) -> ApiResponse:
         return self.get("/health")
 
@@ -325,6 +587,8 @@ class StreamingServiceClient(BaseApiClient):
     Используется для создания/завершения сессий и чтения операторов.
     """
 
+    service_name = "streaming"
+
     def health(self) -> ApiResponse:
         return self.get("/health")
 
@@ -360,6 +624,8 @@ class StreamingServiceClient(BaseApiClient):
 class OperatorDirectoryServiceClient(BaseApiClient):
     """Client для operator-directory-service: /health, /ready, /api/v1/operators (CRUD)."""
 
+    service_name = "operator_directory"
+
     def health(self) -> ApiResponse:
         return self.get("/health")
 
@@ -412,6 +678,8 @@ class OperatorDirectoryServiceClient(BaseApiClient):
 class OperatorPoolServiceClient(BaseApiClient):
     """Client для operator-pool-service: /health, /ready, /operator/status, next, stats, list."""
 
+    service_name = "operator_pool"
+
     def health(self) -> ApiResponse:
         return self.get("/health")
 
@@ -439,10 +707,16 @@ class OperatorPoolServiceClient(BaseApiClient):
         """GET /operator/list — 200 { operators: [...] }."""
         return self._request("GET", "/operator/list", expected_status=(200, 500))
 
+    def iter_operators(self) -> ItemStream:
+        """GET /operator/list — операторы по мере чтения ответа."""
+        return self._stream_items("/operator/list", "operators")
+
 
 class NotificationServiceClient(BaseApiClient):
     """Client для notification-service: /health, /ready, POST /notify/session/:id."""
 
+    service_name = "notification"
+
     def health(self) -> ApiResponse:
         return self.get("/health")
 
@@ -459,10 +733,37 @@ class NotificationServiceClient(BaseApiClient):
         )
 
 
+def tickets_path(limit: Optional[int], offset: Optional[int]) -> str:
+    """Путь GET /api/v1/tickets с limit/offset (не заданные не передаются)."""
+    params = {k: v for k, v in (("limit", limit), ("offset", offset)) if v is not None}
+    return f"/api/v1/tickets?{urlencode(params)}" if params else "/api/v1/tickets"
+
+
+def history_path(session_id: str, limit: Optional[int]) -> str:
+    """Путь GET /data/:session_id/history с limit (если задан)."""
+    path = f"/data/{session_id}/history"
+    return f"{path}?limit={limit}" if limit is not None else path
+
+
+SEARCH_SEGMENTS = ("tickets", "sessions", "operators")
+
+
+def search_path(query: str, type_filter: Optional[str], limit: int, offset: int) -> str:
+    """Путь поиска: q (URL-encoded; пустой запрос не передаётся), limit, offset."""
+    segment = (type_filter or "tickets").lower()
+    if segment not in SEARCH_SEGMENTS:
+        segment = "tickets"
+    params: Dict[str, Any] = {"q": query} if query else {}
+    params.update(limit=limit, offset=offset)
+    return f"/search/{segment}?{urlencode(params)}"
+
+
 class SearchServiceClient(BaseApiClient):
     """search-service: /health, /ready,
     GET /search/tickets|sessions|operators, POST /search/index/*."""
 
+    service_name = "search"
+
     def health(self) -> ApiResponse:
         return self.get("/health")
 
@@ -474,14 +775,10 @@ class SearchServiceClient(BaseApiClient):
         query: str,
         type_filter: Optional[str] = None,
         limit: int = 20,
+        offset: int = 0,
     ) -> ApiResponse:
-        """GET /search/{tickets|sessions|operators} with limit/offset; type_filter picks which."""
-        segment = (type_filter or "tickets").lower()
-        if segment not in ("tickets", "sessions", "operators"):
-            segment = "tickets"
-        params: Dict[str, Any] = {"limit": limit, "offset": 0}
-        qs = "&".join(f"{k}={v}" for k, v in params.items())
-        path = f"/search/{segment}?{qs}"
+        """GET /search/{tickets|sessions|operators}?q=...; type_filter picks which."""
+        path = search_path(query, type_filter, limit, offset)
         return self._request("GET", path, expected_status=(200, 500))
 
     def index_ticket(self, payload: Dict[str, Any]) -> ApiResponse:
@@ -515,15 +812,22 @@ class SearchServiceClient(BaseApiClient):
 class TicketServiceClient(BaseApiClient):
     """Client для ticket-service: /health, /ready, /api/v1/tickets (CRUD)."""
 
+    service_name = "ticket"
+
     def health(self) -> ApiResponse:
         return self.get("/health")
 
     def ready(self) -> ApiResponse:
         return self.get("/ready")
 
-    def create_ticket(self, payload: Dict[str, Any]) -> ApiResponse:
-        """POST /api/v1/tickets — возвращает 201 Created."""
-        return self._request(
+    def create_ticket(self, payload: Dict[str, Any], retry: bool = True) -> ApiResponse:
+        """POST /api/v1/tickets — возвращает 201 Created.
+
+        retry=False — без повторов: POST не идемпотентен, и повтор после таймаута чтения
+        создаст второй тикет, если первый запрос всё же дошёл до сервиса.
+        """
+        send = self._request if retry else self._request_once
+        return send(
             "POST",
             "/api/v1/tickets",
             json_body=payload,
@@ -544,14 +848,15 @@ class TicketServiceClient(BaseApiClient):
         offset: Optional[int] = None,
     ) -> ApiResponse:
         """GET /api/v1/tickets?limit=...&offset=..."""
-        params: Dict[str, Any] = {}
-        if limit is not None:
-            params["limit"] = limit
-        if offset is not None:
-            params["offset"] = offset
-        qs = "&".join(f"{k}={v}" for k, v in params.items())
-        path = f"/api/v1/tickets?{qs}" if qs else "/api/v1/tickets"
-        return self._request("GET", path, expected_status=(200, 500))
+        return self._request("GET", tickets_path(limit, offset), expected_status=(200, 500))
+
+    def iter_tickets(
+        self,
+        limit: Optional[int] = None,
+        offset: Optional[int] = None,
+    ) -> ItemStream:
+        """GET /api/v1/tickets — тикеты по мере чтения ответа (выгрузка в постоянной памяти)."""
+        return self._stream_items(tickets_path(limit, offset), "tickets")
 
     def update_ticket(
         self,
@@ -580,6 +885,8 @@ class TicketServiceClient(BaseApiClient):
 class DataChannelServiceClient(BaseApiClient):
     """Client для data-channel-service: /health, /ready, GET /data/:session_id/history, POST /data/file."""  # noqa: E501
 
+    service_name = "data_channel"
+
     def health(self) -> ApiResponse:
         return self.get("/health")
 
@@ -592,12 +899,13 @@ class DataChannelServiceClient(BaseApiClient):
         limit: Optional[int] = None,
     ) -> ApiResponse:
         """GET /data/:session_id/history?limit=..."""
-        params: Dict[str, Any] = {}
-        if limit is not None:
-            params["limit"] = limit
-        qs = "&".join(f"{k}={v}" for k, v in params.items())
-        path = f"/data/{session_id}/history?{qs}" if qs else f"/data/{session_id}/history"
-        return self._request("GET", path, expected_status=(200, 400, 500))
+        return self._request(
+            "GET", history_path(session_id, limit), expected_status=(200, 400, 500)
+        )
+
+    def iter_history(self, session_id: str, limit: Optional[int] = None) -> ItemStream:
+        """GET /data/:session_id/history — сообщения по мере чтения ответа."""
+        return self._stream_items(history_path(session_id, limit), "messages")
 
     def upload_file(
         self,
@@ -605,47 +913,74 @@ class DataChannelServiceClient(BaseApiClient):
         user_id: str,
         file_path: str,
         filename: Optional[str] = None,
+        *,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        timeout: float = 30.0,
     ) -> ApiResponse:
-        """POST /data/file — multipart/form-data с session_id, user_id, file."""
-        url = self._url("/data/file")
-        if filename is None:
-            from pathlib import Path
+        """POST /data/file — multipart/form-data с session_id, user_id, file.
+
+        Файл не читается в память целиком: тело отправляется кусками по chunk_size.
+        """
+        body = MultipartFileStream(
+            fields={"session_id": session_id, "user_id": user_id},
+            file_field="file",
+            file_path=file_path,
+            filename=filename,
+            chunk_size=chunk_size,
+        )
+        return self.upload_multipart(body, timeout=timeout)
 
-            filename = Path(file_path).name
+    def upload_multipart(self, body: MultipartFileStream, *, timeout: float = 30.0) -> ApiResponse:
+        """POST /data/file с готовым потоковым телом.
 
-        with open(file_path, "rb") as f:
-            files = {"file": (filename, f, "application/octet-stream")}
-            data = {"session_id": session_id, "user_id": user_id}
+        После вызова body.first_read_at/last_read_at — начало и конец отправки тела,
+        body.response_at — получение заголовков ответа (perf_counter).
+        """
+        url = self._url("/data/file")
+        resp_status = "unknown"
 
-            resp_status = "unknown"
+        def get_status() -> str:
+            return resp_status
 
-            def get_status() -> str:
-                return resp_status
+        logger.info(
+            "HTTP request started",
+            extra={
+                "method": "POST",
+                "url": url,
+                "path": "/data/file",
+                "operation": "POST /data/file",
+                "size": len(body),
+            },
+        )
 
-            logger.info(
-                "HTTP request started",
-                extra={
-                    "method": "POST",
-                    "url": url,
-                    "path": "/data/file",
-                },
+        with (
+            breaker_for(self.base_url).guard(_CONNECTION_FAILURES),
+            measure_request(self.service_name, "POST /data/file", get_status),
+        ):
+            # stream=True: post возвращается сразу после заголовков ответа
+            resp = self._http().post(
+                url,
+                data=body,
+                headers={**(self.default_headers or {}), "Content-Type": body.content_type},
+                timeout=timeout,
+                stream=True,
             )
+            body.response_at = time.perf_counter()
+            resp_status = str(resp.status_code)
+            try:
+                # ApiResponse дочитывает тело ответа; после close соединение снова в пуле
+                response = ApiResponse(resp.status_code, resp, release_raw=self.release_raw)
+            finally:
+                resp.close()
 
-            with measure_request("api", "POST /data/file", get_status):
-                resp = requests.post(url, files=files, data=data, timeout=30)
-                resp_status = str(resp.status_code)
-
-        try:
-            payload = resp.json()
-        except ValueError:
-            payload = None
-
-        return ApiResponse(status_code=resp.status_code, json=payload, raw=resp)
+        return response
 
 
 class SessionManagerServiceClient(BaseApiClient):
     """Client для session-manager-service: /health, /ready, POST /session, GET /session/{id}, GET /session/{id}/participants, POST /session/join, POST /session/{id}/invite, POST /session/{id}/control."""  # noqa: E501
 
+    service_name = "session_manager"
+
     def health(self) -> ApiResponse:
         return self.get("/health")
 
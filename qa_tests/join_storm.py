@@ -0,0 +1,295 @@
+"""Join storm session-manager-service: всплеск присоединений к одной сессии.
+
+Опубликованный PIN приводит к тому, что за секунды к одной сессии присоединяются
+тысячи участников. Сценарий создаёт ``sessions`` сессий (``create_session``) и на каждую
+отправляет ``joins_per_session`` вызовов ``join_session``: доля ``pin_share`` — по PIN,
+остальные — по session id. Моменты отправки равномерно распределены по
+``burst_seconds``, одновременно в полёте не больше ``concurrency`` запросов — всё в
+одном event loop на AsyncSessionManagerServiceClient.
+
+Параллельно каждая сессия опрашивается ``get_participants`` раз в ``poll_interval``.
+После всплеска опрос продолжается, пока список участников не включит всех успешно
+присоединившихся (или до ``convergence_timeout``): время сходимости — от последнего
+успешного join до первого опроса, увидевшего всех.
+
+Отчёт: перцентили задержки join по пути (pin / session_id) и опросов, доля 5xx и ошибок
+соединения, время сходимости по сессиям и «потерянные» участники (join 200, но в
+списке участников так и не появились).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import random
+import time
+import uuid
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Set
+
+from .async_http_client import AsyncSessionManagerServiceClient
+from .hdr_histogram import LatencyHistogram
+from .load import PERCENTILES
+from .logging_utils import get_logger
+
+logger = get_logger(__name__)
+
+JOIN_PATHS = ("pin", "session_id")
+
+
+@dataclass(frozen=True)
+class JoinStormConfig:
+    sessions: int = 3
+    joins_per_session: int = 1000
+    # Доля присоединений по PIN; остальные — по session id
+    pin_share: float = 0.5
+    burst_seconds: float = 2.0
+    concurrency: int = 500
+    poll_interval: float = 0.1
+    convergence_timeout: float = 30.0
+    seed: Optional[int] = None
+
+
+@dataclass
+class CallStats:
+    """Задержки и статусы одного вида вызовов (status 0 — исключение клиента)."""
+
+    latency: LatencyHistogram = field(default_factory=LatencyHistogram)
+    statuses: Counter[int] = field(default_factory=Counter)
+
+    def record(self, status: int, seconds: float) -> None:
+        self.statuses[status] += 1
+        if status:
+            self.latency.record(seconds)
+
+    @property
+    def count(self) -> int:
+        return sum(self.statuses.values())
+
+    @property
+    def server_errors(self) -> int:
+        """5xx и ошибки соединения/таймауты."""
+        return sum(n for status, n in self.statuses.items() if status == 0 or status >= 500)
+
+    @property
+    def error_rate(self) -> float:
+        return self.server_errors / self.count if self.count else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "statuses": {str(k): v for k, v in sorted(self.statuses.items())},
+            "error_rate": round(self.error_rate, 4),
+            "latency_ms": self.latency.summary(PERCENTILES),
+        }
+
+
+@dataclass
+class SessionStorm:
+    session_id: str
+    pin: str
+    joined: Set[str] = field(default_factory=set)
+    last_join_at: Optional[float] = None
+    # Участники по последнему успешному опросу
+    seen: Set[str] = field(default_factory=set)
+    converged_at: Optional[float] = None
+    storm_done: bool = False
+
+    @property
+    def convergence_seconds(self) -> Optional[float]:
+        if self.converged_at is None or self.last_join_at is None:
+            return None
+        return max(self.converged_at - self.last_join_at, 0.0)
+
+    @property
+    def lost(self) -> int:
+        return len(self.joined - self.seen)
+
+
+@dataclass
+class JoinStormReport:
+    config: JoinStormConfig
+    sessions: List[SessionStorm]
+    joins: Dict[str, CallStats]
+    polls: CallStats
+    wall_seconds: float
+    create_failures: int = 0
+
+    @property
+    def join_error_rate(self) -> float:
+        total = sum(s.count for s in self.joins.values())
+        return sum(s.server_errors for s in self.joins.values()) / total if total else 0.0
+
+    @property
+    def lost_participants(self) -> int:
+        return sum(s.lost for s in self.sessions)
+
+    @property
+    def unconverged(self) -> int:
+        return sum(1 for s in self.sessions if s.joined and s.converged_at is None)
+
+    def convergence(self) -> LatencyHistogram:
+        histogram = LatencyHistogram()
+        for session in self.sessions:
+            if session.convergence_seconds is not None:
+                histogram.record(session.convergence_seconds)
+        return histogram
+
+    def to_dict(self) -> Dict[str, Any]:
+        joins_total = sum(s.count for s in self.joins.values())
+        return {
+            "sessions": len(self.sessions),
+            "create_failures": self.create_failures,
+            "joins": joins_total,
+            "join_rps": round(joins_total / self.wall_seconds, 1) if self.wall_seconds else 0,
+            "join_error_rate": round(self.join_error_rate, 4),
+            "joins_by_path": {path: stats.to_dict() for path, stats in self.joins.items()},
+            "polls": self.polls.to_dict(),
+            "convergence_ms": self.convergence().summary(PERCENTILES),
+            "unconverged_sessions": self.unconverged,
+            "lost_participants": self.lost_participants,
+        }
+
+    def format_table(self) -> str:
+        rows = [["calls", "count", "5xx/err", "p50", "p95", "p99", "max"]]
+        named = [(f"join by {path}", stats) for path, stats in self.joins.items()]
+        for name, stats in [*named, ("get_participants", self.polls)]:
+            summary = stats.latency.summary(PERCENTILES)
+            rows.append(
+                [
+                    name,
+                    str(stats.count),
+                    f"{stats.error_rate:.2%}",
+                    f"{summary['p50_ms']:.1f}ms",
+                    f"{summary['p95_ms']:.1f}ms",
+                    f"{summary['p99_ms']:.1f}ms",
+                    f"{summary['max_ms']:.1f}ms",
+                ]
+            )
+        convergence = self.convergence().summary(PERCENTILES)
+        rows.append(
+            [
+                "convergence",
+                str(len(self.sessions) - self.unconverged),
+                "-",
+                f"{convergence['p50_ms']:.1f}ms",
+                f"{convergence['p95_ms']:.1f}ms",
+                f"{convergence['p99_ms']:.1f}ms",
+                f"{convergence['max_ms']:.1f}ms",
+            ]
+        )
+        widths = [max(len(row[i]) for row in rows) for i in range(len(rows[0]))]
+        table = "\n".join("  ".join(c.rjust(w) for c, w in zip(row, widths)) for row in rows)
+        return (
+            f"{table}\nunconverged sessions: {self.unconverged}, "
+            f"lost participants: {self.lost_participants}"
+        )
+
+
+class JoinStorm:
+    def __init__(self, client: AsyncSessionManagerServiceClient, config: JoinStormConfig) -> None:
+        self.client = client
+        self.config = config
+        self.joins = {path: CallStats() for path in JOIN_PATHS}
+        self.polls = CallStats()
+        self._rng = random.Random(config.seed)
+
+    async def _create(self) -> Optional[SessionStorm]:
+        try:
+            resp = await self.client.create_session(str(uuid.uuid4()))
+        except Exception as exc:
+            logger.warning("Join storm session create failed", extra={"error": repr(exc)})
+            return None
+        body = resp.json if isinstance(resp.json, dict) else {}
+        if resp.status_code not in (200, 201) or not body.get("id") or not body.get("pin"):
+            logger.warning(
+                "Join storm session create failed", extra={"status_code": resp.status_code}
+            )
+            return None
+        return SessionStorm(session_id=str(body["id"]), pin=str(body["pin"]))
+
+    async def _join(
+        self,
+        semaphore: asyncio.Semaphore,
+        session: SessionStorm,
+        by_pin: bool,
+        send_at: float,
+    ) -> None:
+        await asyncio.sleep(max(send_at - time.perf_counter(), 0.0))
+        user_id = str(uuid.uuid4())
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                resp = await self.client.join_session(
+                    session_id="" if by_pin else session.session_id,
+                    pin=session.pin if by_pin else "",
+                    user_id=user_id,
+                )
+                status = resp.status_code
+            except Exception:
+                status = 0
+            finished = time.perf_counter()
+        self.joins["pin" if by_pin else "session_id"].record(status, finished - started)
+        if status == 200:
+            session.joined.add(user_id)
+            session.last_join_at = max(session.last_join_at or 0.0, finished)
+
+    async def _poll(self, session: SessionStorm) -> None:
+        """Опрашивает участников до сходимости после всплеска или до таймаута."""
+        deadline: Optional[float] = None
+        while True:
+            started = time.perf_counter()
+            try:
+                resp = await self.client.get_participants(session.session_id)
+                status = resp.status_code
+            except Exception:
+                resp, status = None, 0
+            finished = time.perf_counter()
+            self.polls.record(status, finished - started)
+            if resp is not None and status == 200 and isinstance(resp.json, dict):
+                session.seen = {str(p) for p in resp.json.get("participantIds") or []}
+            if session.storm_done:
+                # Опрос начат после последнего join — его результат учитывает все присоединения
+                if session.joined <= session.seen and started >= (session.last_join_at or 0.0):
+                    session.converged_at = finished
+                    return
+                deadline = deadline or finished + self.config.convergence_timeout
+                if finished >= deadline:
+                    return
+            await asyncio.sleep(self.config.poll_interval)
+
+    async def _storm(self, semaphore: asyncio.Semaphore, session: SessionStorm) -> None:
+        cfg = self.config
+        start = time.perf_counter()
+        poller = asyncio.create_task(self._poll(session))
+        await asyncio.gather(
+            *(
+                self._join(
+                    semaphore,
+                    session,
+                    self._rng.random() < cfg.pin_share,
+                    start + self._rng.uniform(0.0, cfg.burst_seconds),
+                )
+                for _ in range(cfg.joins_per_session)
+            )
+        )
+        session.storm_done = True
+        await poller
+
+    async def run(self) -> JoinStormReport:
+        cfg = self.config
+        created = await asyncio.gather(*(self._create() for _ in range(cfg.sessions)))
+        sessions = [s for s in created if s is not None]
+        semaphore = asyncio.Semaphore(cfg.concurrency)
+        started = time.perf_counter()
+        await asyncio.gather(*(self._storm(semaphore, s) for s in sessions))
+        report = JoinStormReport(
+            config=cfg,
+            sessions=sessions,
+            joins=self.joins,
+            polls=self.polls,
+            wall_seconds=time.perf_counter() - started,
+            create_failures=cfg.sessions - len(sessions),
+        )
+        logger.info("Join storm finished", extra=report.to_dict())
+        return report
@@ -0,0 +1,179 @@
+"""Потоковый разбор элементов JSON-массива из ответа, приходящего кусками.
+
+List-эндпоинты (история data-channel, тикеты, операторы) отдают объект вида
+``{"tickets": [...], "total": N}``. Вместо чтения тела целиком и одного ``json.loads``
+декодер получает байты по мере прихода из сокета и отдаёт элементы массива ``key``, как
+только очередной элемент прочитан полностью: в памяти держится только недочитанный
+хвост, и проверки могут начинаться до конца ответа.
+
+    decoder = ArrayItemDecoder("tickets")
+    for chunk in resp.iter_content(65536):
+        for ticket in decoder.feed(chunk):
+            ...
+    decoder.close()
+
+Остальные поля объекта верхнего уровня пропускаются; ``key=None`` — тело само является
+массивом. Отсутствующий ключ или ``null`` — пустая последовательность.
+"""
+
+from __future__ import annotations
+
+import codecs
+import json
+import re
+from typing import Any, AsyncIterable, AsyncIterator, Iterable, Iterator, List, Optional
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+_DELIMITERS = frozenset(" \t\n\r,]}")
+
+_START, _KEY, _COLON, _SKIP_VALUE, _VALUE, _ITEMS, _DONE = range(7)
+
+
+class ArrayItemDecoder:
+    """Push-декодер: feed(байты) возвращает элементы массива, завершённые этим куском."""
+
+    def __init__(self, key: Optional[str] = None) -> None:
+        self.key = key
+        self.items = 0
+        self._decoder = json.JSONDecoder()
+        self._text = codecs.getincrementaldecoder("utf-8")()
+        self._buffer = ""
+        self._pos = 0
+        self._state = _START
+        self._target = False
+        # Перед следующим элементом массива/ключом объекта ожидается запятая
+        self._need_comma = False
+
+    def feed(self, data: bytes) -> List[Any]:
+        self._buffer += self._text.decode(data)
+        return self._drain(final=False)
+
+    def close(self) -> List[Any]:
+        """Разбирает остаток; ValueError — тело оборвано или не JSON."""
+        self._buffer += self._text.decode(b"", final=True)
+        items = self._drain(final=True)
+        if self._state != _DONE:
+            raise ValueError(f"Truncated JSON: stream ended inside {self._where()}")
+        return items
+
+    def _where(self) -> str:
+        return f"array {self.key!r}" if self._state == _ITEMS else "top-level value"
+
+    def _skip_ws(self) -> bool:
+        """Пропускает пробелы; False — буфер кончился."""
+        self._pos = _WHITESPACE.match(self._buffer, self._pos).end()  # type: ignore[union-attr]
+        return self._pos < len(self._buffer)
+
+    def _decode(self, final: bool) -> Optional[Any]:
+        """Очередное значение с позиции; None — значение ещё не пришло целиком."""
+        try:
+            value, end = self._decoder.raw_decode(self._buffer, self._pos)
+        except json.JSONDecodeError:
+            if final:
+                raise
+            return None
+        # Только у числа нет закрывающего символа: "2" может оказаться началом "2.5" —
+        # число принимается, когда за ним уже пришёл разделитель
+        if (
+            not final
+            and isinstance(value, (int, float))
+            and (end == len(self._buffer) or self._buffer[end] not in _DELIMITERS)
+        ):
+            return None
+        self._pos = end
+        return [value]
+
+    def _fail(self, expected: str) -> None:
+        pos = self._pos
+        end = pos + 20
+        raise ValueError(
+            f"Unexpected JSON at offset {pos}: expected {expected}, got {self._buffer[pos:end]!r}"
+        )
+
+    def _drain(self, final: bool) -> List[Any]:
+        items: List[Any] = []
+        while self._state != _DONE and self._skip_ws():
+            char = self._buffer[self._pos]
+            if self._state == _START:
+                if self.key is None:
+                    if char != "[":
+                        self._fail("'['")
+                    self._pos += 1
+                    self._state = _ITEMS
+                else:
+                    if char != "{":
+                        self._fail("'{'")
+                    self._pos += 1
+                    self._state = _KEY
+            elif (self._state, char) in ((_KEY, "}"), (_ITEMS, "]")):
+                self._pos += 1
+                self._state = _DONE
+            elif self._state in (_KEY, _ITEMS) and self._need_comma:
+                if char != ",":
+                    self._fail("','")
+                self._pos += 1
+                self._need_comma = False
+            elif self._state == _KEY:
+                decoded = self._decode(final)
+                if decoded is None:
+                    break
+                if not isinstance(decoded[0], str):
+                    self._fail("object key")
+                self._target = decoded[0] == self.key
+                self._state = _COLON
+            elif self._state == _COLON:
+                if char != ":":
+                    self._fail("':'")
+                self._pos += 1
+                self._state = _VALUE if self._target else _SKIP_VALUE
+            elif self._state == _VALUE and char == "[":
+                self._pos += 1
+                self._state = _ITEMS
+            elif self._state in (_VALUE, _SKIP_VALUE):
+                decoded = self._decode(final)
+                if decoded is None:
+                    break
+                if self._state == _VALUE:
+                    if decoded[0] is not None:
+                        kind = type(decoded[0]).__name__
+                        raise ValueError(f"{self.key!r} is {kind}, expected array or null")
+                    self._state = _DONE
+                else:
+                    self._state = _KEY
+                    self._need_comma = True
+            else:
+                decoded = self._decode(final)
+                if decoded is None:
+                    break
+                items.append(decoded[0])
+                self._need_comma = True
+        # Разобранное больше не нужно — держим только недочитанный хвост
+        if self._pos:
+            consumed = self._pos
+            self._buffer = self._buffer[consumed:]
+            self._pos = 0
+        if self._state == _DONE:
+            # Поля после массива не нужны вызывающему коду
+            self._buffer = ""
+        self.items += len(items)
+        return items
+
+
+def iter_array_items(chunks: Iterable[bytes], key: Optional[str] = None) -> Iterator[Any]:
+    """Элементы массива key из потока кусков тела по мере их прихода."""
+    decoder = ArrayItemDecoder(key)
+    for chunk in chunks:
+        yield from decoder.feed(chunk)
+    yield from decoder.close()
+
+
+async def aiter_array_items(
+    chunks: AsyncIterable[bytes], key: Optional[str] = None
+) -> AsyncIterator[Any]:
+    """Асинхронный вариант iter_array_items (например, для httpx aiter_bytes())."""
+    decoder = ArrayItemDecoder(key)
+    async for chunk in chunks:
+        for item in decoder.feed(chunk):
+            yield item
+    for item in decoder.close():
+        yield item
@@ -0,0 +1,309 @@
+"""Генератор нагрузки с открытой моделью (open-loop) поверх существующих Client Object.
+
+Запросы отправляются по расписанию прибытия (target rps), а не «следующий после
+предыдущего»: медленные ответы не снижают темп генерации, и задержка считается от
+запланированного момента отправки. Так в перцентили попадает и время ожидания в
+очереди — без эффекта coordinated omission.
+
+Пример:
+
+    phases = ramp_profile(target_rps=500, ramp_up=30, steady=120, ramp_down=15)
+    op = LoadOperation(
+        "join_session",
+        lambda i: client.join_session(sid, pin, f"user-{i}"),
+        is_success=success_if((200,)),
+    )
+    report = OpenLoopLoadGenerator([op], phases, max_workers=256).run()
+    print(report.format_table())
+"""
+
+from __future__ import annotations
+
+import math
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence
+
+from .hdr_histogram import LatencyHistogram
+from .logging_utils import get_logger
+
+logger = get_logger(__name__)
+
+PERCENTILES = (50.0, 90.0, 95.0, 99.0, 99.9)
+
+
+@dataclass(frozen=True)
+class LoadPhase:
+    """Фаза нагрузки: интенсивность линейно меняется от start_rps до end_rps."""
+
+    name: str
+    duration_seconds: float
+    start_rps: float
+    end_rps: float
+
+    def expected_requests(self) -> int:
+        return int((self.start_rps + self.end_rps) / 2 * self.duration_seconds)
+
+    def arrival_offset(self, k: int) -> float:
+        """Момент (от начала фазы) k-го прибытия: решение N(t) = k для линейной rps."""
+        r0, r1, duration = self.start_rps, self.end_rps, self.duration_seconds
+        # N(t) = r0 * t + (r1 - r0) * t^2 / (2 * T)
+        a = (r1 - r0) / (2 * duration)
+        if abs(a) < 1e-12:
+            return k / r0
+        discriminant = max(r0 * r0 + 4 * a * k, 0.0)
+        return (-r0 + math.sqrt(discriminant)) / (2 * a)
+
+
+def ramp_profile(
+    target_rps: float,
+    ramp_up: float = 0.0,
+    steady: float = 60.0,
+    ramp_down: float = 0.0,
+) -> List[LoadPhase]:
+    """Профиль ramp-up → steady-state → ramp-down (фазы нулевой длины пропускаются)."""
+    phases = [
+        LoadPhase("ramp-up", ramp_up, 0.0, target_rps),
+        LoadPhase("steady", steady, target_rps, target_rps),
+        LoadPhase("ramp-down", ramp_down, target_rps, 0.0),
+    ]
+    return [p for p in phases if p.duration_seconds > 0 and p.expected_requests() > 0]
+
+
+def _default_success(result: Any) -> bool:
+    """Успех — ответ без 5xx (4xx считаются ожидаемыми ответами бизнес-логики)."""
+    status = getattr(result, "status_code", None)
+    return status is None or int(status) < 500
+
+
+def success_if(statuses: Sequence[int] = (200,), min_size: int = 0) -> Callable[[Any], bool]:
+    """Проверка ответа по статусу и размеру тела (ApiResponse.size) без разбора JSON."""
+    allowed = frozenset(statuses)
+
+    def check(result: Any) -> bool:
+        return result.status_code in allowed and result.size >= min_size
+
+    return check
+
+
+@dataclass
+class LoadOperation:
+    """Операция нагрузки: вызов метода клиента, получающий порядковый номер прибытия."""
+
+    name: str
+    call: Callable[[int], Any]
+    weight: float = 1.0
+    is_success: Callable[[Any], bool] = _default_success
+
+
+@dataclass
+class OperationStats:
+    name: str
+    count: int
+    errors: int
+    achieved_rps: float
+    # Задержка от запланированного момента отправки (с учётом очереди), секунды
+    latency: Dict[str, float]
+    # Чистое время вызова клиента, секунды
+    service_time: Dict[str, float]
+    max_latency: float
+    mean_latency: float
+    latency_histogram: LatencyHistogram = field(repr=False)
+
+    @property
+    def error_rate(self) -> float:
+        return self.errors / self.count if self.count else 0.0
+
+
+@dataclass
+class LoadReport:
+    phases: List[LoadPhase]
+    duration_seconds: float
+    scheduled: int
+    dropped: int
+    operations: Dict[str, OperationStats] = field(default_factory=dict)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "duration_seconds": round(self.duration_seconds, 3),
+            "scheduled": self.scheduled,
+            "dropped": self.dropped,
+            "phases": [
+                {
+                    "name": p.name,
+                    "duration_seconds": p.duration_seconds,
+                    "start_rps": p.start_rps,
+                    "end_rps": p.end_rps,
+                }
+                for p in self.phases
+            ],
+            "operations": {
+                name: {
+                    "count": s.count,
+                    "errors": s.errors,
+                    "error_rate": round(s.error_rate, 4),
+                    "achieved_rps": round(s.achieved_rps, 2),
+                    "latency_ms": {k: round(v * 1000, 3) for k, v in s.latency.items()},
+                    "service_time_ms": {k: round(v * 1000, 3) for k, v in s.service_time.items()},
+                    "max_latency_ms": round(s.max_latency * 1000, 3),
+                    "mean_latency_ms": round(s.mean_latency * 1000, 3),
+                }
+                for name, s in self.operations.items()
+            },
+        }
+
+    def format_table(self) -> str:
+        """Текстовая таблица перцентилей задержки (мс) по операциям."""
+        pct_names = [_pct_name(p) for p in PERCENTILES]
+        header = ["operation", "count", "errors", "rps", *pct_names, "max"]
+        rows = [header]
+        for name, s in sorted(self.operations.items()):
+            rows.append(
+                [
+                    name,
+                    str(s.count),
+                    str(s.errors),
+                    f"{s.achieved_rps:.1f}",
+                    *(f"{s.latency[p] * 1000:.1f}" for p in pct_names),
+                    f"{s.max_latency * 1000:.1f}",
+                ]
+            )
+        widths = [max(len(row[i]) for row in rows) for i in range(len(header))]
+        lines = ["  ".join(cell.rjust(w) for cell, w in zip(row, widths)) for row in rows]
+        lines.append(
+            f"duration={self.duration_seconds:.1f}s scheduled={self.scheduled} "
+            f"dropped={self.dropped}"
+        )
+        return "\n".join(lines)
+
+
+def _pct_name(pct: float) -> str:
+    return f"p{pct:g}"
+
+
+@dataclass
+class _Samples:
+    # HDR-гистограммы вместо списков: память не растёт с длительностью прогона
+    latencies: LatencyHistogram = field(default_factory=LatencyHistogram)
+    service_times: LatencyHistogram = field(default_factory=LatencyHistogram)
+    errors: int = 0
+
+
+class OpenLoopLoadGenerator:
+    """Open-loop генератор: планировщик отправляет вызовы в пул потоков по расписанию.
+
+    Клиенты из http_client.py потокобезопасны (общий пул keep-alive соединений),
+    поэтому один экземпляр клиента можно использовать из всех воркеров; размер пула
+    клиента (pool_size) стоит выставлять не меньше max_workers.
+    """
+
+    def __init__(
+        self,
+        operations: Sequence[LoadOperation],
+        phases: Sequence[LoadPhase],
+        *,
+        max_workers: int = 64,
+        max_in_flight: Optional[int] = None,
+        seed: Optional[int] = None,
+    ) -> None:
+        if not operations:
+            raise ValueError("OpenLoopLoadGenerator requires at least one operation")
+        if not phases:
+            raise ValueError("OpenLoopLoadGenerator requires at least one phase")
+        self.operations = list(operations)
+        self.phases = list(phases)
+        self.max_workers = max_workers
+        # Предохранитель от неограниченного роста очереди, если сервис «повис»:
+        # прибытия сверх лимита не отправляются и учитываются как dropped
+        self.max_in_flight = max_in_flight or max_workers * 10
+        self._rng = random.Random(seed)
+        self._samples: Dict[str, _Samples] = {op.name: _Samples() for op in self.operations}
+        self._lock = threading.Lock()
+        self._in_flight = 0
+
+    def _schedule(self) -> Iterator[float]:
+        """Запланированные моменты прибытий (секунды от старта прогона)."""
+        phase_start = 0.0
+        for phase in self.phases:
+            total = phase.expected_requests()
+            for k in range(total):
+                yield phase_start + phase.arrival_offset(k)
+            phase_start += phase.duration_seconds
+
+    def _pick(self) -> LoadOperation:
+        if len(self.operations) == 1:
+            return self.operations[0]
+        weights = [op.weight for op in self.operations]
+        return self._rng.choices(self.operations, weights=weights, k=1)[0]
+
+    def _execute(self, op: LoadOperation, index: int, intended: float) -> None:
+        started = time.perf_counter()
+        try:
+            ok = op.is_success(op.call(index))
+        except Exception as exc:
+            logger.debug("Load operation failed", extra={"operation": op.name, "error": repr(exc)})
+            ok = False
+        finished = time.perf_counter()
+        with self._lock:
+            self._in_flight -= 1
+            samples = self._samples[op.name]
+            samples.latencies.record(finished - intended)
+            samples.service_times.record(finished - started)
+            if not ok:
+                samples.errors += 1
+
+    def run(self) -> LoadReport:
+        scheduled = 0
+        dropped = 0
+        logger.info(
+            "Load run started",
+            extra={
+                "phases": [p.name for p in self.phases],
+                "operations": [op.name for op in self.operations],
+            },
+        )
+        with ThreadPoolExecutor(
+            max_workers=self.max_workers, thread_name_prefix="load"
+        ) as executor:
+            origin = time.perf_counter()
+            for index, offset in enumerate(self._schedule()):
+                intended = origin + offset
+                delay = intended - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+                scheduled += 1
+                with self._lock:
+                    if self._in_flight >= self.max_in_flight:
+                        dropped += 1
+                        continue
+                    self._in_flight += 1
+                executor.submit(self._execute, self._pick(), index, intended)
+        duration = time.perf_counter() - origin
+
+        report = LoadReport(
+            phases=self.phases,
+            duration_seconds=duration,
+            scheduled=scheduled,
+            dropped=dropped,
+        )
+        for name, samples in self._samples.items():
+            latencies = samples.latencies
+            service_times = samples.service_times
+            report.operations[name] = OperationStats(
+                name=name,
+                count=latencies.total_count,
+                errors=samples.errors,
+                achieved_rps=latencies.total_count / duration if duration else 0.0,
+                latency={_pct_name(p): latencies.value_at_percentile(p) for p in PERCENTILES},
+                service_time={
+                    _pct_name(p): service_times.value_at_percentile(p) for p in PERCENTILES
+                },
+                max_latency=latencies.max,
+                mean_latency=latencies.mean,
+                latency_histogram=latencies,
+            )
+        logger.info("Load run finished", extra={"report": report.to_dict()})
+        return report
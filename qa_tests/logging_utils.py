@@ -1,15 +1,42 @@
 from __future__ import annotations
 
+import atexit
 import json
 import logging
 import os
+import queue
+import re
 import sys
+import threading
+import time
+from collections import OrderedDict
 from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Optional, Tuple
 
 from dotenv import load_dotenv
 
+LOG_QUEUE_POLICIES = ("drop", "block")
+
+# Типы, которые json.dumps сериализует без обращения к default
+_JSON_SCALARS = (str, int, float, bool, type(None))
+
+# Сегмент пути — идентификатор: число, UUID или длинный токен с цифрами (hex id, PIN-код)
+_ID_SEGMENT = re.compile(
+    r"^(?:\d+|[0-9a-fA-F]{8}(?:-[0-9a-fA-F]{4}){3}-[0-9a-fA-F]{12}|(?=[\w-]*\d)[\w-]{16,})$"
+)
+
+
+def route_template(operation: str) -> str:
+    """Операция без query string и с {id} вместо идентификаторов в пути.
+
+    ``GET /session/3f2a...e1/participants?x=1`` -> ``GET /session/{id}/participants``:
+    метки метрик, бюджеты SLO и ключи сэмплирования логов не зависят от конкретных id.
+    """
+    path = operation.split("?", 1)[0]
+    return "/".join("{id}" if _ID_SEGMENT.match(part) else part for part in path.split("/"))
+
 
 class JsonFormatter(logging.Formatter):
     """Форматтер, логирующий сообщения в JSON-формате.
@@ -19,7 +46,8 @@ class JsonFormatter(logging.Formatter):
 
     def format(self, record: logging.LogRecord) -> str:
         payload: Dict[str, Any] = {
-            "timestamp": datetime.now(timezone.utc).isoformat(),
+            # Время события, а не форматирования: при асинхронном логировании они различаются
+            "timestamp": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
             "level": record.levelname,
             "logger": record.name,
             "message": record.getMessage(),
@@ -29,17 +57,179 @@ class JsonFormatter(logging.Formatter):
             payload["exc_info"] = self.formatException(record.exc_info)
 
         for key, value in record.__dict__.items():
-            if key.startswith("_"):
-                continue
-            if key in payload:
+            if key.startswith("_") or key in payload:
                 continue
-            try:
-                json.dumps(value)
-                payload[key] = value
-            except TypeError:
-                payload[key] = repr(value)
+            payload[key] = value
+
+        # Один проход: несериализуемые значения заменяются repr() через default
+        try:
+            return json.dumps(payload, ensure_ascii=False, default=repr)
+        except (TypeError, ValueError):
+            # Нестроковые ключи словарей, циклические ссылки — поштучная проверка
+            return json.dumps(
+                {k: _json_safe(v) for k, v in payload.items()}, ensure_ascii=False, default=repr
+            )
+
+
+def _json_safe(value: Any) -> Any:
+    if isinstance(value, _JSON_SCALARS):
+        return value
+    try:
+        json.dumps(value, default=repr)
+        return value
+    except (TypeError, ValueError):
+        return repr(value)
 
-        return json.dumps(payload, ensure_ascii=False)
+
+class NonBlockingQueueHandler(QueueHandler):
+    """QueueHandler без форматирования в вызывающем потоке и с политикой переполнения.
+
+    Форматирование и запись выполняет QueueListener в фоновом потоке. При заполненной
+    очереди политика "drop" отбрасывает записи ниже WARNING (и считает их), а
+    предупреждения и ошибки ждут места в очереди; политика "block" ждёт всегда.
+    """
+
+    def __init__(self, log_queue: "queue.Queue[Any]", policy: str = "drop") -> None:
+        if policy not in LOG_QUEUE_POLICIES:
+            raise ValueError(
+                f"Unknown log queue policy {policy!r}: expected one of {LOG_QUEUE_POLICIES}"
+            )
+        super().__init__(log_queue)
+        self._queue = log_queue
+        self.policy = policy
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Фиксируем только текст сообщения (args могут измениться после возврата из вызова);
+        # JSON собирается уже в потоке QueueListener
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        if self.policy == "block" or record.levelno >= logging.WARNING:
+            self._queue.put(record)
+            return
+        try:
+            self._queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class SamplingFilter(logging.Filter):
+    """Сэмплирование и ограничение частоты записей о запросах (с атрибутом operation).
+
+    Для каждой пары (сообщение, операция) пропускается каждая sample_rate-я успешная
+    запись и не больше rate_limit записей в секунду; ошибки (WARNING и выше, статус
+    4xx/5xx или "unknown") пишутся всегда. Записи без operation не трогаются.
+    Операция берётся по шаблону пути (route_template): запросы к /tickets/1 и /tickets/2
+    делят один ключ. Счётчики хранятся не больше чем для max_keys ключей — давно не
+    встречавшиеся вытесняются.
+    Отброшенные записи считаются и раз в summary_interval секунд выводятся одной
+    строкой "Log records suppressed" со счётчиками по операциям.
+
+    Решение кэшируется в записи, поэтому один фильтр можно повесить на несколько
+    хендлеров (stdout и TEST_LOG_FILE) — запись учитывается один раз.
+    """
+
+    def __init__(
+        self,
+        sample_rate: int = 1,
+        rate_limit: float = 0.0,
+        summary_interval: float = 10.0,
+        max_keys: int = 10_000,
+    ) -> None:
+        super().__init__()
+        self.sample_rate = max(sample_rate, 1)
+        self.rate_limit = rate_limit
+        self.summary_interval = summary_interval
+        self.max_keys = max(max_keys, 1)
+        self._lock = threading.Lock()
+        self._seen: OrderedDict[Tuple[str, str], int] = OrderedDict()
+        # Token bucket на операцию: (доступные токены, момент последнего пополнения)
+        self._buckets: OrderedDict[Tuple[str, str], Tuple[float, float]] = OrderedDict()
+        self._suppressed: Dict[Tuple[str, str], int] = {}
+        self._last_summary = time.monotonic()
+        self.suppressed_total = 0
+
+    @staticmethod
+    def _is_error(record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING:
+            return True
+        status = str(getattr(record, "status", ""))
+        return status == "unknown" or status[:1] in {"4", "5"}
+
+    def _remember(self, table: OrderedDict[Tuple[str, str], Any], key: Tuple[str, str]) -> None:
+        """LRU: ключ — в конец, самый давний сверх max_keys вытесняется."""
+        table.move_to_end(key)
+        if len(table) > self.max_keys:
+            table.popitem(last=False)
+
+    def _allow(self, key: Tuple[str, str], now: float) -> bool:
+        seen = self._seen.get(key, 0)
+        self._seen[key] = seen + 1
+        self._remember(self._seen, key)
+        if seen % self.sample_rate:
+            return False
+        if self.rate_limit <= 0:
+            return True
+        tokens, updated = self._buckets.get(key, (self.rate_limit, now))
+        tokens = min(tokens + (now - updated) * self.rate_limit, self.rate_limit)
+        allowed = tokens >= 1
+        self._buckets[key] = (tokens - 1 if allowed else tokens, now)
+        self._remember(self._buckets, key)
+        return allowed
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        cached = getattr(record, "_sampled", None)
+        if cached is not None:
+            return bool(cached)
+        operation = getattr(record, "operation", None)
+        if operation is None or self._is_error(record):
+            setattr(record, "_sampled", True)
+            return True
+
+        # Query string и id в пути не разбивают операцию на ключи (как метка operation в metrics)
+        key = (str(record.msg), route_template(str(operation)))
+        now = time.monotonic()
+        with self._lock:
+            allowed = self._allow(key, now)
+            if not allowed:
+                if key not in self._suppressed and len(self._suppressed) >= self.max_keys:
+                    key = (key[0], "<other>")
+                self._suppressed[key] = self._suppressed.get(key, 0) + 1
+                self.suppressed_total += 1
+            summary_due = now - self._last_summary >= self.summary_interval
+        setattr(record, "_sampled", allowed)
+        if summary_due:
+            self.flush()
+        return allowed
+
+    def flush(self) -> None:
+        """Выводит накопленные счётчики отброшенных записей и обнуляет их."""
+        with self._lock:
+            suppressed, self._suppressed = self._suppressed, {}
+            self._last_summary = time.monotonic()
+        if suppressed:
+            logging.getLogger(__name__).info(
+                "Log records suppressed",
+                extra={
+                    "suppressed": [
+                        {"message": message, "operation": operation, "count": count}
+                        for (message, operation), count in sorted(suppressed.items())
+                    ],
+                    "suppressed_count": sum(suppressed.values()),
+                },
+            )
+
+
+_queue_handler: Optional[NonBlockingQueueHandler] = None
+_queue_listener: Optional[QueueListener] = None
+_sampling_filter: Optional[SamplingFilter] = None
+
+
+def _env_flag(name: str) -> bool:
+    return (os.getenv(name) or "").strip().lower() in {"1", "true", "yes", "on"}
 
 
 def configure_root_logger(level: int = logging.INFO) -> None:
@@ -47,13 +237,20 @@ def configure_root_logger(level: int = logging.INFO) -> None:
 
     Вызывать один раз при старте тестового раннера (например, в conftest.py).
     Если задана переменная окружения TEST_LOG_FILE, логи также сохраняются в файл.
+    При TEST_LOG_ASYNC=1 записи ставятся в очередь (TEST_LOG_QUEUE_SIZE,
+    TEST_LOG_QUEUE_POLICY=drop|block), а форматирует и пишет их фоновый поток.
+    TEST_LOG_SAMPLE_RATE / TEST_LOG_RATE_LIMIT включают SamplingFilter для записей о запросах.
     """
+    global _queue_handler, _queue_listener, _sampling_filter
+
     # Загружаем .env файл, если он есть (для чтения TEST_LOG_FILE)
     project_root = Path(__file__).resolve().parent.parent
     env_path = project_root / ".env"
     if env_path.exists():
         load_dotenv(dotenv_path=env_path, override=False)
 
+    shutdown_logging()
+
     handlers: list[logging.Handler] = []
 
     # Всегда выводим в stdout
@@ -79,10 +276,67 @@ def configure_root_logger(level: int = logging.INFO) -> None:
     root = logging.getLogger()
     root.setLevel(level)
     root.handlers.clear()
+
+    _sampling_filter = None
+    sample_rate = int(os.getenv("TEST_LOG_SAMPLE_RATE") or "1")
+    rate_limit = float(os.getenv("TEST_LOG_RATE_LIMIT") or "0")
+    if sample_rate > 1 or rate_limit > 0:
+        _sampling_filter = SamplingFilter(
+            sample_rate=sample_rate,
+            rate_limit=rate_limit,
+            summary_interval=float(os.getenv("TEST_LOG_SAMPLING_SUMMARY_SECONDS") or "10"),
+        )
+
+    if _env_flag("TEST_LOG_ASYNC"):
+        queue_size = int(os.getenv("TEST_LOG_QUEUE_SIZE") or "10000")
+        policy = (os.getenv("TEST_LOG_QUEUE_POLICY") or "drop").strip().lower()
+        log_queue: "queue.Queue[Any]" = queue.Queue(maxsize=queue_size)
+        _queue_handler = NonBlockingQueueHandler(log_queue, policy=policy)
+        # Сэмплирование до постановки в очередь: отброшенные записи не занимают место
+        if _sampling_filter is not None:
+            _queue_handler.addFilter(_sampling_filter)
+        _queue_listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+        _queue_listener.start()
+        root.addHandler(_queue_handler)
+        return
+
     for handler in handlers:
+        if _sampling_filter is not None:
+            handler.addFilter(_sampling_filter)
         root.addHandler(handler)
 
 
+def shutdown_logging() -> None:
+    """Дописывает очередь асинхронного логирования и переключает root на прямые хендлеры.
+
+    Записи, сделанные после вызова (например, в pytest_sessionfinish), пишутся синхронно.
+    Перед этим выводятся оставшиеся счётчики SamplingFilter.
+    """
+    global _queue_handler, _queue_listener
+    if _sampling_filter is not None:
+        _sampling_filter.flush()
+    listener, handler = _queue_listener, _queue_handler
+    if listener is None or handler is None:
+        return
+    _queue_listener = _queue_handler = None
+    listener.stop()
+    root = logging.getLogger()
+    root.removeHandler(handler)
+    for target in listener.handlers:
+        if _sampling_filter is not None:
+            target.addFilter(_sampling_filter)
+        root.addHandler(target)
+    if handler.dropped:
+        print(
+            f"[WARN] Dropped {handler.dropped} log records: log queue was full "
+            "(increase TEST_LOG_QUEUE_SIZE or use TEST_LOG_QUEUE_POLICY=block)",
+            file=sys.stderr,
+        )
+
+
+atexit.register(shutdown_logging)
+
+
 def get_logger(name: Optional[str] = None) -> logging.Logger:
     """Возвращает именованный логгер."""
     return logging.getLogger(name)
@@ -1,13 +1,17 @@
 from __future__ import annotations
 
+import json
+import threading
 import time
 from contextlib import asynccontextmanager, contextmanager
 from dataclasses import dataclass
-from typing import AsyncIterator, Callable, Dict, Iterator
+from pathlib import Path
+from typing import Any, AsyncIterator, Callable, Dict, Iterator, List, Tuple
 
-from prometheus_client import Counter, Histogram
+from prometheus_client import Counter, Gauge, Histogram
 
-from .logging_utils import get_logger
+from .hdr_histogram import LatencyHistogram
+from .logging_utils import get_logger, route_template
 
 logger = get_logger(__name__)
 
@@ -29,21 +33,189 @@ _TEST_FAILURES = Counter(
     ["test_name"],
 )
 
+_HTTP_CONNECTIONS = Counter(
+    "psds_test_http_connections_total",
+    "Выдачи соединений из пулов HTTP-клиентов: new — новое TCP/TLS, reused — keep-alive",
+    ["host", "kind"],
+)
+
+_CIRCUIT_TRANSITIONS = Counter(
+    "psds_test_circuit_breaker_transitions_total",
+    "Переходы circuit breaker REST-клиентов между состояниями",
+    ["target", "from_state", "to_state"],
+)
+
+_CIRCUIT_STATE = Gauge(
+    "psds_test_circuit_breaker_open",
+    "Состояние circuit breaker сервиса: 0 — closed, 0.5 — half_open, 1 — open",
+    ["target"],
+)
+_CIRCUIT_STATE_VALUES = {"closed": 0.0, "half_open": 0.5, "open": 1.0}
+
+
+# Точные (HDR) гистограммы задержек по тем же меткам, что и _REQUEST_LATENCY
+LatencyKey = Tuple[str, str, str]
+_LATENCY_HISTOGRAMS: Dict[LatencyKey, LatencyHistogram] = {}
+# Длительности measure_test_case по (test_name, status) — для базы бенчмарков
+TestDurationKey = Tuple[str, str]
+_TEST_DURATION_HISTOGRAMS: Dict[TestDurationKey, LatencyHistogram] = {}
+_LATENCY_LOCK = threading.Lock()
+
+LATENCY_DUMP_FORMAT = "psds-latency-hdr/1"
+
+
+def _operation_label(operation: str) -> str:
+    """Метка операции по шаблону пути: limit/offset и id не должны плодить наборы меток."""
+    return route_template(operation)
+
+
+def record_latency(service: str, operation: str, status: str, seconds: float) -> None:
+    """Записывает задержку в HDR-гистограмму набора меток (service, operation, status)."""
+    key = (service, operation, status)
+    with _LATENCY_LOCK:
+        histogram = _LATENCY_HISTOGRAMS.get(key)
+        if histogram is None:
+            histogram = _LATENCY_HISTOGRAMS[key] = LatencyHistogram()
+        histogram.record(seconds)
+
+
+def record_test_duration(test_name: str, status: str, seconds: float) -> None:
+    """Записывает длительность тест-кейса в HDR-гистограмму (test_name, status)."""
+    key = (test_name, status)
+    with _LATENCY_LOCK:
+        histogram = _TEST_DURATION_HISTOGRAMS.get(key)
+        if histogram is None:
+            histogram = _TEST_DURATION_HISTOGRAMS[key] = LatencyHistogram()
+        histogram.record(seconds)
+
+
+def _copy_histograms(source: Dict[Any, LatencyHistogram]) -> Dict[Any, LatencyHistogram]:
+    with _LATENCY_LOCK:
+        result = {}
+        for key, histogram in source.items():
+            copy = LatencyHistogram(histogram.significant_figures)
+            copy.merge(histogram)
+            result[key] = copy
+        return result
+
+
+def _merge_into(target: Dict[Any, LatencyHistogram], key: Any, encoded: str) -> None:
+    incoming = LatencyHistogram.decode(encoded)
+    histogram = target.get(key)
+    if histogram is None:
+        target[key] = incoming
+    else:
+        histogram.merge(incoming)
+
+
+def _observe_request(service: str, operation: str, status: str, elapsed: float) -> None:
+    _REQUEST_LATENCY.labels(service=service, operation=operation, status=status).observe(elapsed)
+    record_latency(service, operation, status, elapsed)
+
+
+def latency_histograms() -> Dict[LatencyKey, LatencyHistogram]:
+    """Копия HDR-гистограмм задержек текущего процесса."""
+    return _copy_histograms(_LATENCY_HISTOGRAMS)
+
+
+def test_duration_histograms() -> Dict[TestDurationKey, LatencyHistogram]:
+    """Копия HDR-гистограмм длительностей тест-кейсов текущего процесса."""
+    return _copy_histograms(_TEST_DURATION_HISTOGRAMS)
+
+
+def export_latency_histograms() -> Dict[str, List[Dict[str, Any]]]:
+    """Сериализуемое представление гистограмм (для передачи из воркера xdist)."""
+    with _LATENCY_LOCK:
+        return {
+            "requests": [
+                {"service": s, "operation": o, "status": st, "hdr": h.encode()}
+                for (s, o, st), h in _LATENCY_HISTOGRAMS.items()
+            ],
+            "test_cases": [
+                {"test_name": t, "status": st, "hdr": h.encode()}
+                for (t, st), h in _TEST_DURATION_HISTOGRAMS.items()
+            ],
+        }
+
+
+def merge_latency_histograms(exported: Dict[str, List[Dict[str, Any]]]) -> None:
+    """Вливает гистограммы, полученные export_latency_histograms() другого процесса."""
+    with _LATENCY_LOCK:
+        for entry in exported.get("requests", []):
+            key = (entry["service"], entry["operation"], entry["status"])
+            _merge_into(_LATENCY_HISTOGRAMS, key, entry["hdr"])
+        for entry in exported.get("test_cases", []):
+            _merge_into(
+                _TEST_DURATION_HISTOGRAMS, (entry["test_name"], entry["status"]), entry["hdr"]
+            )
+
+
+def dump_latency_histograms(path: Path) -> None:
+    """Сохраняет гистограммы в JSON: сводка перцентилей для чтения + компактный HDR-блок."""
+    entries = []
+    for (service, operation, status), histogram in sorted(latency_histograms().items()):
+        entries.append(
+            {
+                "service": service,
+                "operation": operation,
+                "status": status,
+                **histogram.summary(),
+                "hdr": histogram.encode(),
+            }
+        )
+    path.parent.mkdir(parents=True, exist_ok=True)
+    body = {"format": LATENCY_DUMP_FORMAT, "histograms": entries}
+    path.write_text(json.dumps(body, ensure_ascii=False, indent=1), encoding="utf-8")
+    logger.info("Latency histograms saved", extra={"path": str(path), "histograms": len(entries)})
+
+
+def load_latency_histograms(path: Path) -> Dict[LatencyKey, LatencyHistogram]:
+    """Читает файл, записанный dump_latency_histograms()."""
+    body = json.loads(path.read_text(encoding="utf-8"))
+    if body.get("format") != LATENCY_DUMP_FORMAT:
+        raise ValueError(f"Unsupported latency histogram file format: {body.get('format')!r}")
+    return {
+        (e["service"], e["operation"], e["status"]): LatencyHistogram.decode(e["hdr"])
+        for e in body["histograms"]
+    }
+
+
+def record_http_connection(host: str, reused: bool) -> None:
+    """Учитывает выдачу соединения из пула HTTP-клиента (новое или переиспользованное)."""
+    _HTTP_CONNECTIONS.labels(host=host, kind="reused" if reused else "new").inc()
+
+
+def record_circuit_transition(target: str, from_state: str, to_state: str) -> None:
+    """Учитывает переход circuit breaker сервиса (target — base_url)."""
+    _CIRCUIT_TRANSITIONS.labels(target=target, from_state=from_state, to_state=to_state).inc()
+    _CIRCUIT_STATE.labels(target=target).set(_CIRCUIT_STATE_VALUES.get(to_state, 0.0))
+
+
+def http_pool_stats() -> Dict[str, Dict[str, int]]:
+    """Снимок статистики пулов текущего процесса: {host: {"new": N, "reused": M}}."""
+    stats: Dict[str, Dict[str, int]] = {}
+    for metric in _HTTP_CONNECTIONS.collect():
+        for sample in metric.samples:
+            if not sample.name.endswith("_total"):
+                continue
+            host_stats = stats.setdefault(sample.labels["host"], {"new": 0, "reused": 0})
+            host_stats[sample.labels["kind"]] = int(sample.value)
+    return stats
+
 
 @contextmanager
 def measure_request(
     service: str, operation: str, status_getter: Callable[[], str]
 ) -> Iterator[None]:
     """Синхронный контекстный менеджер для измерения времени HTTP/WebSocket запросов."""
+    operation = _operation_label(operation)
     start = time.perf_counter()
     try:
         yield
     finally:
         elapsed = time.perf_counter() - start
         status = status_getter()
-        _REQUEST_LATENCY.labels(service=service, operation=operation, status=status).observe(
-            elapsed
-        )
+        _observe_request(service, operation, status, elapsed)
         # Логируем время выполнения запроса в JSON-логи
         logger.info(
             "HTTP request completed",
@@ -61,15 +233,14 @@ async def measure_request_async(
     service: str, operation: str, status_getter: Callable[[], str]
 ) -> AsyncIterator[None]:
     """Асинхронный контекстный менеджер для измерения времени WebSocket-подключений."""
+    operation = _operation_label(operation)
     start = time.perf_counter()
     try:
         yield
     finally:
         elapsed = time.perf_counter() - start
         status = status_getter()
-        _REQUEST_LATENCY.labels(service=service, operation=operation, status=status).observe(
-            elapsed
-        )
+        _observe_request(service, operation, status, elapsed)
         # Логируем время выполнения WebSocket-операции в JSON-логи
         logger.info(
             "WebSocket operation completed",
@@ -96,6 +267,7 @@ def measure_test_case(test_name: str) -> Iterator[Dict[str, float]]:
     finally:
         elapsed = time.perf_counter() - start
         _TEST_DURATION.labels(test_name=test_name, status=status).observe(elapsed)
+        record_test_duration(test_name, status, elapsed)
 
 
 @dataclass
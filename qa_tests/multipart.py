@@ -0,0 +1,92 @@
+"""Потоковое тело multipart/form-data: файл читается с диска кусками по мере отправки.
+
+``requests`` с ``files=`` собирает всё тело в памяти (файл целиком плюс копия при
+склейке частей). MultipartFileStream — file-like объект с ``read(size)`` и известной
+длиной: requests выставляет Content-Length и отправляет тело кусками, в памяти
+одновременно не больше chunk_size байт файла.
+
+Объект также отмечает время первого и последнего чтения — начало и конец отправки
+тела, для замеров пропускной способности загрузки.
+"""
+
+from __future__ import annotations
+
+import os
+import time
+import uuid
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Union
+
+DEFAULT_CHUNK_SIZE = 1 << 20
+
+
+class MultipartFileStream:
+    """Тело multipart/form-data из текстовых полей и одного файла."""
+
+    def __init__(
+        self,
+        fields: Dict[str, str],
+        file_field: str,
+        file_path: Union[str, Path],
+        filename: Optional[str] = None,
+        content_type: str = "application/octet-stream",
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ) -> None:
+        self.file_path = Path(file_path)
+        self.chunk_size = chunk_size
+        self.boundary = uuid.uuid4().hex
+        self.file_size = os.path.getsize(self.file_path)
+
+        parts: List[bytes] = []
+        for name, value in fields.items():
+            parts.append(
+                f'--{self.boundary}\r\nContent-Disposition: form-data; name="{name}"\r\n\r\n'
+                f"{value}\r\n".encode("utf-8")
+            )
+        parts.append(
+            f"--{self.boundary}\r\n"
+            f'Content-Disposition: form-data; name="{file_field}"; '
+            f'filename="{filename or self.file_path.name}"\r\n'
+            f"Content-Type: {content_type}\r\n\r\n".encode("utf-8")
+        )
+        self._head = b"".join(parts)
+        self._tail = f"\r\n--{self.boundary}--\r\n".encode("ascii")
+        self._chunks: Optional[Iterator[bytes]] = None
+        # Остаток текущего куска: memoryview, чтобы чтение мелкими блоками не копировало хвост
+        self._pending = memoryview(b"")
+
+        self.bytes_sent = 0
+        self.first_read_at: Optional[float] = None
+        self.last_read_at: Optional[float] = None
+        # Выставляет клиент: получены заголовки ответа
+        self.response_at: Optional[float] = None
+
+    @property
+    def content_type(self) -> str:
+        return f"multipart/form-data; boundary={self.boundary}"
+
+    def __len__(self) -> int:
+        return len(self._head) + self.file_size + len(self._tail)
+
+    def _iter_chunks(self) -> Iterator[bytes]:
+        yield self._head
+        with open(self.file_path, "rb") as fh:
+            while chunk := fh.read(self.chunk_size):
+                yield chunk
+        yield self._tail
+
+    def read(self, size: int = -1) -> bytes:
+        """Следующий кусок тела (не больше size байт, если size > 0); b"" — конец тела."""
+        if self._chunks is None:
+            self._chunks = self._iter_chunks()
+            self.first_read_at = time.perf_counter()
+        if not self._pending:
+            self._pending = memoryview(next(self._chunks, b""))
+        take = size if size is not None and 0 < size < len(self._pending) else len(self._pending)
+        data = bytes(self._pending[:take])
+        self._pending = self._pending[take:]
+        if data:
+            self.bytes_sent += len(data)
+        else:
+            self.last_read_at = self.last_read_at or time.perf_counter()
+        return data
@@ -0,0 +1,351 @@
+"""Рой подписчиков notification-service: /ws/notify/:user_id?region=&roles=.
+
+Сценарий «сначала простой, потом активность»: подписчики подключаются волнами
+(connect_concurrency одновременных handshake), подписываются на сессии
+(``{"subscribe_session": ...}``, сессии раздаются по кругу) и держат соединение
+idle_seconds без трафика. Затем идут пачки ``AsyncNotificationServiceClient.notify_session``
+по всем сессиям; каждое событие несёт (burst, seq, send_ns) в payload. По подписчику
+считаются задержка доставки (POST -> получение кадра), полнота и дубликаты,
+по клиенту — прирост RSS процесса на одно соединение.
+
+Десятки тысяч сокетов упираются в лимит файловых дескрипторов: перед подключением
+мягкий RLIMIT_NOFILE поднимается до жёсткого.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import itertools
+import json
+import os
+import sys
+import time
+import uuid
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence
+
+from .async_http_client import AsyncNotificationServiceClient
+from .hdr_histogram import LatencyHistogram
+from .load import PERCENTILES
+from .logging_utils import get_logger
+from .ws_client import WebSocketClient
+from .ws_fanout import SubscriberStats, cancel_and_close
+
+logger = get_logger(__name__)
+
+SWARM_EVENT = "swarm.burst"
+
+
+def current_rss_bytes() -> int:
+    """Текущий RSS процесса; без /proc — пиковый RSS из getrusage (точность ниже)."""
+    try:
+        with open("/proc/self/statm", encoding="ascii") as fh:
+            return int(fh.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        import resource
+
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # macOS отдаёт байты, Linux — килобайты
+        return peak if sys.platform == "darwin" else peak * 1024
+
+
+def raise_fd_limit(needed: int) -> int:
+    """Поднимает мягкий лимит дескрипторов (не выше жёсткого); возвращает итоговый лимит."""
+    try:
+        import resource
+    except ImportError:  # Windows
+        return needed
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    target = needed if hard == resource.RLIM_INFINITY else min(needed, hard)
+    if soft != resource.RLIM_INFINITY and soft < target:
+        resource.setrlimit(resource.RLIMIT_NOFILE, (target, hard))
+        soft = target
+    if soft != resource.RLIM_INFINITY and soft < needed:
+        logger.warning("File descriptor limit below swarm size", extra={"limit": soft})
+    return soft
+
+
+def build_event(session_id: str, burst: int, seq: int) -> Dict[str, Any]:
+    return {
+        "event": SWARM_EVENT,
+        "payload": {
+            "session_id": session_id,
+            "burst": burst,
+            "seq": seq,
+            "send_ns": time.perf_counter_ns(),
+        },
+    }
+
+
+def parse_event(data: bytes | memoryview) -> Optional[tuple[int, int, int]]:
+    """(burst, seq, send_ns) из события роя или None для прочих сообщений сервиса."""
+    try:
+        message = json.loads(bytes(data))
+    except ValueError:
+        return None
+    if not isinstance(message, dict) or message.get("event") != SWARM_EVENT:
+        return None
+    payload = message.get("payload")
+    if not isinstance(payload, dict):
+        return None
+    try:
+        return int(payload["burst"]), int(payload["seq"]), int(payload["send_ns"])
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+@dataclass(frozen=True)
+class SwarmConfig:
+    subscribers: int = 1000
+    sessions: int = 10
+    bursts: int = 3
+    events_per_burst: int = 10
+    # Пауза между пачками и простой соединений перед первой пачкой
+    burst_interval: float = 1.0
+    idle_seconds: float = 5.0
+    regions: Sequence[str] = ("ru-msk", "ru-spb")
+    roles: Sequence[str] = ("operator", "operator,premium", "supervisor")
+    connect_concurrency: int = 200
+    # Параллельных POST /notify/session/:id внутри пачки
+    notify_concurrency: int = 32
+    drain_timeout: float = 10.0
+
+    @property
+    def expected_per_subscriber(self) -> int:
+        return self.bursts * self.events_per_burst
+
+
+@dataclass
+class SwarmReport:
+    config: SwarmConfig
+    connected: int
+    connect_failures: int
+    connect_seconds: float
+    events_sent: int
+    notify_failures: int
+    duration_seconds: float
+    latency: LatencyHistogram
+    subscribers: List[SubscriberStats]
+    rss_before_bytes: int
+    rss_connected_bytes: int
+    rss_after_bytes: int = 0
+
+    @property
+    def delivered(self) -> int:
+        return self.latency.total_count
+
+    @property
+    def dropped(self) -> int:
+        return sum(s.dropped for s in self.subscribers)
+
+    @property
+    def duplicates(self) -> int:
+        return sum(s.duplicates for s in self.subscribers)
+
+    @property
+    def incomplete(self) -> int:
+        return sum(1 for s in self.subscribers if not s.complete)
+
+    @property
+    def rss_per_socket_bytes(self) -> float:
+        if not self.connected:
+            return 0.0
+        return (self.rss_connected_bytes - self.rss_before_bytes) / self.connected
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "subscribers": self.config.subscribers,
+            "sessions": self.config.sessions,
+            "bursts": self.config.bursts,
+            "events_per_burst": self.config.events_per_burst,
+            "connected": self.connected,
+            "connect_failures": self.connect_failures,
+            "connect_seconds": round(self.connect_seconds, 3),
+            "events_sent": self.events_sent,
+            "notify_failures": self.notify_failures,
+            "delivered": self.delivered,
+            "dropped": self.dropped,
+            "duplicates": self.duplicates,
+            "incomplete_subscribers": self.incomplete,
+            "duration_seconds": round(self.duration_seconds, 3),
+            "latency_ms": self.latency.summary(PERCENTILES),
+            "rss_before_bytes": self.rss_before_bytes,
+            "rss_connected_bytes": self.rss_connected_bytes,
+            "rss_after_bytes": self.rss_after_bytes,
+            "rss_per_socket_bytes": round(self.rss_per_socket_bytes),
+        }
+
+    def format_table(self) -> str:
+        summary = self.latency.summary(PERCENTILES)
+        pct = "  ".join(f"p{p:g}={summary[f'p{p:g}_ms']:.1f}ms" for p in PERCENTILES)
+        return (
+            f"subscribers={self.config.subscribers} sessions={self.config.sessions} "
+            f"bursts={self.config.bursts}x{self.config.events_per_burst}\n"
+            f"connected={self.connected} failures={self.connect_failures} "
+            f"in {self.connect_seconds:.1f}s  "
+            f"rss/socket={self.rss_per_socket_bytes / 1024:.1f}KiB "
+            f"rss_after={self.rss_after_bytes / 2**20:.1f}MiB\n"
+            f"events_sent={self.events_sent} notify_failures={self.notify_failures} "
+            f"delivered={self.delivered} dropped={self.dropped} duplicates={self.duplicates} "
+            f"incomplete={self.incomplete}\n"
+            f"latency: {pct}  max={summary['max_ms']:.1f}ms"
+        )
+
+
+class NotificationSwarm:
+    """Держит рой сокетов /ws/notify и гоняет через них пачки notify_session.
+
+    Уведомления идут через асинхронный клиент в том же event loop, не более
+    notify_concurrency одновременно: пул клиента (pool_size) должен быть не меньше,
+    иначе в задержку доставки попадает установка новых соединений.
+    """
+
+    def __init__(
+        self,
+        ws_base_url: str,
+        client: AsyncNotificationServiceClient,
+        config: SwarmConfig,
+    ) -> None:
+        self.ws_base_url = ws_base_url.rstrip("/")
+        self.client = client
+        self.config = config
+        self.session_ids = [str(uuid.uuid4()) for _ in range(config.sessions)]
+        self._latency = LatencyHistogram()
+        self._events_sent = 0
+        self._notify_failures = 0
+        self._pending_subscribers = 0
+        self._all_delivered = asyncio.Event()
+
+    def _url(self, user_id: str, index: int) -> str:
+        region = self.config.regions[index % len(self.config.regions)]
+        roles = self.config.roles[index % len(self.config.roles)]
+        return f"{self.ws_base_url}/ws/notify/{user_id}?region={region}&roles={roles}"
+
+    async def _join(
+        self, semaphore: asyncio.Semaphore, ws: WebSocketClient, session_id: str
+    ) -> bool:
+        async with semaphore:
+            try:
+                await ws.connect()
+                await ws.send_json({"subscribe_session": session_id})
+                return True
+            except Exception as exc:
+                logger.warning("Swarm connect failed", extra={"url": ws.url, "error": repr(exc)})
+                return False
+
+    async def _listen(self, ws: WebSocketClient, stats: SubscriberStats) -> None:
+        while not stats.complete:
+            frame = await ws.receive_raw()
+            received_ns = time.perf_counter_ns()
+            event = parse_event(frame)
+            if event is None:
+                continue
+            burst, seq, sent_ns = event
+            if stats.observe(burst, seq):
+                self._latency.record((received_ns - sent_ns) / 1e9)
+        self._pending_subscribers -= 1
+        if self._pending_subscribers == 0:
+            self._all_delivered.set()
+
+    async def _send(
+        self, semaphore: asyncio.Semaphore, session_id: str, burst: int, seq: int
+    ) -> None:
+        async with semaphore:
+            try:
+                resp = await self.client.notify_session(
+                    session_id, build_event(session_id, burst, seq)
+                )
+                ok = resp.status_code == 200
+            except Exception as exc:
+                logger.warning("Swarm notify failed", extra={"error": repr(exc)})
+                ok = False
+        self._events_sent += 1
+        if not ok:
+            self._notify_failures += 1
+
+    async def _burst(self, semaphore: asyncio.Semaphore, burst: int) -> None:
+        await asyncio.gather(
+            *(
+                self._send(semaphore, session_id, burst, seq)
+                for seq in range(self.config.events_per_burst)
+                for session_id in self.session_ids
+            )
+        )
+
+    async def run(self) -> SwarmReport:
+        cfg = self.config
+        # Запас на HTTP-пул notify и служебные дескрипторы процесса
+        raise_fd_limit(cfg.subscribers + cfg.notify_concurrency + 256)
+        if self.client.pool_size < cfg.notify_concurrency:
+            logger.warning(
+                "Notify client pool smaller than notify concurrency",
+                extra={"pool_size": self.client.pool_size, "concurrency": cfg.notify_concurrency},
+            )
+        rss_before = current_rss_bytes()
+
+        sessions = itertools.cycle(self.session_ids)
+        user_ids = [str(uuid.uuid4()) for _ in range(cfg.subscribers)]
+        members = [
+            (WebSocketClient(url=self._url(user_id, index)), next(sessions))
+            for index, user_id in enumerate(user_ids)
+        ]
+        connect_semaphore = asyncio.Semaphore(cfg.connect_concurrency)
+        connect_started = time.perf_counter()
+        joined = await asyncio.gather(
+            *(self._join(connect_semaphore, ws, session_id) for ws, session_id in members)
+        )
+        connect_seconds = time.perf_counter() - connect_started
+        rss_connected = current_rss_bytes()
+        connected = joined.count(True)
+        logger.info(
+            "Swarm connected",
+            extra={
+                "connections": cfg.subscribers,
+                "failed": cfg.subscribers - connected,
+                "connect_seconds": round(connect_seconds, 3),
+            },
+        )
+
+        stats = [
+            SubscriberStats(session_id, user_id, cfg.expected_per_subscriber)
+            for (_, session_id), user_id in zip(members, user_ids)
+        ]
+        live = [(ws, s) for (ws, _), s, ok in zip(members, stats, joined) if ok]
+        self._pending_subscribers = len(live)
+        tasks = [asyncio.create_task(self._listen(ws, s)) for ws, s in live]
+        notify_semaphore = asyncio.Semaphore(cfg.notify_concurrency)
+
+        try:
+            # Простой: соединения открыты и подписаны, трафика нет
+            await asyncio.sleep(cfg.idle_seconds)
+            started = time.perf_counter()
+            for burst in range(cfg.bursts):
+                if burst:
+                    await asyncio.sleep(cfg.burst_interval)
+                await self._burst(notify_semaphore, burst)
+            if self._pending_subscribers:
+                try:
+                    await asyncio.wait_for(self._all_delivered.wait(), cfg.drain_timeout)
+                except asyncio.TimeoutError:
+                    pass
+            duration = time.perf_counter() - started
+            rss_after = current_rss_bytes()
+        finally:
+            await cancel_and_close(tasks, [ws for ws, _ in members])
+
+        report = SwarmReport(
+            config=cfg,
+            connected=connected,
+            connect_failures=cfg.subscribers - connected,
+            connect_seconds=connect_seconds,
+            events_sent=self._events_sent,
+            notify_failures=self._notify_failures,
+            duration_seconds=duration,
+            latency=self._latency,
+            subscribers=stats,
+            rss_before_bytes=rss_before,
+            rss_connected_bytes=rss_connected,
+            rss_after_bytes=rss_after,
+        )
+        logger.info("Swarm run finished", extra={"report": report.to_dict()})
+        return report
@@ -0,0 +1,274 @@
+"""Бенчмарк конкуренции за GET /operator/next (operator-pool-service).
+
+Когда очередь клиентов разгружается, все входящие клиенты запрашивают оператора
+одновременно. Бенчмарк:
+
+1. регистрирует ``operators`` операторов через ``set_status`` (available, ``max_sessions``
+   по кругу из ``max_sessions`` конфигурации);
+2. волнами запрашивает ``/operator/next``: в каждой волне ``callers`` потоков ждут на
+   барьере и стартуют одновременно; волн столько, чтобы запросов было больше ёмкости пула
+   (сумма max_sessions) — после её исчерпания ожидается 404;
+3. снимает операторов с доступности (available=false), чтобы не влиять на другие тесты.
+
+Отчёт: задержка (всего и по статусам), назначения по операторам, перегрузка — назначения
+сверх max_sessions, справедливость — индекс Джайна по числу назначений и по загрузке
+(назначения / max_sessions) в первой половине ёмкости, пока пул не насыщен. Назначения
+операторам не из популяции (оставшимся в пуле от других тестов) считаются отдельно.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+import uuid
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence
+
+from .hdr_histogram import LatencyHistogram
+from .http_client import OperatorPoolServiceClient
+from .load import PERCENTILES
+from .logging_utils import get_logger
+
+logger = get_logger(__name__)
+
+
+def jain_index(values: Sequence[float]) -> Optional[float]:
+    """Индекс справедливости Джайна: 1 — поровну, 1/n — всё одному."""
+    if not values:
+        return None
+    squares = sum(v * v for v in values)
+    return sum(values) ** 2 / (len(values) * squares) if squares > 0 else 1.0
+
+
+@dataclass(frozen=True)
+class OperatorPoolBenchConfig:
+    operators: int = 200
+    # max_sessions операторов — по кругу из этого набора
+    max_sessions: Sequence[int] = (1, 2, 3, 5)
+    callers: int = 100
+    # Волн одновременных вызовов; None — ёмкость пула × overload_factor / callers
+    waves: Optional[int] = None
+    overload_factor: float = 1.5
+    # Параллельность set_status при регистрации и снятии операторов
+    register_concurrency: int = 32
+
+
+@dataclass
+class NextCall:
+    wave: int
+    status_code: int
+    latency_seconds: float
+    finished_at: float
+    operator_id: Optional[str] = None
+    error: str = ""
+
+
+@dataclass
+class OperatorPoolReport:
+    config: OperatorPoolBenchConfig
+    max_sessions: Dict[str, int]
+    calls: List[NextCall] = field(default_factory=list)
+    wall_seconds: float = 0.0
+
+    @property
+    def capacity(self) -> int:
+        return sum(self.max_sessions.values())
+
+    @property
+    def errors(self) -> int:
+        return sum(1 for c in self.calls if c.error or c.status_code not in (200, 404))
+
+    def assignments(self) -> Counter[str]:
+        return Counter(c.operator_id for c in self.calls if c.operator_id in self.max_sessions)
+
+    @property
+    def foreign_assignments(self) -> int:
+        return sum(
+            1 for c in self.calls if c.operator_id and c.operator_id not in self.max_sessions
+        )
+
+    def over_assigned(self) -> Dict[str, int]:
+        """Операторы, получившие больше max_sessions назначений: {id: сверх лимита}."""
+        return {
+            op: count - self.max_sessions[op]
+            for op, count in self.assignments().items()
+            if count > self.max_sessions[op]
+        }
+
+    def premature_not_found(self) -> int:
+        """404 при свободной ёмкости: ответы 404 волн, после которых ёмкость не исчерпана.
+
+        Порядок обработки внутри волны на сервере неизвестен, поэтому 404 волны считается
+        законным, если к её концу назначено не меньше capacity.
+        """
+        assigned = 0
+        premature = 0
+        for wave in sorted({c.wave for c in self.calls}):
+            calls = [c for c in self.calls if c.wave == wave]
+            assigned += sum(1 for c in calls if c.operator_id in self.max_sessions)
+            if assigned < self.capacity:
+                premature += sum(1 for c in calls if c.status_code == 404)
+        return premature
+
+    def fairness(self) -> Dict[str, Optional[float]]:
+        """Индексы Джайна по первой половине ёмкости (в порядке завершения вызовов)."""
+        window = max(self.capacity // 2, 1)
+        ordered = sorted(
+            (c for c in self.calls if c.operator_id in self.max_sessions),
+            key=lambda c: c.finished_at,
+        )
+        counts = Counter(c.operator_id for c in ordered[:window])
+        assigned = [float(counts.get(op, 0)) for op in self.max_sessions]
+        utilization = [counts.get(op, 0) / limit for op, limit in self.max_sessions.items()]
+        return {"assignments": jain_index(assigned), "utilization": jain_index(utilization)}
+
+    def _histogram(self, status: Optional[int] = None) -> LatencyHistogram:
+        histogram = LatencyHistogram()
+        for call in self.calls:
+            if not call.error and (status is None or call.status_code == status):
+                histogram.record(call.latency_seconds)
+        return histogram
+
+    def to_dict(self) -> Dict[str, Any]:
+        statuses = Counter(str(c.status_code) if not c.error else c.error for c in self.calls)
+        fairness = self.fairness()
+        over = self.over_assigned()
+        return {
+            "operators": len(self.max_sessions),
+            "capacity": self.capacity,
+            "callers": self.config.callers,
+            "requests": len(self.calls),
+            "wall_seconds": round(self.wall_seconds, 3),
+            "rps": round(len(self.calls) / self.wall_seconds, 1) if self.wall_seconds else 0,
+            "statuses": dict(statuses),
+            "assigned": sum(self.assignments().values()),
+            "foreign_assignments": self.foreign_assignments,
+            "operators_never_assigned": sum(
+                1 for op in self.max_sessions if op not in self.assignments()
+            ),
+            "over_assigned_operators": len(over),
+            "over_assigned_sessions": sum(over.values()),
+            "premature_not_found": self.premature_not_found(),
+            "fairness_jain_assignments": _round(fairness["assignments"]),
+            "fairness_jain_utilization": _round(fairness["utilization"]),
+            "latency_ms": self._histogram().summary(PERCENTILES),
+            "latency_200_ms": self._histogram(200).summary(PERCENTILES),
+            "latency_404_ms": self._histogram(404).summary(PERCENTILES),
+        }
+
+    def format_table(self) -> str:
+        d = self.to_dict()
+        rows = [["metric", "value"]]
+        for key in (
+            "operators",
+            "capacity",
+            "callers",
+            "requests",
+            "rps",
+            "statuses",
+            "assigned",
+            "foreign_assignments",
+            "operators_never_assigned",
+            "over_assigned_operators",
+            "over_assigned_sessions",
+            "premature_not_found",
+            "fairness_jain_assignments",
+            "fairness_jain_utilization",
+        ):
+            rows.append([key, str(d[key])])
+        for key in ("latency_ms", "latency_200_ms", "latency_404_ms"):
+            summary = d[key]
+            rows.append(
+                [
+                    key,
+                    f"p50 {summary['p50_ms']:.1f}  p95 {summary['p95_ms']:.1f}  "
+                    f"p99 {summary['p99_ms']:.1f}  max {summary['max_ms']:.1f}",
+                ]
+            )
+        width = max(len(row[0]) for row in rows)
+        return "\n".join(f"{row[0].ljust(width)}  {row[1]}" for row in rows)
+
+
+def _round(value: Optional[float]) -> Optional[float]:
+    return None if value is None else round(value, 3)
+
+
+class OperatorPoolBenchmark:
+    def __init__(self, client: OperatorPoolServiceClient, config: OperatorPoolBenchConfig) -> None:
+        self.client = client
+        self.config = config
+        limits = config.max_sessions or (1,)
+        self.max_sessions: Dict[str, int] = {
+            str(uuid.uuid4()): limits[i % len(limits)] for i in range(config.operators)
+        }
+
+    def _set_status(self, available: bool) -> int:
+        """Выставляет статус всей популяции; возвращает число неуспешных вызовов."""
+
+        def call(item: Any) -> bool:
+            operator_id, limit = item
+            try:
+                resp = self.client.set_status(
+                    {"user_id": operator_id, "available": available, "max_sessions": limit}
+                )
+            except Exception as exc:
+                logger.warning(
+                    "Operator status update failed",
+                    extra={"operator_id": operator_id, "error": repr(exc)},
+                )
+                return False
+            return resp.status_code == 200
+
+        with ThreadPoolExecutor(max_workers=self.config.register_concurrency) as pool:
+            return sum(1 for ok in pool.map(call, self.max_sessions.items()) if not ok)
+
+    def _next(self, wave: int, barrier: threading.Barrier) -> NextCall:
+        try:
+            barrier.wait(timeout=30)
+        except threading.BrokenBarrierError:
+            pass
+        started = time.perf_counter()
+        try:
+            resp = self.client.next_operator()
+        except Exception as exc:
+            now = time.perf_counter()
+            return NextCall(wave, 0, now - started, now, error=type(exc).__name__)
+        now = time.perf_counter()
+        body = resp.json if isinstance(resp.json, dict) else {}
+        operator_id = body.get("operatorId") or body.get("operator_id")
+        return NextCall(
+            wave,
+            resp.status_code,
+            now - started,
+            now,
+            operator_id=str(operator_id) if resp.status_code == 200 and operator_id else None,
+        )
+
+    def run(self) -> OperatorPoolReport:
+        cfg = self.config
+        report = OperatorPoolReport(config=cfg, max_sessions=dict(self.max_sessions))
+        failed = self._set_status(True)
+        if failed:
+            logger.warning("Some operators were not registered", extra={"failed": failed})
+        waves = cfg.waves or max(
+            int(report.capacity * cfg.overload_factor + cfg.callers - 1) // cfg.callers, 1
+        )
+        logger.info(
+            "Operator pool contention started",
+            extra={"operators": cfg.operators, "capacity": report.capacity, "waves": waves},
+        )
+        started = time.perf_counter()
+        try:
+            with ThreadPoolExecutor(max_workers=cfg.callers, thread_name_prefix="next") as pool:
+                for wave in range(waves):
+                    barrier = threading.Barrier(cfg.callers)
+                    report.calls.extend(
+                        pool.map(lambda _: self._next(wave, barrier), range(cfg.callers))
+                    )
+            report.wall_seconds = time.perf_counter() - started
+        finally:
+            self._set_status(False)
+        logger.info("Operator pool contention finished", extra=report.to_dict())
+        return report
@@ -0,0 +1,292 @@
+"""Ленивый обход list-эндпоинтов с limit/offset.
+
+    scanner = scan_tickets(ticket_service_client, page_size=100)
+    for ticket in scanner:
+        ...
+    print(scanner.depth_profile().format_table())
+
+Пока вызывающий код обрабатывает страницу, следующая уже запрашивается в фоновом
+потоке (prefetch); обход останавливается на неполной странице, по полю ``total``
+ответа (если есть), на ответе не 200 или по лимитам max_pages/max_items. Для каждой
+страницы запоминается время запроса и offset: профиль «задержка против глубины»
+показывает O(offset)-деградацию (например, OFFSET без индексного курсора на больших
+таблицах). Базой для сравнения служат первые BASELINE_PAGES страниц, а группы глубины
+меньше MIN_BUCKET_PAGES страниц в оценке замедления не участвуют: медиана одной-двух
+страниц — это шум, а не тренд.
+"""
+
+from __future__ import annotations
+
+import math
+import statistics
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from .hdr_histogram import LatencyHistogram
+from .http_client import (
+    ApiGatewayClient,
+    ApiResponse,
+    OperatorDirectoryServiceClient,
+    TicketServiceClient,
+)
+from .load import PERCENTILES
+from .logging_utils import get_logger
+
+logger = get_logger(__name__)
+
+# fetch(limit, offset) -> ответ list-эндпоинта
+PageFetcher = Callable[[int, int], ApiResponse]
+
+# Сколько первых страниц образуют базу для сравнения с глубокими
+BASELINE_PAGES = 10
+# Минимум страниц в группе глубины (и в базе), чтобы её медиана что-то значила
+MIN_BUCKET_PAGES = 5
+
+
+@dataclass
+class Page:
+    offset: int
+    limit: int
+    status_code: int
+    latency_seconds: float
+    items: List[Any] = field(default_factory=list)
+    # Поле total ответа, если эндпоинт его отдаёт
+    total: Optional[int] = None
+
+    @property
+    def last(self) -> bool:
+        if self.status_code != 200 or len(self.items) < self.limit:
+            return True
+        return self.total is not None and self.offset + len(self.items) >= self.total
+
+
+def depth_bucket(offset: int) -> int:
+    """Нижняя граница десятичного порядка offset: 0, 1, 10, 100, 1000, ..."""
+    return 0 if offset <= 0 else 10 ** int(math.log10(offset))
+
+
+@dataclass
+class DepthProfile:
+    """Задержка страниц по порядкам глубины offset."""
+
+    buckets: Dict[int, LatencyHistogram]
+    # Первые страницы обхода и offset, с которого начинаются страницы за базой
+    baseline: LatencyHistogram = field(default_factory=LatencyHistogram)
+    baseline_until: int = 0
+
+    @property
+    def deepest_bucket(self) -> Optional[int]:
+        """Самая глубокая группа за пределами базы, в которой не меньше MIN_BUCKET_PAGES страниц."""
+        eligible = [
+            bucket
+            for bucket, histogram in self.buckets.items()
+            if bucket >= self.baseline_until and histogram.total_count >= MIN_BUCKET_PAGES
+        ]
+        return max(eligible) if eligible else None
+
+    @property
+    def slowdown(self) -> Optional[float]:
+        """Во сколько раз медиана самой глубокой группы больше медианы первых страниц."""
+        deepest = self.deepest_bucket
+        if deepest is None or self.baseline.total_count < MIN_BUCKET_PAGES:
+            return None
+        shallow = self.baseline.value_at_percentile(50)
+        deep = self.buckets[deepest].value_at_percentile(50)
+        return deep / shallow if shallow > 0 else None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "slowdown": None if self.slowdown is None else round(self.slowdown, 2),
+            "baseline_pages": self.baseline.total_count,
+            "slowdown_bucket": self.deepest_bucket,
+            "buckets": [
+                {
+                    "offset_from": bucket,
+                    "pages": histogram.total_count,
+                    "latency_ms": histogram.summary(PERCENTILES),
+                }
+                for bucket, histogram in sorted(self.buckets.items())
+            ],
+        }
+
+    def format_table(self) -> str:
+        rows = [["offset>=", "pages", "p50", "p95", "p99", "max"]]
+        for bucket, histogram in sorted(self.buckets.items()):
+            summary = histogram.summary(PERCENTILES)
+            rows.append(
+                [
+                    str(bucket),
+                    str(histogram.total_count),
+                    f"{summary['p50_ms']:.1f}ms",
+                    f"{summary['p95_ms']:.1f}ms",
+                    f"{summary['p99_ms']:.1f}ms",
+                    f"{summary['max_ms']:.1f}ms",
+                ]
+            )
+        widths = [max(len(row[i]) for row in rows) for i in range(len(rows[0]))]
+        table = "\n".join("  ".join(c.rjust(w) for c, w in zip(row, widths)) for row in rows)
+        if self.slowdown is not None:
+            table += (
+                f"\nslowdown p50 offset>={self.deepest_bucket} / first "
+                f"{self.baseline.total_count} pages: x{self.slowdown:.2f}"
+            )
+        return table
+
+
+class PageScanner:
+    """Итератор по элементам всех страниц эндпоинта; страницы — в self.pages."""
+
+    def __init__(
+        self,
+        fetch: PageFetcher,
+        items_key: str,
+        *,
+        page_size: int = 50,
+        start_offset: int = 0,
+        max_pages: Optional[int] = None,
+        max_items: Optional[int] = None,
+        prefetch: bool = True,
+        name: str = "",
+    ) -> None:
+        self.fetch = fetch
+        self.items_key = items_key
+        self.page_size = page_size
+        self.start_offset = start_offset
+        self.max_pages = max_pages
+        self.max_items = max_items
+        self.prefetch = prefetch
+        self.name = name or items_key
+        self.pages: List[Page] = []
+
+    def _load(self, offset: int) -> Page:
+        started = time.perf_counter()
+        resp = self.fetch(self.page_size, offset)
+        latency = time.perf_counter() - started
+        body = (resp.json or {}) if resp.status_code == 200 else {}
+        items = body.get(self.items_key)
+        total = body.get("total")
+        return Page(
+            offset=offset,
+            limit=self.page_size,
+            status_code=resp.status_code,
+            latency_seconds=latency,
+            items=items if isinstance(items, list) else [],
+            total=int(total) if isinstance(total, (int, str)) and str(total).isdigit() else None,
+        )
+
+    def iter_pages(self) -> Iterator[Page]:
+        """Страницы по порядку; следующая запрашивается, пока текущая обрабатывается."""
+        executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="page-prefetch")
+        offset = self.start_offset
+        pending: Optional[Future[Page]] = executor.submit(self._load, offset)
+        pages = 0
+        try:
+            while pending is not None:
+                page = pending.result()
+                pages += 1
+                self.pages.append(page)
+                offset += self.page_size
+                more = not page.last and (self.max_pages is None or pages < self.max_pages)
+                pending = executor.submit(self._load, offset) if more and self.prefetch else None
+                yield page
+                if more and pending is None:
+                    pending = executor.submit(self._load, offset)
+        finally:
+            if pending is not None:
+                pending.cancel()
+            executor.shutdown(wait=True)
+            self._log_summary()
+
+    def __iter__(self) -> Iterator[Any]:
+        produced = 0
+        for page in self.iter_pages():
+            for item in page.items:
+                if self.max_items is not None and produced >= self.max_items:
+                    return
+                produced += 1
+                yield item
+
+    def depth_profile(self, baseline_pages: int = BASELINE_PAGES) -> DepthProfile:
+        buckets: Dict[int, LatencyHistogram] = {}
+        baseline = LatencyHistogram()
+        baseline_until = self.start_offset
+        for page in self.pages:
+            if page.status_code != 200:
+                continue
+            if baseline.total_count < baseline_pages:
+                baseline.record(page.latency_seconds)
+                baseline_until = page.offset + page.limit
+            bucket = depth_bucket(page.offset)
+            if bucket not in buckets:
+                buckets[bucket] = LatencyHistogram()
+            buckets[bucket].record(page.latency_seconds)
+        return DepthProfile(buckets, baseline=baseline, baseline_until=baseline_until)
+
+    def _log_summary(self) -> None:
+        if not self.pages:
+            return
+        latencies = [p.latency_seconds for p in self.pages]
+        logger.info(
+            "Pagination scan finished",
+            extra={
+                "endpoint": self.name,
+                "pages": len(self.pages),
+                "items": sum(len(p.items) for p in self.pages),
+                "last_offset": self.pages[-1].offset,
+                "last_status": self.pages[-1].status_code,
+                "median_page_seconds": round(statistics.median(latencies), 4),
+            },
+        )
+
+
+def scan_tickets(client: TicketServiceClient, **kwargs: Any) -> PageScanner:
+    """GET /api/v1/tickets -> {"tickets": [...]}."""
+    return PageScanner(
+        lambda limit, offset: client.list_tickets(limit=limit, offset=offset),
+        "tickets",
+        name="GET /api/v1/tickets",
+        **kwargs,
+    )
+
+
+def scan_operators(
+    client: OperatorDirectoryServiceClient,
+    *,
+    region: Optional[str] = None,
+    role: Optional[str] = None,
+    status: Optional[str] = None,
+    **kwargs: Any,
+) -> PageScanner:
+    """GET /api/v1/operators (operator-directory) -> {"operators": [...]}."""
+    return PageScanner(
+        lambda limit, offset: client.list_operators(
+            region=region, role=role, status=status, limit=limit, offset=offset
+        ),
+        "operators",
+        name="GET /api/v1/operators",
+        **kwargs,
+    )
+
+
+def scan_user_sessions(
+    client: ApiGatewayClient, token: str, user_id: str, **kwargs: Any
+) -> PageScanner:
+    """GET /api/v1/users/{id}/sessions -> {"sessions": [...]}."""
+    return PageScanner(
+        lambda limit, offset: client.list_user_sessions(token, user_id, limit=limit, offset=offset),
+        "sessions",
+        name="GET users_sessions",
+        **kwargs,
+    )
+
+
+def scan_available_operators(client: ApiGatewayClient, **kwargs: Any) -> PageScanner:
+    """GET /api/v1/operators/available -> {"operators": [...]}."""
+    return PageScanner(
+        lambda limit, offset: client.operators_available(limit=limit, offset=offset),
+        "operators",
+        name="GET operators_available",
+        **kwargs,
+    )
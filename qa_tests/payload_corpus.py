@@ -0,0 +1,201 @@
+"""Заранее сгенерированный корпус payload'ов в компактном файле, читаемый через mmap.
+
+Генерация payload'а регистрации (Faker + pydantic-валидация EmailStr) стоит десятки
+микросекунд CPU клиента — на скоростях нагрузочного теста это заметно. Корпус строится
+один раз вне окна измерений, а воркеры читают записи из отображённого в память файла:
+на запрос приходится срез байтов и ``json.loads``.
+
+    python -m qa_tests.payload_corpus build --count 200000 --seed 42
+    python -m qa_tests.payload_corpus info
+
+Формат файла (целые — little-endian):
+
+- заголовок 64 байта: magic ``PSDSPC01``, число записей (u64), вид корпуса (32 байта
+  UTF-8, дополнен нулями), seed генерации (i64, -1 — без seed), 8 байт резерва;
+- таблица смещений: count + 1 значений u64 относительно начала данных;
+- данные: записи подряд, каждая — компактный JSON (без пробелов) в UTF-8.
+"""
+
+from __future__ import annotations
+
+import argparse
+import itertools
+import json
+import mmap
+import os
+import struct
+import sys
+import tempfile
+from array import array
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, Optional, Sequence, Tuple
+
+from .logging_utils import get_logger
+
+logger = get_logger(__name__)
+
+CORPUS_MAGIC = b"PSDSPC01"
+_HEADER = struct.Struct("<8sQ32sq8x")
+_OFFSET = struct.Struct("<Q")
+
+Payload = Dict[str, Any]
+
+
+def build_corpus(
+    path: Path,
+    kind: str,
+    count: int,
+    builder: Callable[[], Payload],
+    seed: Optional[int] = None,
+) -> Path:
+    """Пишет count записей builder() в path (атомарно: через временный файл рядом)."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    offsets = array("Q", [0])
+    fd, tmp_name = tempfile.mkstemp(prefix=f".{path.name}.", dir=path.parent)
+    try:
+        with tempfile.TemporaryFile() as data, os.fdopen(fd, "wb") as out:
+            for _ in range(count):
+                record = json.dumps(builder(), ensure_ascii=False, separators=(",", ":"))
+                offsets.append(offsets[-1] + data.write(record.encode("utf-8")))
+            if sys.byteorder != "little":
+                offsets.byteswap()
+            out.write(
+                _HEADER.pack(
+                    CORPUS_MAGIC, count, kind.encode("utf-8"), -1 if seed is None else seed
+                )
+            )
+            out.write(offsets.tobytes())
+            data.seek(0)
+            while chunk := data.read(1 << 20):
+                out.write(chunk)
+        os.replace(tmp_name, path)
+    except BaseException:
+        os.unlink(tmp_name)
+        raise
+    logger.info(
+        "Payload corpus built",
+        extra={"path": str(path), "kind": kind, "count": count, "bytes": path.stat().st_size},
+    )
+    return path
+
+
+class PayloadCorpus:
+    """Корпус, отображённый в память; записи декодируются по требованию."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        with open(path, "rb") as fh:
+            self._mmap = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, count, kind, seed = _HEADER.unpack_from(self._mmap, 0)
+        if magic != CORPUS_MAGIC:
+            self._mmap.close()
+            raise ValueError(f"{path} is not a payload corpus (magic {magic!r})")
+        self.count: int = count
+        self.kind: str = kind.rstrip(b"\0").decode("utf-8")
+        self.seed: Optional[int] = None if seed < 0 else seed
+        self._data_start = _HEADER.size + _OFFSET.size * (count + 1)
+
+    def __len__(self) -> int:
+        return self.count
+
+    def _offset(self, index: int) -> int:
+        return int(_OFFSET.unpack_from(self._mmap, _HEADER.size + _OFFSET.size * index)[0])
+
+    def raw(self, index: int) -> bytes:
+        """JSON записи index как есть (без разбора)."""
+        if not 0 <= index < self.count:
+            raise IndexError(f"corpus record {index} out of range 0..{self.count - 1}")
+        start = self._data_start + self._offset(index)
+        end = self._data_start + self._offset(index + 1)
+        return self._mmap[start:end]
+
+    def __getitem__(self, index: int) -> Payload:
+        payload: Payload = json.loads(self.raw(index))
+        return payload
+
+    def __iter__(self) -> Iterator[Payload]:
+        return (self[i] for i in range(self.count))
+
+    def cursor(self, worker: int = 0, workers: int = 1) -> "CorpusCursor":
+        """Курсор по доле worker из workers (у воркеров xdist — непересекающиеся записи)."""
+        workers = max(workers, 1)
+        start = self.count * worker // workers
+        stop = self.count * (worker + 1) // workers
+        return CorpusCursor(self, start, stop)
+
+    def close(self) -> None:
+        self._mmap.close()
+
+    def __enter__(self) -> "PayloadCorpus":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+
+class CorpusCursor:
+    """Потокобезопасная выдача записей диапазона по кругу.
+
+    next() возвращает (порядковый номер выдачи, payload): номер растёт и после того, как
+    диапазон пройден по второму кругу, — по нему вызывающий код делает поля уникальными.
+    """
+
+    def __init__(self, corpus: PayloadCorpus, start: int, stop: int) -> None:
+        if stop <= start:
+            raise ValueError(f"Empty corpus range {start}..{stop} in {corpus.path}")
+        self.corpus = corpus
+        self.start = start
+        self.size = stop - start
+        # next() у itertools.count атомарен под GIL — отдельная блокировка не нужна
+        self._served = itertools.count()
+
+    def next(self) -> Tuple[int, Payload]:
+        served = next(self._served)
+        return served, self.corpus[self.start + served % self.size]
+
+    def __iter__(self) -> Iterator[Payload]:
+        while True:
+            yield self.next()[1]
+
+
+# --- CLI ---
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    from . import data_factory
+    from .config import get_settings
+
+    default_path = get_settings().data_factory_corpus
+    parser = argparse.ArgumentParser(
+        prog="python -m qa_tests.payload_corpus",
+        description="Построение и просмотр корпуса payload'ов для нагрузочных тестов",
+    )
+    parser.add_argument(
+        "--path", type=Path, default=default_path, help="Файл корпуса (DATA_FACTORY_CORPUS)"
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+    build_cmd = commands.add_parser("build", help="Сгенерировать корпус")
+    build_cmd.add_argument("--kind", choices=sorted(data_factory.CORPUS_BUILDERS))
+    build_cmd.add_argument("--count", type=int, default=100_000)
+    build_cmd.add_argument("--seed", type=int, help="Seed Faker (воспроизводимый корпус)")
+    commands.add_parser("info", help="Заголовок и первая запись корпуса")
+    args = parser.parse_args(argv)
+    if args.path is None:
+        raise SystemExit("DATA_FACTORY_CORPUS is empty: pass --path explicitly")
+
+    if args.command == "build":
+        kind = args.kind or "user_registration"
+        data_factory.set_seed(args.seed)
+        build_corpus(args.path, kind, args.count, data_factory.CORPUS_BUILDERS[kind], args.seed)
+
+    with PayloadCorpus(args.path) as corpus:
+        size = args.path.stat().st_size
+        print(f"{args.path}: kind={corpus.kind} count={len(corpus)} seed={corpus.seed}")
+        print(f"{size} bytes, {size / max(len(corpus), 1):.1f} bytes/record")
+        if len(corpus):
+            print(corpus.raw(0).decode("utf-8"))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
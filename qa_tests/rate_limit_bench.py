@@ -0,0 +1,405 @@
+"""Характеризация rate limiter'а API Gateway по границе 200/429.
+
+Лимитер моделируется token bucket'ом на токен доступа: ёмкость ``burst`` запросов,
+пополнение ``refill`` запросов в секунду. Бенчмарк гоняет ``rate_limited_endpoint``
+одновременно с ``tokens`` токенами (каждый — отдельный пользователь):
+
+1. burst — после паузы на пополнение бакета каждый токен отправляет ``burst_requests``
+   запросов разом; принятые сверх пополнения за время всплеска — оценка ёмкости;
+2. ступени — open-loop: каждый токен шлёт запросы с постоянной частотой из ``rates``
+   (запросов в секунду на токен, отправки токенов чередуются) в течение
+   ``step_seconds``. Вторая половина ступени (``tail_share``) — установившийся режим:
+   бакет уже опустошён, и частота принятых запросов на насыщенной ступени равна
+   скорости пополнения; эффективный лимит лежит между последней ступенью без 429 и
+   первой с ними;
+3. Retry-After — каждый токен опустошает бакет до первого 429 и опрашивает endpoint раз
+   в ``retry_poll_interval`` до первого 200: фактическое время разблокировки сравнивается
+   с объявленным ``Retry-After``.
+
+Между фазами — пауза ``cooldown_seconds``, чтобы бакеты успели наполниться.
+"""
+
+from __future__ import annotations
+
+import statistics
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from .hdr_histogram import LatencyHistogram
+from .http_client import ApiGatewayClient, ApiResponse
+from .load import PERCENTILES
+from .logging_utils import get_logger
+
+logger = get_logger(__name__)
+
+_CallResult = Tuple[int, float, Optional[float], float]
+
+
+def parse_retry_after(value: Optional[str], now: Optional[float] = None) -> Optional[float]:
+    """Retry-After в секундах: delta-seconds или HTTP-date (RFC 9110); None — нет/не разобран."""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        moment = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    reference = datetime.now(timezone.utc).timestamp() if now is None else now
+    return max(moment.timestamp() - reference, 0.0)
+
+
+@dataclass(frozen=True)
+class RateLimitBenchConfig:
+    tokens: int = 4
+    # Частоты ступеней, запросов в секунду на токен
+    rates: Sequence[float] = (2.0, 5.0, 10.0, 20.0, 40.0)
+    step_seconds: float = 6.0
+    # Доля ступени в конце, по которой считается установившийся режим
+    tail_share: float = 0.5
+    burst_requests: int = 60
+    cooldown_seconds: float = 5.0
+    retry_poll_interval: float = 0.05
+    # Предел ожидания разблокировки после 429 в фазе Retry-After
+    retry_timeout: float = 30.0
+    # Доля 429 в установившемся режиме, при которой ступень считается лимитированной
+    limited_share: float = 0.05
+    max_in_flight: int = 64
+
+
+@dataclass
+class Probe:
+    token: int
+    # Запланированный момент отправки от начала фазы, секунды
+    offset: float
+    status: int
+    latency: float
+    # Момент получения ответа от начала фазы, секунды
+    finished: float
+    retry_after: Optional[float] = None
+
+
+@dataclass
+class RateStep:
+    rate: float
+    duration: float
+    tail_share: float
+    probes: List[Probe] = field(default_factory=list)
+
+    def tail(self) -> List[Probe]:
+        start = self.duration * (1 - self.tail_share)
+        return [p for p in self.probes if p.offset >= start]
+
+    @property
+    def tail_seconds(self) -> float:
+        return self.duration * self.tail_share
+
+    def accepted_rate(self) -> Optional[float]:
+        """Принятых запросов в секунду на токен в установившемся режиме."""
+        tokens = {p.token for p in self.probes}
+        if not tokens or self.tail_seconds <= 0:
+            return None
+        ok = sum(1 for p in self.tail() if p.status == 200)
+        return ok / len(tokens) / self.tail_seconds
+
+    def limited_ratio(self) -> float:
+        tail = self.tail()
+        return sum(1 for p in tail if p.status == 429) / len(tail) if tail else 0.0
+
+    @property
+    def errors(self) -> int:
+        return sum(1 for p in self.probes if p.status not in (200, 429))
+
+    def latency(self) -> LatencyHistogram:
+        histogram = LatencyHistogram()
+        for probe in self.probes:
+            if probe.status:
+                histogram.record(probe.latency)
+        return histogram
+
+
+@dataclass
+class RetryCheck:
+    token: int
+    # Объявленное ожидание (None — 429 без Retry-After) и фактическое до первого 200
+    advertised: Optional[float]
+    actual: Optional[float]
+    polls: int
+    # False — токен так и не получил 429 за burst_requests * 4 вызовов
+    limited: bool = True
+
+    @property
+    def error(self) -> Optional[float]:
+        """Объявлено минус фактически: > 0 — клиента просят ждать дольше нужного."""
+        if self.advertised is None or self.actual is None:
+            return None
+        return self.advertised - self.actual
+
+
+@dataclass
+class RateLimitReport:
+    config: RateLimitBenchConfig
+    burst: List[Probe] = field(default_factory=list)
+    # Длительность всплеска по токенам: от первого ответа до последнего принятого (200)
+    burst_seconds: Dict[int, float] = field(default_factory=dict)
+    steps: List[RateStep] = field(default_factory=list)
+    retry_checks: List[RetryCheck] = field(default_factory=list)
+
+    def limited_steps(self) -> List[RateStep]:
+        return [s for s in self.steps if s.limited_ratio() > self.config.limited_share]
+
+    def refill_rate(self) -> Optional[float]:
+        """Скорость пополнения: медиана принятой частоты на насыщенных ступенях."""
+        rates = [r for r in (s.accepted_rate() for s in self.limited_steps()) if r is not None]
+        return statistics.median(rates) if rates else None
+
+    def limit_bounds(self) -> Tuple[Optional[float], Optional[float]]:
+        """(наибольшая частота без лимитирования, наименьшая с лимитированием) на токен."""
+        limited = {s.rate for s in self.limited_steps()}
+        clean = [s.rate for s in self.steps if s.rate not in limited]
+        below = [r for r in clean if not limited or r < min(limited)]
+        return (max(below) if below else None, min(limited) if limited else None)
+
+    def burst_size(self) -> Optional[float]:
+        """Ёмкость бакета: принятые во всплеске минус пополнение за время всплеска (медиана)."""
+        if not self.burst:
+            return None
+        refill = self.refill_rate() or 0.0
+        sizes = [
+            sum(1 for p in self.burst if p.token == token and p.status == 200) - refill * seconds
+            for token, seconds in self.burst_seconds.items()
+        ]
+        return max(statistics.median(sizes), 0.0) if sizes else None
+
+    @property
+    def errors(self) -> int:
+        probes = self.burst + [p for s in self.steps for p in s.probes]
+        return sum(1 for p in probes if p.status not in (200, 429))
+
+    @property
+    def missing_retry_after(self) -> int:
+        """Ответы 429 без разбираемого Retry-After."""
+        probes = self.burst + [p for s in self.steps for p in s.probes]
+        rejected = [p for p in probes if p.status == 429 and p.retry_after is None]
+        return len(rejected) + sum(
+            1 for c in self.retry_checks if c.limited and c.advertised is None
+        )
+
+    def mismatches(
+        self, expected_rps: float, expected_burst: int, tolerance: float = 0.2
+    ) -> List[str]:
+        """Расхождения с настроенной квотой (0 — параметр не проверяется)."""
+        problems: List[str] = []
+        refill = self.refill_rate()
+        if expected_rps > 0:
+            if refill is None:
+                problems.append(
+                    f"limit not reached: no step up to {max(self.config.rates)} rps/token "
+                    f"was limited (expected {expected_rps} rps)"
+                )
+            elif abs(refill - expected_rps) > expected_rps * tolerance:
+                problems.append(f"refill rate {refill:.2f} rps != expected {expected_rps} rps")
+        burst = self.burst_size()
+        if expected_burst > 0 and burst is not None:
+            if abs(burst - expected_burst) > max(expected_burst * tolerance, 1.0):
+                problems.append(f"burst size {burst:.1f} != expected {expected_burst}")
+        return problems
+
+    def to_dict(self) -> Dict[str, Any]:
+        lower, upper = self.limit_bounds()
+        refill = self.refill_rate()
+        burst = self.burst_size()
+        retry_errors = [c.error for c in self.retry_checks if c.error is not None]
+        return {
+            "tokens": self.config.tokens,
+            "refill_rps_per_token": None if refill is None else round(refill, 2),
+            "burst_size": None if burst is None else round(burst, 1),
+            "limit_between_rps": [lower, upper],
+            "errors": self.errors,
+            "missing_retry_after": self.missing_retry_after,
+            "steps": [
+                {
+                    "rate": s.rate,
+                    "requests": len(s.probes),
+                    "accepted_rps_per_token": _round(s.accepted_rate()),
+                    "limited_ratio": round(s.limited_ratio(), 3),
+                    "errors": s.errors,
+                    "latency_ms": s.latency().summary(PERCENTILES),
+                }
+                for s in self.steps
+            ],
+            "retry_after": [
+                {
+                    "token": c.token,
+                    "advertised_s": _round(c.advertised),
+                    "actual_s": _round(c.actual),
+                    "polls": c.polls,
+                }
+                for c in self.retry_checks
+            ],
+            "retry_after_error_max_s": _round(max(retry_errors)) if retry_errors else None,
+            "retry_after_error_min_s": _round(min(retry_errors)) if retry_errors else None,
+        }
+
+    def format_table(self) -> str:
+        rows = [["rps/token", "requests", "accepted rps", "429 tail", "errors", "p95"]]
+        for step in self.steps:
+            accepted = step.accepted_rate()
+            rows.append(
+                [
+                    f"{step.rate:g}",
+                    str(len(step.probes)),
+                    "-" if accepted is None else f"{accepted:.2f}",
+                    f"{step.limited_ratio():.1%}",
+                    str(step.errors),
+                    f"{step.latency().summary(PERCENTILES)['p95_ms']:.1f}ms",
+                ]
+            )
+        widths = [max(len(row[i]) for row in rows) for i in range(len(rows[0]))]
+        table = "\n".join("  ".join(c.rjust(w) for c, w in zip(row, widths)) for row in rows)
+        d = self.to_dict()
+        lower, upper = d["limit_between_rps"]
+        return (
+            f"{table}\n"
+            f"refill: {d['refill_rps_per_token']} rps/token, burst: {d['burst_size']}, "
+            f"limit between {lower} and {upper} rps/token\n"
+            f"Retry-After: advertised - actual in [{d['retry_after_error_min_s']}, "
+            f"{d['retry_after_error_max_s']}]s, missing on {d['missing_retry_after']} 429s"
+        )
+
+
+def _round(value: Optional[float]) -> Optional[float]:
+    return None if value is None else round(value, 3)
+
+
+class RateLimitBenchmark:
+    def __init__(
+        self,
+        client: ApiGatewayClient,
+        tokens: Sequence[str],
+        config: RateLimitBenchConfig,
+    ) -> None:
+        if not tokens:
+            raise ValueError("RateLimitBenchmark requires at least one access token")
+        self.client = client
+        self.tokens = list(tokens)
+        self.config = config
+
+    def _call(self, token: int) -> _CallResult:
+        """(HTTP-статус или 0 при исключении, секунды, Retry-After, perf_counter ответа)."""
+        started = time.perf_counter()
+        try:
+            resp: ApiResponse = self.client.rate_limited_endpoint(self.tokens[token])
+        except Exception as exc:
+            logger.debug("Rate limited call failed", extra={"error": repr(exc)})
+            finished = time.perf_counter()
+            return 0, finished - started, None, finished
+        finished = time.perf_counter()
+        retry_after = (
+            parse_retry_after(resp.headers.get("Retry-After")) if resp.status_code == 429 else None
+        )
+        return resp.status_code, finished - started, retry_after, finished
+
+    def _drive(self, pool: ThreadPoolExecutor, arrivals: List[Tuple[float, int]]) -> List[Probe]:
+        """Отправляет вызовы по расписанию (offset, token) — open-loop, без ожидания ответов."""
+        futures: List[Tuple[float, int, "Future[_CallResult]"]] = []
+        origin = time.perf_counter()
+        for offset, token in sorted(arrivals):
+            delay = origin + offset - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            futures.append((offset, token, pool.submit(self._call, token)))
+        probes = []
+        for offset, token, future in futures:
+            status, latency, retry_after, finished = future.result()
+            probes.append(Probe(token, offset, status, latency, finished - origin, retry_after))
+        return probes
+
+    def _cooldown(self) -> None:
+        if self.config.cooldown_seconds > 0:
+            time.sleep(self.config.cooldown_seconds)
+
+    def _run_burst(self, pool: ThreadPoolExecutor, report: RateLimitReport) -> None:
+        arrivals = [(0.0, token) for token in range(len(self.tokens))]
+        report.burst = self._drive(pool, arrivals * self.config.burst_requests)
+        # Пополнение за всплеск — от первого ответа токена до последнего принятого: разность
+        # моментов ответов не включает сетевую задержку
+        for token in range(len(self.tokens)):
+            probes = [p for p in report.burst if p.token == token]
+            accepted = [p.finished for p in probes if p.status == 200]
+            first = min((p.finished for p in probes), default=0.0)
+            report.burst_seconds[token] = max(accepted, default=first) - first
+        logger.info(
+            "Rate limit burst finished",
+            extra={"accepted": sum(1 for p in report.burst if p.status == 200)},
+        )
+
+    def _run_step(self, pool: ThreadPoolExecutor, rate: float) -> RateStep:
+        cfg = self.config
+        tokens = len(self.tokens)
+        count = int(rate * cfg.step_seconds)
+        # Отправки токенов сдвинуты на долю периода — поток на gateway равномерный
+        arrivals = [
+            (k / rate + t / (rate * tokens), t) for k in range(count) for t in range(tokens)
+        ]
+        step = RateStep(rate, cfg.step_seconds, cfg.tail_share, self._drive(pool, arrivals))
+        logger.info(
+            "Rate limit step finished",
+            extra={
+                "rate": rate,
+                "accepted_rate": _round(step.accepted_rate()),
+                "limited_ratio": round(step.limited_ratio(), 3),
+            },
+        )
+        return step
+
+    def _check_retry_after(self, token: int) -> RetryCheck:
+        cfg = self.config
+        advertised: Optional[float] = None
+        for _ in range(cfg.burst_requests * 4):
+            status, _, retry_after, _ = self._call(token)
+            if status == 429:
+                advertised = retry_after
+                break
+        else:
+            return RetryCheck(token, None, None, 0, limited=False)
+        rejected_at = time.perf_counter()
+        deadline = rejected_at + cfg.retry_timeout
+        polls = 0
+        while time.perf_counter() < deadline:
+            time.sleep(cfg.retry_poll_interval)
+            sent = time.perf_counter()
+            status, _, _, _ = self._call(token)
+            polls += 1
+            if status == 200:
+                return RetryCheck(token, advertised, sent - rejected_at, polls)
+        return RetryCheck(token, advertised, None, polls)
+
+    def run(self) -> RateLimitReport:
+        cfg = self.config
+        report = RateLimitReport(config=cfg)
+        logger.info(
+            "Rate limit characterization started",
+            extra={"tokens": len(self.tokens), "rates": list(cfg.rates)},
+        )
+        with ThreadPoolExecutor(
+            max_workers=cfg.max_in_flight, thread_name_prefix="rate-limit"
+        ) as pool:
+            self._cooldown()
+            self._run_burst(pool, report)
+            for rate in sorted(cfg.rates):
+                self._cooldown()
+                report.steps.append(self._run_step(pool, rate))
+            self._cooldown()
+            report.retry_checks = list(pool.map(self._check_retry_after, range(len(self.tokens))))
+        logger.info("Rate limit characterization finished", extra=report.to_dict())
+        return report
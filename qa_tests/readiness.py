@@ -0,0 +1,167 @@
+"""Параллельная проверка готовности сервисов перед прогоном.
+
+Список сервисов выводится из фикстур собранных тестов: ``<service>_client`` и
+``async_<service>_client`` соответствуют полю ``Settings.<service>`` (ServiceConfig).
+Все сервисы опрашиваются одновременно (asyncio + httpx): сначала ``GET /health``,
+затем ``GET /ready`` (404/405 — у сервиса нет readiness-эндпоинта, достаточно health).
+Пауза между попытками растёт экспоненциально, пока сервис не отвечает, и
+сбрасывается к минимальной, как только сервис «ожил» (health 200, ready ещё нет).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import Iterable, List, Optional, Sequence
+
+import httpx
+
+from .config import ServiceConfig, Settings
+from .logging_utils import get_logger
+
+logger = get_logger(__name__)
+
+# Сервис по умолчанию, если тесты не используют клиентских фикстур
+DEFAULT_SERVICE = "api_gateway"
+
+_DISPLAY_NAMES = {"api_gateway": "API Gateway"}
+_HINTS = {"api_gateway": "api-gateway и user-service"}
+# Ответы /ready, означающие «эндпоинта нет» (готовность определяется по /health)
+_NO_READY_ENDPOINT = {404, 405, 501}
+
+
+@dataclass(frozen=True)
+class ServiceTarget:
+    key: str  # имя поля Settings: session_manager_service, api_gateway, ...
+    base_url: str
+
+    @property
+    def display_name(self) -> str:
+        return _DISPLAY_NAMES.get(self.key) or self.key.replace("_", " ").title()
+
+    @property
+    def hint(self) -> str:
+        service = _HINTS.get(self.key) or self.key.replace("_", "-")
+        return f"Запустите {service} вручную или выполните: make test-with-docker"
+
+
+@dataclass
+class ProbeResult:
+    target: ServiceTarget
+    ready: bool
+    attempts: int
+    elapsed_seconds: float
+    health_status: Optional[int] = None
+    ready_status: Optional[int] = None
+    last_error: str = ""
+
+    def describe(self) -> str:
+        state = "ready" if self.ready else "NOT READY"
+        details = f"health={self.health_status or '-'} ready={self.ready_status or '-'}"
+        if not self.ready and self.last_error:
+            details += f" error={self.last_error}"
+        return (
+            f"{self.target.display_name:<28} {state:<9} {self.elapsed_seconds:6.2f}s "
+            f"attempts={self.attempts} {details}"
+        )
+
+
+def _service_key(fixture_name: str, service_keys: Iterable[str]) -> Optional[str]:
+    name = fixture_name.removeprefix("async_")
+    if not name.endswith("_client"):
+        return None
+    key = name.removesuffix("_client")
+    return key if key in service_keys else None
+
+
+def services_for_items(items: Sequence[object], settings: Settings) -> List[ServiceTarget]:
+    """Сервисы, клиентские фикстуры которых используют собранные тесты (без повторов)."""
+    service_keys = {
+        name for name, value in vars(settings).items() if isinstance(value, ServiceConfig)
+    }
+    keys: List[str] = []
+    for item in items:
+        for fixture_name in getattr(item, "fixturenames", ()):
+            key = _service_key(fixture_name, service_keys)
+            if key is not None and key not in keys:
+                keys.append(key)
+    if not keys and items:
+        keys.append(DEFAULT_SERVICE)
+    return [
+        ServiceTarget(key=key, base_url=getattr(settings, key).base_url.rstrip("/")) for key in keys
+    ]
+
+
+async def probe_service(
+    client: httpx.AsyncClient,
+    target: ServiceTarget,
+    timeout: float,
+    *,
+    min_delay: float = 0.05,
+    max_delay: float = 2.0,
+) -> ProbeResult:
+    """Опрашивает /health и /ready сервиса до готовности или истечения timeout."""
+    started = time.monotonic()
+    deadline = started + timeout
+    result = ProbeResult(target=target, ready=False, attempts=0, elapsed_seconds=0.0)
+    delay = min_delay
+    while True:
+        result.attempts += 1
+        alive = False
+        try:
+            health = await client.get(f"{target.base_url}/health")
+            result.health_status = health.status_code
+            if health.status_code == 200:
+                alive = True
+                ready = await client.get(f"{target.base_url}/ready")
+                result.ready_status = ready.status_code
+                if ready.status_code == 200 or ready.status_code in _NO_READY_ENDPOINT:
+                    result.ready = True
+        except httpx.HTTPError as exc:
+            result.last_error = repr(exc)
+
+        now = time.monotonic()
+        result.elapsed_seconds = now - started
+        if result.ready or now >= deadline:
+            return result
+        # Сервис отвечает, но ещё прогревается — готовность близко, опрашиваем часто;
+        # сервис молчит — увеличиваем паузу, чтобы не тратить время на пустые попытки
+        delay = min_delay if alive else min(delay * 2, max_delay)
+        await asyncio.sleep(min(delay, max(deadline - now, 0.0)))
+
+
+async def wait_until_ready_async(
+    targets: Sequence[ServiceTarget], timeout: float = 30.0
+) -> List[ProbeResult]:
+    """Опрашивает все сервисы одновременно; результат в порядке targets."""
+    async with httpx.AsyncClient(timeout=httpx.Timeout(3.0)) as client:
+        return list(
+            await asyncio.gather(*(probe_service(client, target, timeout) for target in targets))
+        )
+
+
+def wait_until_ready(targets: Sequence[ServiceTarget], timeout: float = 30.0) -> List[ProbeResult]:
+    """Синхронная обёртка для фикстур и хуков pytest."""
+    if not targets:
+        return []
+    results = asyncio.run(wait_until_ready_async(targets, timeout))
+    logger.info(
+        "Service readiness probed",
+        extra={
+            "services": {
+                r.target.key: {
+                    "ready": r.ready,
+                    "time_to_ready_seconds": round(r.elapsed_seconds, 3),
+                    "attempts": r.attempts,
+                }
+                for r in results
+            }
+        },
+    )
+    return results
+
+
+def format_readiness_report(results: Sequence[ProbeResult]) -> str:
+    """Строка на сервис: состояние, время до готовности, число попыток, коды ответов."""
+    return "\n".join(r.describe() for r in results)
@@ -1,8 +1,13 @@
 from __future__ import annotations
 
+import asyncio
+import functools
+import inspect
+import random
+import threading
 import time
-from dataclasses import dataclass
-from typing import Callable, Iterable, Tuple, Type, TypeVar
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple, Type, TypeVar
 
 from .logging_utils import get_logger
 
@@ -11,45 +16,182 @@ T = TypeVar("T")
 logger = get_logger(__name__)
 
 
+class RetryBudget:
+    """Общий на процесс бюджет повторов (token bucket).
+
+    Каждый вызов (первая попытка) пополняет бюджет на ``ratio`` токена, каждый повтор
+    тратит один; независимо от трафика бюджет пополняется на ``min_per_second`` токенов
+    в секунду, но не выше ``capacity``. При настоящем отказе сервиса повторы быстро
+    исчерпывают бюджет и далее ошибки пробрасываются сразу: нагрузка на сервис растёт
+    не более чем на ``ratio`` от обычной, а прогон не растягивается на минуты ожиданий.
+    """
+
+    def __init__(
+        self, ratio: float = 0.2, min_per_second: float = 1.0, capacity: float = 10.0
+    ) -> None:
+        self.ratio = ratio
+        self.min_per_second = min_per_second
+        self.capacity = capacity
+        self._balance = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.retries = 0
+        self.rejected = 0
+
+    def _refill(self, now: float) -> None:
+        elapsed = now - self._updated
+        self._updated = now
+        self._balance = min(self.capacity, self._balance + elapsed * self.min_per_second)
+
+    def record_call(self) -> None:
+        with self._lock:
+            self.calls += 1
+            self._balance = min(self.capacity, self._balance + self.ratio)
+
+    def try_acquire(self) -> bool:
+        """Берёт токен на один повтор; False — бюджет исчерпан, повторять нельзя."""
+        with self._lock:
+            self._refill(time.monotonic())
+            if self._balance >= 1.0:
+                self._balance -= 1.0
+                self.retries += 1
+                return True
+            self.rejected += 1
+            return False
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "calls": self.calls,
+                "retries": self.retries,
+                "rejected": self.rejected,
+                "balance": round(self._balance, 2),
+            }
+
+
+_default_budget: Optional[RetryBudget] = None
+_default_budget_lock = threading.Lock()
+
+
+def default_retry_budget() -> RetryBudget:
+    """Бюджет, общий для всех клиентов процесса (RETRY_BUDGET_* из настроек)."""
+    global _default_budget
+    with _default_budget_lock:
+        if _default_budget is None:
+            from .config import get_settings
+
+            settings = get_settings()
+            _default_budget = RetryBudget(
+                ratio=settings.retry_budget_ratio,
+                min_per_second=settings.retry_budget_min_per_second,
+            )
+        return _default_budget
+
+
 @dataclass(frozen=True)
 class RetryConfig:
     attempts: int = 3
     delay_seconds: float = 1.0
     backoff_factor: float = 2.0
+    # Потолок паузы между попытками
+    max_delay_seconds: float = 10.0
+    # Full jitter: пауза равномерно в [0, delay * factor^n] — клиенты не повторяют синхронно
+    jitter: bool = True
+    # Общий срок вызова со всеми повторами; None — RETRY_DEADLINE_SECONDS из настроек
+    deadline_seconds: Optional[float] = None
+    # None — общий бюджет процесса (default_retry_budget)
+    budget: Optional[RetryBudget] = field(default=None, compare=False)
+
+
+class _RetryCall:
+    """Состояние одного вызова: номер попытки, дедлайн, бюджет."""
+
+    def __init__(self, cfg: RetryConfig, name: str) -> None:
+        self.cfg = cfg
+        self.name = name
+        self.attempt = 1
+        deadline = cfg.deadline_seconds
+        if deadline is None:
+            from .config import get_settings
+
+            deadline = get_settings().retry_deadline_seconds
+        self.deadline = time.monotonic() + deadline if deadline and deadline > 0 else None
+        self.budget = cfg.budget or default_retry_budget()
+        self.budget.record_call()
+
+    def next_delay(self, exc: BaseException) -> Optional[float]:
+        """Пауза перед следующей попыткой или None, если повторять нельзя."""
+        cfg = self.cfg
+        extra = {"function": self.name, "attempt": self.attempt, "attempts": cfg.attempts}
+        logger.warning(
+            "Retryable error in %s: %s (attempt %s/%s)",
+            self.name,
+            exc,
+            self.attempt,
+            cfg.attempts,
+            extra=extra,
+        )
+        if self.attempt >= cfg.attempts:
+            return None
+        ceiling = min(
+            cfg.max_delay_seconds, cfg.delay_seconds * cfg.backoff_factor ** (self.attempt - 1)
+        )
+        delay = random.uniform(0.0, ceiling) if cfg.jitter else ceiling
+        if self.deadline is not None and time.monotonic() + delay >= self.deadline:
+            logger.warning("Retry deadline exceeded", extra=extra)
+            return None
+        if not self.budget.try_acquire():
+            logger.warning("Retry budget exhausted", extra={**extra, **self.budget.stats()})
+            return None
+        self.attempt += 1
+        return delay
 
 
 def retry_on_exceptions(
     exceptions: Iterable[Type[BaseException]],
     config: RetryConfig | None = None,
 ) -> Callable[[Callable[..., T]], Callable[..., T]]:
-    """Декоратор для повторного выполнения функций при временных ошибках."""
+    """Декоратор для повторного выполнения функций при временных ошибках.
+
+    Поддерживает и обычные, и async-функции: для корутин паузы между попытками
+    выполняются через asyncio.sleep и не блокируют event loop. Пауза — экспоненциальная
+    с full jitter; повторы ограничены числом попыток, дедлайном вызова и общим
+    RetryBudget. Когда повторять нельзя, пробрасывается последнее исключение.
+    """
     cfg = config or RetryConfig()
     exceptions_tuple: Tuple[Type[BaseException], ...] = tuple(exceptions)
 
     def decorator(func: Callable[..., T]) -> Callable[..., T]:
-        def wrapper(*args: object, **kwargs: object) -> T:
-            delay = cfg.delay_seconds
-            last_exc: BaseException | None = None
+        name = func.__qualname__
+
+        if inspect.iscoroutinefunction(func):
 
-            for attempt in range(1, cfg.attempts + 1):
+            @functools.wraps(func)
+            async def async_wrapper(*args: object, **kwargs: object) -> object:
+                call = _RetryCall(cfg, name)
+                while True:
+                    try:
+                        return await func(*args, **kwargs)
+                    except exceptions_tuple as exc:
+                        delay = call.next_delay(exc)
+                        if delay is None:
+                            raise
+                    await asyncio.sleep(delay)
+
+            return async_wrapper  # type: ignore[return-value]
+
+        @functools.wraps(func)
+        def wrapper(*args: object, **kwargs: object) -> T:
+            call = _RetryCall(cfg, name)
+            while True:
                 try:
                     return func(*args, **kwargs)
                 except exceptions_tuple as exc:
-                    last_exc = exc
-                    logger.warning(
-                        "Retryable error in %s: %s (attempt %s/%s)",
-                        func.__name__,
-                        exc,
-                        attempt,
-                        cfg.attempts,
-                    )
-                    if attempt == cfg.attempts:
-                        break
-                    time.sleep(delay)
-                    delay *= cfg.backoff_factor
-
-            assert last_exc is not None
-            raise last_exc
+                    delay = call.next_delay(exc)
+                    if delay is None:
+                        raise
+                time.sleep(delay)
 
         return wrapper
 
@@ -0,0 +1,342 @@
+"""Матрица задержек поиска search-service: сегмент × размер индекса × класс запроса × limit.
+
+Индекс наращивается до каждого размера из ``index_sizes`` через SeedEngine (только шаги
+индексации, датасет ``SEARCH_BENCH_DATASET``; повторный прогон досоздаёт лишь
+недостающее). Наборы запросов строятся из тех же генераторов, что и индексируемые
+записи, поэтому классы запросов действительно различаются по числу совпадений:
+
+- prefix — первые три буквы слов средней частоты;
+- multi_term — 2–3 слова одной проиндексированной записи;
+- no_hit — случайные токены, которых нет в словарях генератора;
+- high_hit — слова, встречающиеся хотя бы в 5% записей (статусы, регионы, частые слова).
+
+На ячейку — перцентили задержки и число результатов (длина списка в ответе и ``total``).
+Если часть записей не проиндексировалась, ячейка хранит фактический размер индекса
+(``indexed``), а отчёт помечает её как неполную.
+Рост p95 между наименьшим и наибольшим индексом (``growth``) показывает, когда
+search-service пора перешардировать.
+"""
+
+from __future__ import annotations
+
+import random
+import re
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from .hdr_histogram import LatencyHistogram
+from .http_client import SEARCH_SEGMENTS, SearchServiceClient
+from .load import PERCENTILES
+from .logging_utils import get_logger
+from .seeding import (
+    SEED_BLOCK_SIZE,
+    SeedEngine,
+    SeedManifest,
+    SeedResult,
+    build_operator_block,
+    build_session_block,
+    build_ticket_block,
+)
+
+logger = get_logger(__name__)
+
+SEARCH_BENCH_DATASET = "search-bench"
+QUERY_CLASSES = ("prefix", "multi_term", "no_hit", "high_hit")
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+# Шаг индексации SeedEngine -> сегмент поиска
+_INDEX_KINDS = {
+    "operator_index": "operators",
+    "session_index": "sessions",
+    "ticket_index": "tickets",
+}
+
+
+def _sample_block(dataset: str, segment: str) -> List[Dict[str, Any]]:
+    builders: Dict[str, Callable[[], List[Dict[str, Any]]]] = {
+        "tickets": lambda: build_ticket_block(
+            dataset, 0, SEED_BLOCK_SIZE, SEED_BLOCK_SIZE, SEED_BLOCK_SIZE
+        ),
+        "sessions": lambda: build_session_block(dataset, 0, SEED_BLOCK_SIZE),
+        "operators": lambda: build_operator_block(dataset, 0, SEED_BLOCK_SIZE),
+    }
+    return builders[segment]()
+
+
+def _tokens(payload: Dict[str, Any]) -> List[str]:
+    """Слова текстовых полей записи (поля *_id — UUID — не участвуют)."""
+    return [
+        token
+        for key, value in payload.items()
+        if isinstance(value, str) and not key.endswith("_id")
+        for token in _TOKEN_RE.findall(value.lower())
+    ]
+
+
+def generate_queries(
+    dataset: str, segment: str, count: int, indexed: int = SEED_BLOCK_SIZE, seed: int = 0
+) -> Dict[str, List[str]]:
+    """Наборы запросов каждого класса по count штук.
+
+    Слова берутся из первых indexed записей сегмента (не больше одного блока генерации) —
+    multi_term гарантированно совпадает хотя бы с одной проиндексированной записью.
+    """
+    sample = _sample_block(dataset, segment)[: max(min(indexed, SEED_BLOCK_SIZE), 1)]
+    rng = random.Random(f"{dataset}:{segment}:queries:{seed}")
+    ranked = Counter(t for p in sample for t in set(_tokens(p))).most_common()
+    # Частые — встречаются хотя бы в 5% записей выборки
+    high = [t for t, n in ranked if n >= len(sample) * 0.05] or [ranked[0][0]]
+    quarter = len(ranked) // 4
+    middle = [t for t, _ in ranked[quarter:] if len(t) >= 4] or [t for t, _ in ranked]
+
+    multi: List[str] = []
+    for payload in rng.choices(sample, k=count):
+        words = list(dict.fromkeys(_tokens(payload)))
+        multi.append(" ".join(rng.sample(words, min(len(words), rng.randint(2, 3)))))
+    return {
+        "prefix": [t[:3] for t in rng.choices(middle, k=count)],
+        "multi_term": multi,
+        "no_hit": [f"zqx{rng.getrandbits(40):010x}" for _ in range(count)],
+        "high_hit": rng.choices(high, k=count),
+    }
+
+
+def result_counts(body: Any, segment: str) -> Tuple[Optional[int], Optional[int]]:
+    """(записей в ответе, total) — список ищется в полях segment/results/hits/items."""
+    if not isinstance(body, dict):
+        return None, None
+    hits: Optional[int] = None
+    for key in (segment, "results", "hits", "items"):
+        if isinstance(body.get(key), list):
+            hits = len(body[key])
+            break
+    total = body.get("total")
+    return hits, int(total) if isinstance(total, int) else None
+
+
+@dataclass(frozen=True)
+class SearchBenchConfig:
+    index_sizes: Sequence[int] = (1000, 10000)
+    limits: Sequence[int] = (10, 100)
+    segments: Sequence[str] = SEARCH_SEGMENTS
+    query_classes: Sequence[str] = QUERY_CLASSES
+    # Запросов каждого класса на ячейку
+    queries: int = 20
+    concurrency: int = 4
+    # Пауза после индексации: индекс может обновляться асинхронно
+    settle_seconds: float = 1.0
+    dataset: str = SEARCH_BENCH_DATASET
+
+
+@dataclass
+class SearchCell:
+    segment: str
+    index_size: int
+    query_class: str
+    limit: int
+    latency: LatencyHistogram = field(default_factory=LatencyHistogram)
+    # Сколько записей сегмента реально в индексе (меньше index_size, если индексация не удалась)
+    indexed: Optional[int] = None
+    requests: int = 0
+    errors: int = 0
+    hits: List[int] = field(default_factory=list)
+    totals: List[int] = field(default_factory=list)
+
+    @property
+    def key(self) -> Tuple[str, str, int]:
+        return self.segment, self.query_class, self.limit
+
+    @property
+    def incomplete(self) -> bool:
+        return self.indexed is not None and self.indexed < self.index_size
+
+    def to_dict(self) -> Dict[str, Any]:
+        hits = sorted(self.hits)
+        totals = sorted(self.totals)
+        return {
+            "segment": self.segment,
+            "index_size": self.index_size,
+            "indexed": self.indexed,
+            "query_class": self.query_class,
+            "limit": self.limit,
+            "requests": self.requests,
+            "errors": self.errors,
+            "latency_ms": self.latency.summary(PERCENTILES),
+            "hits_p50": hits[len(hits) // 2] if hits else None,
+            "hits_max": hits[-1] if hits else None,
+            "zero_hit_ratio": (
+                round(sum(1 for h in hits if h == 0) / len(hits), 3) if hits else None
+            ),
+            "total_p50": totals[len(totals) // 2] if totals else None,
+        }
+
+
+@dataclass
+class SearchBenchReport:
+    config: SearchBenchConfig
+    cells: List[SearchCell]
+
+    @property
+    def errors(self) -> int:
+        return sum(c.errors for c in self.cells)
+
+    @property
+    def incomplete(self) -> List[SearchCell]:
+        """Ячейки, измеренные на индексе меньше заявленного размера."""
+        return [c for c in self.cells if c.incomplete]
+
+    def growth(self) -> Dict[Tuple[str, str, int], float]:
+        """Рост p95 от наименьшего к наибольшему индексу по (сегмент, класс, limit).
+
+        Неполные ячейки не участвуют: их размер индекса не тот, что в подписи.
+        """
+        by_key: Dict[Tuple[str, str, int], Dict[int, SearchCell]] = {}
+        for cell in self.cells:
+            if cell.incomplete:
+                continue
+            by_key.setdefault(cell.key, {})[cell.index_size] = cell
+        result: Dict[Tuple[str, str, int], float] = {}
+        for key, sizes in by_key.items():
+            if len(sizes) < 2:
+                continue
+            small = sizes[min(sizes)].latency.value_at_percentile(95)
+            large = sizes[max(sizes)].latency.value_at_percentile(95)
+            if small > 0:
+                result[key] = large / small
+        return result
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "dataset": self.config.dataset,
+            "concurrency": self.config.concurrency,
+            "cells": [c.to_dict() for c in self.cells],
+            "p95_growth": [
+                {"segment": s, "query_class": q, "limit": lim, "ratio": round(ratio, 2)}
+                for (s, q, lim), ratio in sorted(self.growth().items())
+            ],
+        }
+
+    def format_table(self) -> str:
+        rows = [["segment", "index", "class", "limit", "n", "err", "p50", "p95", "p99", "hits"]]
+        for cell in self.cells:
+            d = cell.to_dict()
+            rows.append(
+                [
+                    cell.segment,
+                    (
+                        f"{cell.indexed}/{cell.index_size}"
+                        if cell.incomplete
+                        else str(cell.index_size)
+                    ),
+                    cell.query_class,
+                    str(cell.limit),
+                    str(cell.requests),
+                    str(cell.errors),
+                    f"{d['latency_ms']['p50_ms']:.1f}ms",
+                    f"{d['latency_ms']['p95_ms']:.1f}ms",
+                    f"{d['latency_ms']['p99_ms']:.1f}ms",
+                    "-" if d["hits_p50"] is None else str(d["hits_p50"]),
+                ]
+            )
+        widths = [max(len(row[i]) for row in rows) for i in range(len(rows[0]))]
+        table = "\n".join("  ".join(c.rjust(w) for c, w in zip(row, widths)) for row in rows)
+        growth = self.growth()
+        if growth:
+            (segment, query_class, limit), worst = max(growth.items(), key=lambda kv: kv[1])
+            table += (
+                f"\nworst p95 growth across index sizes: x{worst:.2f} "
+                f"({segment}, {query_class}, limit={limit})"
+            )
+        return table
+
+
+class SearchBenchmark:
+    def __init__(
+        self,
+        client: SearchServiceClient,
+        manifest: SeedManifest,
+        config: SearchBenchConfig,
+    ) -> None:
+        self.client = client
+        self.config = config
+        self.engine = SeedEngine(
+            config.dataset,
+            manifest,
+            search_client=client,
+            concurrency=max(config.concurrency, 8),
+        )
+
+    def _grow_index(self, size: int) -> Dict[str, int]:
+        """Индекс сегментов бенчмарка — до size записей каждого (только недостающие).
+
+        Возвращает число записей каждого сегмента, реально попавших в индекс.
+        """
+        results: List[SeedResult] = []
+        if "operators" in self.config.segments:
+            results += self.engine.seed_operators(size)
+        if "sessions" in self.config.segments:
+            results += self.engine.seed_sessions(size)
+        if "tickets" in self.config.segments:
+            results += self.engine.seed_tickets(size, operators=size, sessions=size)
+        failed = [r.to_dict() for r in results if r.failed]
+        if failed:
+            logger.warning(
+                "Search benchmark index is incomplete",
+                extra={"index_size": size, "steps": failed},
+            )
+        if self.config.settle_seconds > 0:
+            time.sleep(self.config.settle_seconds)
+        return {
+            _INDEX_KINDS[r.kind]: r.skipped + r.created for r in results if r.kind in _INDEX_KINDS
+        }
+
+    def _query(
+        self, cell: SearchCell, query: str
+    ) -> Tuple[float, int, Optional[int], Optional[int]]:
+        """(секунды, HTTP-статус или 0 при исключении, записей в ответе, total)."""
+        started = time.perf_counter()
+        try:
+            resp = self.client.search(query, type_filter=cell.segment, limit=cell.limit)
+        except Exception as exc:
+            logger.warning("Search request failed", extra={"query": query, "error": repr(exc)})
+            return time.perf_counter() - started, 0, None, None
+        hits, total = result_counts(resp.json, cell.segment)
+        return time.perf_counter() - started, resp.status_code, hits, total
+
+    def _run_cell(self, pool: ThreadPoolExecutor, cell: SearchCell, queries: List[str]) -> None:
+        for seconds, status, hits, total in pool.map(lambda q: self._query(cell, q), queries):
+            cell.requests += 1
+            if status != 200:
+                cell.errors += 1
+                continue
+            cell.latency.record(seconds)
+            if hits is not None:
+                cell.hits.append(hits)
+            if total is not None:
+                cell.totals.append(total)
+
+    def run(self) -> SearchBenchReport:
+        cfg = self.config
+        queries = {
+            segment: generate_queries(cfg.dataset, segment, cfg.queries) for segment in cfg.segments
+        }
+        cells: List[SearchCell] = []
+        with ThreadPoolExecutor(max_workers=cfg.concurrency, thread_name_prefix="search") as pool:
+            for size in sorted(cfg.index_sizes):
+                indexed = self._grow_index(size)
+                for segment in cfg.segments:
+                    for query_class in cfg.query_classes:
+                        for limit in cfg.limits:
+                            cell = SearchCell(
+                                segment, size, query_class, limit, indexed=indexed.get(segment)
+                            )
+                            self._run_cell(pool, cell, queries[segment][query_class])
+                            cells.append(cell)
+                logger.info(
+                    "Search benchmark index size finished",
+                    extra={"index_size": size, "cells": len(cells)},
+                )
+        return SearchBenchReport(config=cfg, cells=cells)
@@ -0,0 +1,662 @@
+"""Массовое наполнение ticket-service, operator-directory и search-service данными.
+
+Поведение list- и search-эндпоинтов проявляется только на реалистичных объёмах (сотни
+тысяч записей). Генератор строит payload'ы блоками по SEED_BLOCK_SIZE записей: словари
+имён и слов готовятся один раз (Faker с фиксированным seed), а поля блока выбираются
+одним вызовом ``rng.choices`` на блок. Записи отправляются через методы Client Object
+из пула потоков непрерывным потоком (в полёте не больше 2 × concurrency запросов),
+прогресс пишется в лог.
+
+Идемпотентность: идентификаторы записей детерминированы (uuid5 от датасета, вида и
+номера записи), содержимое блока — от seed блока, а успешно созданные записи
+отмечаются в SQLite-манифесте (``SEED_MANIFEST``) по (сервис, датасет, вид, номер).
+Повторный запуск с тем же датасетом досоздаёт только недостающее, поэтому один
+датасет переиспользуется между прогонами и наращивается:
+
+    python -m qa_tests.seeding --dataset perf --operators 5000 --sessions 50000 \\
+        --tickets 200000 --concurrency 32
+    python -m qa_tests.seeding --dataset perf --status
+
+Тикеты ссылаются на операторов и сессии датасета по номерам из диапазона, который
+фиксируется в манифесте при первом наполнении тикетов (из ``--operators/--sessions`` или
+числа уже созданных записей): тикет с данным номером одинаков в любом запуске.
+
+Оператор, уже существующий в operator-directory (409), считается созданным. У тикетов
+естественного ключа нет: без манифеста повторный запуск создаст дубликаты, поэтому
+созданные записи отмечаются по мере ответов, пачками по MANIFEST_BATCH, а тикеты
+создаются без повторов HTTP-клиента — таймаут считается ошибкой записи.
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import sqlite3
+import sys
+import time
+import uuid
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from contextlib import closing
+from dataclasses import dataclass
+from functools import lru_cache
+from itertools import islice
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Set, Tuple
+
+from faker import Faker
+
+from .config import get_settings
+from .http_client import OperatorDirectoryServiceClient, SearchServiceClient, TicketServiceClient
+from .logging_utils import get_logger
+
+logger = get_logger(__name__)
+
+# Записей в блоке генерации; seed блока зависит только от его номера
+SEED_BLOCK_SIZE = 1000
+# Созданные записи пишутся в манифест пачками: при kill -9 теряется не больше пачки
+MANIFEST_BATCH = 100
+# Пространство имён uuid5 для идентификаторов сгенерированных записей
+SEED_NAMESPACE = uuid.UUID("5d0c8a4e-6f0b-4c55-9a61-3e4f3c2b7a10")
+REGIONS = ("ru-msk", "ru-spb", "ru-ekb", "ru-nsk", "ru-kzn")
+SESSION_STATUSES = ("active", "active", "active", "waiting", "closed")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS seeded (
+    target TEXT NOT NULL,
+    dataset TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    idx INTEGER NOT NULL,
+    remote_id TEXT NOT NULL DEFAULT '',
+    created_at REAL NOT NULL,
+    PRIMARY KEY (target, dataset, kind, idx)
+);
+CREATE TABLE IF NOT EXISTS dimensions (
+    dataset TEXT PRIMARY KEY,
+    operators INTEGER NOT NULL,
+    sessions INTEGER NOT NULL
+);
+"""
+
+Payload = Dict[str, Any]
+
+
+def seed_id(dataset: str, kind: str, index: int) -> str:
+    """Детерминированный UUID записи: один и тот же при каждом запуске."""
+    return str(uuid.uuid5(SEED_NAMESPACE, f"{dataset}:{kind}:{index}"))
+
+
+def synthetic_ticket_id(dataset: str, index: int) -> int:
+    """Детерминированный числовой id тикета, который индексируется без ticket-service."""
+    return uuid.UUID(seed_id(dataset, "ticket", index)).int >> 80
+
+
+@dataclass(frozen=True)
+class _Vocabulary:
+    first_names: Tuple[str, ...]
+    last_names: Tuple[str, ...]
+    words: Tuple[str, ...]
+
+
+@lru_cache(maxsize=1)
+def _vocabulary() -> _Vocabulary:
+    """Словари для payload'ов: Faker вызывается один раз, а не на каждую запись.
+
+    Порядок словарей фиксирован (без set), иначе выбор по seed блока зависел бы от
+    PYTHONHASHSEED процесса.
+    """
+    fake = Faker()
+    fake.seed_instance(20240101)
+    return _Vocabulary(
+        first_names=tuple(dict.fromkeys(fake.first_name() for _ in range(2000))),
+        last_names=tuple(dict.fromkeys(fake.last_name() for _ in range(2000))),
+        words=tuple(dict.fromkeys(fake.word() for _ in range(5000))),
+    )
+
+
+def _block_rng(dataset: str, kind: str, block: int) -> random.Random:
+    return random.Random(f"{dataset}:{kind}:block:{block}")
+
+
+def build_operator_block(dataset: str, block: int, count: int) -> List[Payload]:
+    """Операторы блока: {user_id, role, display_name, region}."""
+    vocab = _vocabulary()
+    rng = _block_rng(dataset, "operator", block)
+    first = rng.choices(vocab.first_names, k=count)
+    last = rng.choices(vocab.last_names, k=count)
+    regions = rng.choices(REGIONS, k=count)
+    start = block * SEED_BLOCK_SIZE
+    return [
+        {
+            "user_id": seed_id(dataset, "operator", start + i),
+            "role": "operator",
+            "display_name": f"{first[i]} {last[i]}",
+            "region": regions[i],
+        }
+        for i in range(count)
+    ]
+
+
+def build_session_block(dataset: str, block: int, count: int) -> List[Payload]:
+    """Сессии блока для поискового индекса: {session_id, client_id, pin, status}."""
+    rng = _block_rng(dataset, "session", block)
+    pins = [rng.randrange(10_000) for _ in range(count)]
+    statuses = rng.choices(SESSION_STATUSES, k=count)
+    start = block * SEED_BLOCK_SIZE
+    return [
+        {
+            "session_id": seed_id(dataset, "session", start + i),
+            "client_id": seed_id(dataset, "client", start + i),
+            "pin": f"{pins[i]:04d}",
+            "status": statuses[i],
+        }
+        for i in range(count)
+    ]
+
+
+def build_ticket_block(
+    dataset: str, block: int, count: int, operators: int, sessions: int
+) -> List[Payload]:
+    """Тикеты блока: ссылаются на операторов и сессии того же датасета (по номерам)."""
+    vocab = _vocabulary()
+    rng = _block_rng(dataset, "ticket", block)
+    subject_lengths = [rng.randint(3, 8) for _ in range(count)]
+    notes_lengths = [rng.randint(10, 40) for _ in range(count)]
+    words = rng.choices(vocab.words, k=sum(subject_lengths) + sum(notes_lengths))
+    operator_idx = [rng.randrange(max(operators, 1)) for _ in range(count)]
+    session_idx = [rng.randrange(max(sessions, 1)) for _ in range(count)]
+
+    word_stream = iter(words)
+    payloads: List[Payload] = []
+    for i in range(count):
+        subject = " ".join(islice(word_stream, subject_lengths[i]))
+        notes = " ".join(islice(word_stream, notes_lengths[i]))
+        payloads.append(
+            {
+                "subject": subject.capitalize(),
+                "notes": notes.capitalize() + ".",
+                "session_id": seed_id(dataset, "session", session_idx[i]),
+                "client_id": seed_id(dataset, "client", session_idx[i]),
+                "operator_id": seed_id(dataset, "operator", operator_idx[i]),
+            }
+        )
+    return payloads
+
+
+class SeedManifest:
+    """SQLite-файл с уже созданными записями; схема создаётся при первом обращении."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+
+    def _connect(self) -> sqlite3.Connection:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(str(self.path), timeout=30)
+        conn.executescript(_SCHEMA)
+        return conn
+
+    def seeded(self, target: str, dataset: str, kind: str) -> Dict[int, str]:
+        """{номер записи: id в сервисе} созданных записей вида."""
+        with closing(self._connect()) as conn:
+            rows = conn.execute(
+                "SELECT idx, remote_id FROM seeded WHERE target = ? AND dataset = ? AND kind = ?",
+                (target, dataset, kind),
+            ).fetchall()
+        return {int(idx): remote_id for idx, remote_id in rows}
+
+    def mark(self, target: str, dataset: str, kind: str, rows: Sequence[Tuple[int, str]]) -> None:
+        if not rows:
+            return
+        now = time.time()
+        with closing(self._connect()) as conn, conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO seeded VALUES (?, ?, ?, ?, ?, ?)",
+                [(target, dataset, kind, idx, remote_id, now) for idx, remote_id in rows],
+            )
+
+    def dimensions(self, dataset: str) -> Optional[Tuple[int, int]]:
+        """(операторов, сессий), на которые ссылаются тикеты датасета; None — не зафиксированы."""
+        with closing(self._connect()) as conn:
+            row = conn.execute(
+                "SELECT operators, sessions FROM dimensions WHERE dataset = ?", (dataset,)
+            ).fetchone()
+        return (int(row[0]), int(row[1])) if row else None
+
+    def fix_dimensions(self, dataset: str, operators: int, sessions: int) -> Tuple[int, int]:
+        """Фиксирует размеры датасета, если их ещё нет; возвращает действующие."""
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                "INSERT OR IGNORE INTO dimensions VALUES (?, ?, ?)", (dataset, operators, sessions)
+            )
+        fixed = self.dimensions(dataset)
+        assert fixed is not None
+        return fixed
+
+    def summary(self, dataset: Optional[str] = None) -> List[Tuple[str, str, str, int]]:
+        """(target, dataset, kind, записей) по всем или одному датасету."""
+        query = "SELECT target, dataset, kind, COUNT(*) FROM seeded"
+        params: Tuple[object, ...] = ()
+        if dataset:
+            query += " WHERE dataset = ?"
+            params = (dataset,)
+        query += " GROUP BY target, dataset, kind ORDER BY dataset, target, kind"
+        with closing(self._connect()) as conn:
+            rows = conn.execute(query, params).fetchall()
+        return [(target, ds, kind, int(count)) for target, ds, kind, count in rows]
+
+
+@dataclass
+class SeedResult:
+    kind: str
+    target: str
+    requested: int
+    # Уже были в манифесте — не отправлялись
+    skipped: int = 0
+    created: int = 0
+    failed: int = 0
+    seconds: float = 0.0
+
+    @property
+    def rate(self) -> float:
+        return self.created / self.seconds if self.seconds > 0 else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "kind": self.kind,
+            "target": self.target,
+            "requested": self.requested,
+            "skipped": self.skipped,
+            "created": self.created,
+            "failed": self.failed,
+            "seconds": round(self.seconds, 2),
+            "per_second": round(self.rate, 1),
+        }
+
+
+def format_results(results: Sequence[SeedResult]) -> str:
+    rows = [["kind", "requested", "skipped", "created", "failed", "seconds", "rps"]]
+    for r in results:
+        rows.append(
+            [
+                r.kind,
+                str(r.requested),
+                str(r.skipped),
+                str(r.created),
+                str(r.failed),
+                f"{r.seconds:.1f}",
+                f"{r.rate:.1f}",
+            ]
+        )
+    widths = [max(len(row[i]) for row in rows) for i in range(len(rows[0]))]
+    return "\n".join(
+        "  ".join(c.ljust(w) if i == 0 else c.rjust(w) for i, (c, w) in enumerate(zip(row, widths)))
+        for row in rows
+    )
+
+
+# send(номер записи, payload) -> id в сервисе ("" — id не нужен) или None при ошибке
+_Sender = Callable[[int, Payload], Optional[str]]
+_BlockBuilder = Callable[[int, int], List[Payload]]
+
+
+class SeedEngine:
+    """Наполняет сервисы записями датасета; каждый вид — отдельный шаг с манифестом.
+
+    Шаги: operator (operator-directory), operator_index, session_index, ticket
+    (ticket-service) и ticket_index (search-service, id созданного тикета или
+    синтетический, если ticket-service не наполняется).
+    Клиент, равный None, отключает соответствующие шаги.
+    """
+
+    def __init__(
+        self,
+        dataset: str,
+        manifest: SeedManifest,
+        *,
+        ticket_client: Optional[TicketServiceClient] = None,
+        operator_client: Optional[OperatorDirectoryServiceClient] = None,
+        search_client: Optional[SearchServiceClient] = None,
+        concurrency: int = 16,
+        progress_interval: float = 5.0,
+    ) -> None:
+        self.dataset = dataset
+        self.manifest = manifest
+        self.ticket_client = ticket_client
+        self.operator_client = operator_client
+        self.search_client = search_client
+        self.concurrency = max(concurrency, 1)
+        self.progress_interval = progress_interval
+
+    def _pending(
+        self,
+        count: int,
+        build: _BlockBuilder,
+        done: Dict[int, str],
+        eligible: Optional[Set[int]],
+        result: SeedResult,
+    ) -> Iterator[Tuple[int, Payload]]:
+        """Недостающие записи 0..count-1 по порядку; блок строится, когда до него дошла очередь.
+
+        Номера вне eligible сразу считаются ошибкой.
+        """
+        for block in range((count + SEED_BLOCK_SIZE - 1) // SEED_BLOCK_SIZE):
+            start = block * SEED_BLOCK_SIZE
+            size = min(SEED_BLOCK_SIZE, count - start)
+            todo = [i for i in range(size) if start + i not in done]
+            ready = [i for i in todo if eligible is None or start + i in eligible]
+            result.failed += len(todo) - len(ready)
+            if not ready:
+                continue
+            # Блок строится целиком: содержимое записи не зависит от count
+            payloads = build(block, SEED_BLOCK_SIZE)
+            for i in ready:
+                yield start + i, payloads[i]
+
+    def _run(
+        self,
+        kind: str,
+        target: str,
+        count: int,
+        build: _BlockBuilder,
+        send: _Sender,
+        eligible: Optional[Set[int]] = None,
+    ) -> SeedResult:
+        """Отправляет недостающие записи 0..count-1, отмечая созданные в манифесте пачками.
+
+        В полёте держится не больше 2 × concurrency отправок: новая запись уходит, как только
+        завершилась любая из прежних, и границы блоков не опустошают пул.
+        eligible — номера, которые вообще можно отправить (остальные считаются ошибкой).
+
+        При прерывании (Ctrl-C, исключение) ещё не начатые отправки отменяются, а уже
+        выполненные всё равно попадают в манифест — повторный запуск их не продублирует.
+        """
+        done = self.manifest.seeded(target, self.dataset, kind)
+        result = SeedResult(kind=kind, target=target, requested=count)
+        result.skipped = sum(1 for idx in done if idx < count)
+        pending_total = count - result.skipped
+        started = time.perf_counter()
+        last_report = started
+
+        records = self._pending(count, build, done, eligible, result)
+        window = self.concurrency * 2
+        in_flight: Dict[Future[Optional[str]], int] = {}
+        batch: List[Tuple[int, str]] = []
+        with ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="seed") as pool:
+            try:
+                while True:
+                    for index, payload in islice(records, window - len(in_flight)):
+                        in_flight[pool.submit(send, index, payload)] = index
+                    if not in_flight:
+                        break
+                    finished, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                    for future in finished:
+                        index = in_flight.pop(future)
+                        remote_id = future.result()
+                        if remote_id is None:
+                            result.failed += 1
+                        else:
+                            batch.append((index, remote_id))
+                    if len(batch) >= MANIFEST_BATCH:
+                        self.manifest.mark(target, self.dataset, kind, batch)
+                        result.created += len(batch)
+                        batch = []
+
+                    now = time.perf_counter()
+                    if now - last_report >= self.progress_interval:
+                        last_report = now
+                        sent = result.created + len(batch) + result.failed
+                        rate = sent / (now - started)
+                        logger.info(
+                            "Seeding progress",
+                            extra={
+                                "dataset": self.dataset,
+                                "kind": kind,
+                                "done": sent,
+                                "total": pending_total,
+                                "failed": result.failed,
+                                "per_second": round(rate, 1),
+                                "eta_seconds": (
+                                    round((pending_total - sent) / rate, 1) if rate else None
+                                ),
+                            },
+                        )
+            finally:
+                for future in in_flight:
+                    future.cancel()
+                for future, index in in_flight.items():
+                    if future.cancelled():
+                        continue
+                    try:
+                        remote_id = future.result()
+                    except BaseException:
+                        continue
+                    if remote_id is not None:
+                        batch.append((index, remote_id))
+                self.manifest.mark(target, self.dataset, kind, batch)
+                result.created += len(batch)
+
+        result.seconds = time.perf_counter() - started
+        logger.info("Seeding step finished", extra={"dataset": self.dataset, **result.to_dict()})
+        return result
+
+    @staticmethod
+    def _call(kind: str, index: int, call: Callable[[], Any]) -> Optional[Any]:
+        """Вызов клиента; исключение (таймаут, открытый circuit breaker) — ошибка записи."""
+        try:
+            return call()
+        except Exception as exc:
+            logger.warning(
+                "Seeding request failed", extra={"kind": kind, "index": index, "error": repr(exc)}
+            )
+            return None
+
+    def seed_operators(self, count: int) -> List[SeedResult]:
+        """Операторы в operator-directory и в индекс search-service."""
+        results: List[SeedResult] = []
+
+        def build(block: int, size: int) -> List[Payload]:
+            return build_operator_block(self.dataset, block, size)
+
+        if self.operator_client is not None:
+            client = self.operator_client
+
+            def create(index: int, payload: Payload) -> Optional[str]:
+                resp = self._call("operator", index, lambda: client.create_operator(payload))
+                # 409 — оператор уже есть (например, манифест потерян)
+                ok = resp is not None and resp.status_code in (201, 409)
+                return payload["user_id"] if ok else None
+
+            results.append(self._run("operator", client.base_url, count, build, create))
+
+        if self.search_client is not None:
+            search = self.search_client
+
+            def index_operator(index: int, payload: Payload) -> Optional[str]:
+                resp = self._call("operator_index", index, lambda: search.index_operator(payload))
+                return payload["user_id"] if resp is not None and resp.status_code == 200 else None
+
+            results.append(
+                self._run("operator_index", search.base_url, count, build, index_operator)
+            )
+        return results
+
+    def seed_sessions(self, count: int) -> List[SeedResult]:
+        """Сессии в индекс search-service (отдельного REST для создания сессий нет)."""
+        if self.search_client is None:
+            return []
+        search = self.search_client
+
+        def index_session(index: int, payload: Payload) -> Optional[str]:
+            resp = self._call("session_index", index, lambda: search.index_session(payload))
+            return payload["session_id"] if resp is not None and resp.status_code == 200 else None
+
+        return [
+            self._run(
+                "session_index",
+                search.base_url,
+                count,
+                lambda block, size: build_session_block(self.dataset, block, size),
+                index_session,
+            )
+        ]
+
+    def ticket_dimensions(self, operators: int = 0, sessions: int = 0) -> Tuple[int, int]:
+        """(операторов, сессий), из которых тикеты датасета выбирают ссылки.
+
+        Фиксируются в манифесте при первом наполнении тикетов: из аргументов, а если они
+        не заданы — по числу уже созданных операторов и сессий датасета. Дальше тикет с
+        данным номером строится одинаково, какие бы размеры ни передал следующий запуск.
+        """
+        fixed = self.manifest.dimensions(self.dataset)
+        if fixed is None:
+            counts: Dict[str, int] = {}
+            for _target, _dataset, kind, count in self.manifest.summary(self.dataset):
+                counts[kind] = max(counts.get(kind, 0), count)
+            operators = operators or max(counts.get("operator", 0), counts.get("operator_index", 0))
+            sessions = sessions or counts.get("session_index", 0)
+            if operators <= 0 or sessions <= 0:
+                raise ValueError(
+                    f"Dataset {self.dataset!r} has no operators/sessions to reference: "
+                    "seed them first or pass --operators/--sessions"
+                )
+            fixed = self.manifest.fix_dimensions(self.dataset, operators, sessions)
+        elif (operators, sessions) != (0, 0) and (operators, sessions) != fixed:
+            logger.info(
+                "Tickets reference dataset dimensions fixed in manifest",
+                extra={"dataset": self.dataset, "operators": fixed[0], "sessions": fixed[1]},
+            )
+        return fixed
+
+    def seed_tickets(self, count: int, operators: int = 0, sessions: int = 0) -> List[SeedResult]:
+        """Тикеты в ticket-service, затем в индекс search-service с id из ответа создания.
+
+        Без ticket_client тикеты только индексируются, с synthetic_ticket_id.
+
+        operators/sessions — размеры датасета для ссылок тикетов, если они ещё не
+        зафиксированы в манифесте (см. ticket_dimensions).
+        """
+        results: List[SeedResult] = []
+        operators, sessions = self.ticket_dimensions(operators, sessions)
+
+        def build(block: int, size: int) -> List[Payload]:
+            return build_ticket_block(self.dataset, block, size, operators, sessions)
+
+        if self.ticket_client is not None:
+            client = self.ticket_client
+
+            def create(index: int, payload: Payload) -> Optional[str]:
+                # Без повторов: повтор POST после таймаута чтения создал бы дубликат тикета
+                resp = self._call(
+                    "ticket", index, lambda: client.create_ticket(payload, retry=False)
+                )
+                ticket_id = (resp.json or {}).get("id") if resp is not None else None
+                if resp is None or resp.status_code != 201 or ticket_id is None:
+                    return None
+                return str(ticket_id)
+
+            results.append(self._run("ticket", client.base_url, count, build, create))
+
+        if self.search_client is not None:
+            search = self.search_client
+            ticket_ids: Optional[Dict[int, str]] = None
+            if self.ticket_client is not None:
+                ticket_ids = self.manifest.seeded(
+                    self.ticket_client.base_url, self.dataset, "ticket"
+                )
+
+            def index_ticket(index: int, payload: Payload) -> Optional[str]:
+                if ticket_ids is not None:
+                    ticket_id = ticket_ids[index]
+                else:
+                    ticket_id = str(synthetic_ticket_id(self.dataset, index))
+                body = {**payload, "ticket_id": int(ticket_id), "status": "open"}
+                resp = self._call("ticket_index", index, lambda: search.index_ticket(body))
+                return ticket_id if resp is not None and resp.status_code == 200 else None
+
+            results.append(
+                self._run(
+                    "ticket_index",
+                    search.base_url,
+                    count,
+                    build,
+                    index_ticket,
+                    eligible=None if ticket_ids is None else set(ticket_ids),
+                )
+            )
+        return results
+
+    def seed(self, *, operators: int = 0, sessions: int = 0, tickets: int = 0) -> List[SeedResult]:
+        """Все виды датасета по порядку: операторы и сессии раньше ссылающихся на них тикетов."""
+        results: List[SeedResult] = []
+        if operators:
+            results.extend(self.seed_operators(operators))
+        if sessions:
+            results.extend(self.seed_sessions(sessions))
+        if tickets:
+            results.extend(self.seed_tickets(tickets, operators, sessions))
+        return results
+
+
+# --- CLI ---
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    settings = get_settings()
+    parser = argparse.ArgumentParser(
+        prog="python -m qa_tests.seeding",
+        description="Идемпотентное наполнение ticket/operator-directory/search данными",
+    )
+    parser.add_argument("--dataset", default=settings.seed_dataset, help="Имя датасета")
+    parser.add_argument("--manifest", type=Path, help="Файл SQLite (по умолчанию SEED_MANIFEST)")
+    parser.add_argument("--operators", type=int, default=0)
+    parser.add_argument("--sessions", type=int, default=0)
+    parser.add_argument("--tickets", type=int, default=0)
+    parser.add_argument("--concurrency", type=int, default=16, help="Параллельных запросов")
+    parser.add_argument(
+        "--no-index", action="store_true", help="Не индексировать записи в search-service"
+    )
+    parser.add_argument("--status", action="store_true", help="Показать, что уже создано, и выйти")
+    args = parser.parse_args(argv)
+
+    manifest_path = args.manifest or settings.seed_manifest
+    if manifest_path is None:
+        raise SystemExit("SEED_MANIFEST is empty: pass --manifest explicitly")
+    manifest = SeedManifest(manifest_path)
+
+    if args.status:
+        for target, dataset, kind, count in manifest.summary(args.dataset):
+            print(f"{dataset}  {kind:<15} {count:>9}  {target}")
+        dimensions = manifest.dimensions(args.dataset)
+        if dimensions is not None:
+            operators, sessions = dimensions
+            print(f"{args.dataset}  tickets reference {operators} operators, {sessions} sessions")
+        return 0
+
+    pool_size = max(args.concurrency, 1)
+    engine = SeedEngine(
+        args.dataset,
+        manifest,
+        ticket_client=TicketServiceClient(
+            base_url=settings.ticket_service.base_url, pool_size=pool_size
+        ),
+        operator_client=OperatorDirectoryServiceClient(
+            base_url=settings.operator_directory_service.base_url, pool_size=pool_size
+        ),
+        search_client=(
+            None
+            if args.no_index
+            else SearchServiceClient(base_url=settings.search_service.base_url, pool_size=pool_size)
+        ),
+        concurrency=args.concurrency,
+    )
+    try:
+        results = engine.seed(
+            operators=args.operators, sessions=args.sessions, tickets=args.tickets
+        )
+    except ValueError as exc:
+        raise SystemExit(str(exc)) from exc
+    print(format_results(results))
+    return 1 if any(r.failed for r in results) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,284 @@
+"""Pytest-плагин: проверка бюджетов задержек (latency SLO) по итогам прогона.
+
+Бюджет задаётся строкой ``SERVICE:OPERATION:pNN<VALUE`` — например
+``SESSION_MANAGER:POST /session/join:p95<120ms``. Единицы: ``us``, ``ms``, ``s``;
+``<`` — перцентиль строго меньше порога, ``<=`` — порог включительно.
+Имя сервиса сравнивается без учёта регистра и суффикса ``_SERVICE``
+(``SESSION_MANAGER`` = ``session-manager`` = метка ``session_manager``).
+
+Операция — метка ``operation`` из metrics.py: метод и шаблон пути без query string,
+идентификаторы в пути заменены на ``{id}`` (``GET /session/{id}/participants``).
+Операция бюджета приводится к тому же виду, так что можно указать и конкретный URL.
+
+Источники бюджетов: ``LATENCY_SLO`` / ``LATENCY_SLO_FILE`` (см. config.py) и опция
+``--latency-slo``. В конце сессии перцентили считаются по HDR-гистограммам всех
+запросов операции (все статусы, все воркеры xdist); при превышении бюджета прогон
+помечается упавшим, а отчёт выводится в терминал и добавляется в Allure.
+
+Бюджет без единого запроса (NO DATA) — чаще всего опечатка в операции — выводится
+предупреждением; с ``LATENCY_SLO_STRICT=1`` или ``--latency-slo-strict`` он валит прогон.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import re
+import time
+import uuid
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import pytest
+from allure_commons.logger import AllureFileLogger
+from allure_commons.model2 import Attachment, Label, Status, StatusDetails, TestResult
+from allure_commons.types import AttachmentType, LabelType
+
+from .config import get_settings
+from .hdr_histogram import LatencyHistogram
+from .logging_utils import get_logger, route_template
+from .metrics import LatencyKey, latency_histograms
+
+logger = get_logger(__name__)
+
+_PREDICATE_RE = re.compile(
+    r"^p(?P<pct>\d+(?:\.\d+)?)\s*(?P<op><=?)\s*(?P<value>\d+(?:\.\d+)?)\s*(?P<unit>us|ms|s)$"
+)
+_UNITS = {"us": 1e-6, "ms": 1e-3, "s": 1.0}
+
+
+def normalize_service(name: str) -> str:
+    """SESSION_MANAGER_SERVICE / session-manager / session_manager -> session_manager."""
+    normalized = name.strip().lower().replace("-", "_")
+    if normalized.endswith("_service"):
+        normalized = normalized[: -len("_service")]
+    return normalized
+
+
+@dataclass(frozen=True)
+class LatencyBudget:
+    service: str
+    operation: str
+    percentile: float
+    threshold_seconds: float
+    spec: str
+    # "<" — строго меньше порога, "<=" — порог включительно
+    comparison: str = "<"
+
+    def allows(self, observed_seconds: float) -> bool:
+        if self.comparison == "<=":
+            return observed_seconds <= self.threshold_seconds
+        return observed_seconds < self.threshold_seconds
+
+
+def parse_budget(spec: str) -> LatencyBudget:
+    """Разбирает строку бюджета; при ошибке формата — ValueError с понятным текстом."""
+    service, sep, rest = spec.partition(":")
+    operation, sep2, predicate = rest.rpartition(":")
+    match = _PREDICATE_RE.match(predicate.strip())
+    if not (sep and sep2 and service.strip() and operation.strip() and match):
+        raise ValueError(
+            f"Invalid latency budget {spec!r}: expected SERVICE:OPERATION:pNN<VALUE(us|ms|s), "
+            "e.g. SESSION_MANAGER:POST /session/join:p95<120ms"
+        )
+    return LatencyBudget(
+        service=normalize_service(service),
+        operation=route_template(operation.strip()),
+        percentile=float(match.group("pct")),
+        threshold_seconds=float(match.group("value")) * _UNITS[match.group("unit")],
+        spec=spec.strip(),
+        comparison=match.group("op"),
+    )
+
+
+@dataclass(frozen=True)
+class BudgetResult:
+    budget: LatencyBudget
+    observed_seconds: Optional[float]
+    count: int
+    # Строгий режим: бюджет без данных тоже считается нарушенным
+    strict: bool = False
+
+    @property
+    def status(self) -> str:
+        if self.observed_seconds is None:
+            return "NO DATA"
+        return "PASS" if self.budget.allows(self.observed_seconds) else "FAIL"
+
+    @property
+    def missing(self) -> bool:
+        return self.observed_seconds is None
+
+    @property
+    def failed(self) -> bool:
+        return self.status == "FAIL" or (self.strict and self.missing)
+
+
+def evaluate_budgets(
+    budgets: Sequence[LatencyBudget],
+    histograms: Dict[LatencyKey, LatencyHistogram],
+    strict: bool = False,
+) -> List[BudgetResult]:
+    """Считает перцентиль каждой операции по объединённой гистограмме всех статусов."""
+    merged: Dict[Tuple[str, str], LatencyHistogram] = {}
+    for (service, operation, _status), histogram in histograms.items():
+        key = (normalize_service(service), route_template(operation))
+        if key not in merged:
+            merged[key] = LatencyHistogram(histogram.significant_figures)
+        merged[key].merge(histogram)
+
+    results = []
+    for budget in budgets:
+        combined = merged.get((budget.service, budget.operation))
+        if combined is None or combined.total_count == 0:
+            results.append(
+                BudgetResult(budget=budget, observed_seconds=None, count=0, strict=strict)
+            )
+            continue
+        results.append(
+            BudgetResult(
+                budget=budget,
+                observed_seconds=combined.value_at_percentile(budget.percentile),
+                count=combined.total_count,
+                strict=strict,
+            )
+        )
+    return results
+
+
+def format_report(results: Sequence[BudgetResult]) -> str:
+    """Текстовая таблица: статус, наблюдаемый перцентиль против бюджета, число запросов."""
+    rows = [["status", "service", "operation", "percentile", "observed", "budget", "count"]]
+    for r in results:
+        b = r.budget
+        observed = "-" if r.observed_seconds is None else f"{r.observed_seconds * 1000:.2f}ms"
+        rows.append(
+            [
+                r.status,
+                b.service,
+                b.operation,
+                f"p{b.percentile:g}",
+                observed,
+                f"{b.comparison}{b.threshold_seconds * 1000:.2f}ms",
+                str(r.count),
+            ]
+        )
+    widths = [max(len(row[i]) for row in rows) for i in range(len(rows[0]))]
+    return "\n".join("  ".join(c.ljust(w) for c, w in zip(row, widths)).rstrip() for row in rows)
+
+
+# --- pytest-плагин ---
+
+_BUDGETS_KEY = pytest.StashKey[List[LatencyBudget]]()
+_STRICT_KEY = pytest.StashKey[bool]()
+_REPORT_KEY = pytest.StashKey[str]()
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    group = parser.getgroup("latency-slo", "бюджеты задержек (latency SLO)")
+    group.addoption(
+        "--latency-slo",
+        action="append",
+        default=[],
+        metavar="SPEC",
+        help="Бюджет задержки SERVICE:OPERATION:pNN<VALUE(us|ms|s); можно указать несколько раз",
+    )
+    group.addoption(
+        "--latency-slo-strict",
+        action="store_true",
+        default=False,
+        help="Бюджет без единого запроса операции (NO DATA) валит прогон",
+    )
+
+
+def pytest_configure(config: pytest.Config) -> None:
+    settings = get_settings()
+    specs = [*settings.latency_slos, *config.getoption("latency_slo", default=[])]
+    config.stash[_STRICT_KEY] = settings.latency_slo_strict or bool(
+        config.getoption("latency_slo_strict", default=False)
+    )
+    try:
+        config.stash[_BUDGETS_KEY] = [parse_budget(spec) for spec in specs]
+    except ValueError as exc:
+        raise pytest.UsageError(str(exc)) from exc
+
+
+def _report_to_allure(config: pytest.Config, results: Sequence[BudgetResult], report: str) -> None:
+    """Добавляет в Allure отдельный результат «Latency SLO gate» с отчётом во вложении."""
+    report_dir = getattr(config.option, "allure_report_dir", None)
+    if not report_dir:
+        return
+    file_logger = AllureFileLogger(report_dir)
+    attachment_source = f"{uuid.uuid4()}-attachment.txt"
+    file_logger.report_attached_data(report, attachment_source)
+
+    failed = [r for r in results if r.failed]
+    full_name = "qa_tests.slo::latency_slo_gate"
+    now = int(time.time() * 1000)
+    message = (
+        "Нарушены бюджеты задержек: " + ", ".join(r.budget.spec for r in failed)
+        if failed
+        else "Все бюджеты задержек соблюдены"
+    )
+    file_logger.report_result(
+        TestResult(
+            uuid=str(uuid.uuid4()),
+            name="Latency SLO gate",
+            fullName=full_name,
+            historyId=hashlib.md5(full_name.encode("utf-8")).hexdigest(),
+            status=Status.FAILED if failed else Status.PASSED,
+            statusDetails=StatusDetails(message=message),
+            attachments=[
+                Attachment(
+                    name="latency_slo_report",
+                    source=attachment_source,
+                    type=AttachmentType.TEXT.mime_type,
+                )
+            ],
+            labels=[Label(name=LabelType.FEATURE, value="Latency SLO")],
+            start=now,
+            stop=now,
+        )
+    )
+
+
+@pytest.hookimpl(trylast=True)
+def pytest_sessionfinish(session: pytest.Session, exitstatus: int) -> None:
+    config = session.config
+    # Воркеры xdist видят лишь часть запросов — оценивает только контроллер
+    if hasattr(config, "workerinput"):
+        return
+    budgets = config.stash.get(_BUDGETS_KEY, [])
+    if not budgets:
+        return
+
+    results = evaluate_budgets(
+        budgets, latency_histograms(), strict=config.stash.get(_STRICT_KEY, False)
+    )
+    report = format_report(results)
+    config.stash[_REPORT_KEY] = report
+    _report_to_allure(config, results, report)
+
+    missing = [r.budget.spec for r in results if r.missing]
+    if missing:
+        # Бюджет без данных не проверяет ничего: опечатка в операции отключила бы гейт молча
+        logger.warning("Latency SLO budgets without data", extra={"budgets": missing})
+    failed = [r for r in results if r.failed]
+    logger.info(
+        "Latency SLO evaluated",
+        extra={"budgets": len(results), "failed": [r.budget.spec for r in failed]},
+    )
+    if failed and session.exitstatus == pytest.ExitCode.OK:
+        session.exitstatus = pytest.ExitCode.TESTS_FAILED
+
+
+def pytest_terminal_summary(terminalreporter, exitstatus: int, config: pytest.Config) -> None:
+    report = config.stash.get(_REPORT_KEY, None)
+    if report:
+        terminalreporter.write_sep("=", "latency SLO")
+        terminalreporter.write_line(report)
+        if "NO DATA" in report and not config.stash.get(_STRICT_KEY, False):
+            terminalreporter.write_line(
+                "NO DATA: ни одного запроса операции — проверьте имя сервиса и операции "
+                "(строгий режим: --latency-slo-strict / LATENCY_SLO_STRICT=1)",
+                yellow=True,
+            )
@@ -0,0 +1,298 @@
+"""Бенчмарк пропускной способности POST /data/file (data-channel-service).
+
+Матрица «размер файла × число параллельных загрузок»: файлы генерируются во
+временном каталоге кусками (в памяти — только один блок), загружаются потоково
+(MultipartFileStream) из пула потоков, загрузки распределяются по сессиям по кругу.
+
+На каждую загрузку:
+
+- throughput — размер файла / время отправки тела (MB/s, 1 MB = 10^6 байт);
+- time-to-first-byte — от начала запроса до заголовков ответа;
+- acceptance latency — от отправки последнего байта до ответа (обработка на сервере).
+
+Если ответ содержит ``url`` загруженного файла, он скачивается потоково — в отчёт
+попадают MB/s и TTFB скачивания; отдельного эндпоинта скачивания у сервиса нет, и
+при ответе не 200 скачивание помечается недоступным.
+"""
+
+from __future__ import annotations
+
+import os
+import statistics
+import tempfile
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+from .hdr_histogram import LatencyHistogram
+from .http_client import DataChannelServiceClient
+from .load import PERCENTILES
+from .logging_utils import get_logger
+from .multipart import DEFAULT_CHUNK_SIZE, MultipartFileStream
+
+logger = get_logger(__name__)
+
+MB = 1_000_000
+# Случайный блок, повторяемый при генерации файла: данные не сжимаются прокси/сервисом
+_FILL_BLOCK_SIZE = 1 << 20
+
+
+def generate_file(path: Path, size_bytes: int, block_size: int = _FILL_BLOCK_SIZE) -> Path:
+    """Пишет файл size_bytes байт блоками; повторно не создаёт файл нужного размера."""
+    if path.exists() and path.stat().st_size == size_bytes:
+        return path
+    block = os.urandom(min(block_size, max(size_bytes, 1)))
+    remaining = size_bytes
+    with open(path, "wb") as fh:
+        while remaining > 0:
+            written = fh.write(block[: min(remaining, len(block))])
+            remaining -= written
+    return path
+
+
+@dataclass(frozen=True)
+class UploadBenchConfig:
+    sizes_mb: Sequence[float] = (1, 16, 64)
+    concurrency: Sequence[int] = (1, 4)
+    # Загрузок на один поток в каждой ячейке матрицы
+    repeats: int = 2
+    sessions: int = 2
+    chunk_size: int = DEFAULT_CHUNK_SIZE
+    timeout: float = 300.0
+    download: bool = True
+
+
+@dataclass
+class UploadSample:
+    size_bytes: int
+    status_code: int
+    upload_seconds: float
+    ttfb_seconds: float
+    acceptance_seconds: float
+    download_status: Optional[int] = None
+    download_seconds: Optional[float] = None
+    download_ttfb_seconds: Optional[float] = None
+    # url загруженного файла из ответа сервиса (для скачивания)
+    location: Optional[str] = None
+    error: str = ""
+
+    @property
+    def ok(self) -> bool:
+        return self.status_code == 200 and not self.error
+
+    @property
+    def upload_mb_per_second(self) -> float:
+        return self.size_bytes / MB / self.upload_seconds if self.upload_seconds > 0 else 0.0
+
+
+@dataclass
+class UploadCellReport:
+    size_bytes: int
+    concurrency: int
+    wall_seconds: float
+    samples: List[UploadSample] = field(default_factory=list)
+
+    @property
+    def ok_samples(self) -> List[UploadSample]:
+        return [s for s in self.samples if s.ok]
+
+    @property
+    def failures(self) -> int:
+        return len(self.samples) - len(self.ok_samples)
+
+    @property
+    def aggregate_mb_per_second(self) -> float:
+        """Суммарная пропускная способность ячейки: байты всех успешных загрузок / wall time."""
+        total = sum(s.size_bytes for s in self.ok_samples)
+        return total / MB / self.wall_seconds if self.wall_seconds > 0 else 0.0
+
+    def _histogram(self, attr: str) -> LatencyHistogram:
+        histogram = LatencyHistogram()
+        for sample in self.ok_samples:
+            value = getattr(sample, attr)
+            if value is not None:
+                histogram.record(value)
+        return histogram
+
+    def to_dict(self) -> Dict[str, Any]:
+        ok = self.ok_samples
+        per_upload = [s.upload_mb_per_second for s in ok]
+        downloads = [
+            s.size_bytes / MB / s.download_seconds
+            for s in ok
+            if s.download_status == 200 and s.download_seconds
+        ]
+        return {
+            "size_mb": round(self.size_bytes / MB, 3),
+            "concurrency": self.concurrency,
+            "uploads": len(self.samples),
+            "failures": self.failures,
+            "errors": sorted(
+                {s.error or f"HTTP {s.status_code}" for s in self.samples if not s.ok}
+            ),
+            "aggregate_mb_per_second": round(self.aggregate_mb_per_second, 2),
+            "upload_mb_per_second_p50": (
+                round(statistics.median(per_upload), 2) if per_upload else 0
+            ),
+            "upload_mb_per_second_min": round(min(per_upload), 2) if per_upload else 0,
+            "ttfb_ms": self._histogram("ttfb_seconds").summary(PERCENTILES),
+            "acceptance_ms": self._histogram("acceptance_seconds").summary(PERCENTILES),
+            "download_mb_per_second_p50": (
+                round(statistics.median(downloads), 2) if downloads else None
+            ),
+            "download_ttfb_ms": self._histogram("download_ttfb_seconds").summary(PERCENTILES),
+            "download_statuses": sorted(
+                {s.download_status for s in ok if s.download_status is not None}
+            ),
+        }
+
+
+@dataclass
+class UploadBenchReport:
+    config: UploadBenchConfig
+    cells: List[UploadCellReport]
+
+    @property
+    def failures(self) -> int:
+        return sum(c.failures for c in self.cells)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "chunk_size": self.config.chunk_size,
+            "sessions": self.config.sessions,
+            "cells": [c.to_dict() for c in self.cells],
+        }
+
+    def format_table(self) -> str:
+        rows = [
+            [
+                "size_mb",
+                "conc",
+                "uploads",
+                "fail",
+                "MB/s total",
+                "MB/s p50",
+                "ttfb p50",
+                "ttfb p99",
+                "accept p50",
+                "accept p99",
+                "dl MB/s",
+            ]
+        ]
+        for cell in self.cells:
+            d = cell.to_dict()
+            rows.append(
+                [
+                    f"{d['size_mb']:g}",
+                    str(d["concurrency"]),
+                    str(d["uploads"]),
+                    str(d["failures"]),
+                    f"{d['aggregate_mb_per_second']:.1f}",
+                    f"{d['upload_mb_per_second_p50']:.1f}",
+                    f"{d['ttfb_ms']['p50_ms']:.1f}ms",
+                    f"{d['ttfb_ms']['p99_ms']:.1f}ms",
+                    f"{d['acceptance_ms']['p50_ms']:.1f}ms",
+                    f"{d['acceptance_ms']['p99_ms']:.1f}ms",
+                    (
+                        "-"
+                        if d["download_mb_per_second_p50"] is None
+                        else f"{d['download_mb_per_second_p50']:.1f}"
+                    ),
+                ]
+            )
+        widths = [max(len(row[i]) for row in rows) for i in range(len(rows[0]))]
+        return "\n".join("  ".join(c.rjust(w) for c, w in zip(row, widths)) for row in rows)
+
+
+class UploadBenchmark:
+    def __init__(
+        self,
+        client: DataChannelServiceClient,
+        config: UploadBenchConfig,
+        workdir: Optional[Path] = None,
+    ) -> None:
+        self.client = client
+        self.config = config
+        self.workdir = workdir
+        self.session_ids = [str(uuid.uuid4()) for _ in range(max(config.sessions, 1))]
+
+    def _download(self, sample: UploadSample) -> None:
+        location = sample.location
+        if not location:
+            return
+        started = time.perf_counter()
+        try:
+            with self.client._http().get(
+                self.client._url(location), stream=True, timeout=self.config.timeout
+            ) as resp:
+                sample.download_status = resp.status_code
+                if resp.status_code != 200:
+                    return
+                first_chunk_at: Optional[float] = None
+                for chunk in resp.iter_content(chunk_size=self.config.chunk_size):
+                    if first_chunk_at is None and chunk:
+                        first_chunk_at = time.perf_counter()
+                sample.download_seconds = time.perf_counter() - started
+                sample.download_ttfb_seconds = (first_chunk_at or time.perf_counter()) - started
+        except Exception as exc:
+            logger.warning("Download failed", extra={"url": location, "error": repr(exc)})
+
+    def _upload(self, path: Path, index: int) -> UploadSample:
+        body = MultipartFileStream(
+            fields={
+                "session_id": self.session_ids[index % len(self.session_ids)],
+                "user_id": str(uuid.uuid4()),
+            },
+            file_field="file",
+            file_path=path,
+            chunk_size=self.config.chunk_size,
+        )
+        started = time.perf_counter()
+        try:
+            resp = self.client.upload_multipart(body, timeout=self.config.timeout)
+        except Exception as exc:
+            return UploadSample(body.file_size, 0, 0.0, 0.0, 0.0, error=type(exc).__name__)
+        response_at = body.response_at or time.perf_counter()
+        body_done = body.last_read_at or response_at
+        sample = UploadSample(
+            size_bytes=body.file_size,
+            status_code=resp.status_code,
+            upload_seconds=body_done - (body.first_read_at or started),
+            ttfb_seconds=response_at - started,
+            acceptance_seconds=max(response_at - body_done, 0.0),
+        )
+        location = (resp.json or {}).get("url")
+        if isinstance(location, str) and location:
+            sample.location = location
+        return sample
+
+    def _run_cell(self, path: Path, size_bytes: int, concurrency: int) -> UploadCellReport:
+        total = concurrency * self.config.repeats
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="upload") as pool:
+            samples = list(pool.map(lambda i: self._upload(path, i), range(total)))
+            wall_seconds = time.perf_counter() - started
+            # Скачивание — после загрузок, с той же параллельностью: не искажает wall time
+            if self.config.download:
+                list(pool.map(self._download, [s for s in samples if s.ok]))
+        cell = UploadCellReport(
+            size_bytes=size_bytes,
+            concurrency=concurrency,
+            wall_seconds=wall_seconds,
+            samples=samples,
+        )
+        logger.info("Upload benchmark cell finished", extra={"cell": cell.to_dict()})
+        return cell
+
+    def run(self) -> UploadBenchReport:
+        cells: List[UploadCellReport] = []
+        with tempfile.TemporaryDirectory(prefix="upload-bench-", dir=self.workdir) as tmp:
+            for size_mb in self.config.sizes_mb:
+                size_bytes = int(size_mb * MB)
+                path = generate_file(Path(tmp) / f"payload-{size_bytes}.bin", size_bytes)
+                for concurrency in self.config.concurrency:
+                    cells.append(self._run_cell(path, size_bytes, concurrency))
+        return UploadBenchReport(config=self.config, cells=cells)
@@ -0,0 +1,200 @@
+"""Пул заранее зарегистрированных и аутентифицированных пользователей на сессию pytest.
+
+Регистрация + логин + GET /users/me — три запроса и bcrypt на стороне сервиса на
+каждый тест. Пул создаёт пользователей параллельно один раз за сессию (в каждом
+воркере xdist — свой пул) и выдаёт их тестам в эксклюзивную аренду:
+
+    with user_pool.lease() as user:
+        api_gateway_client.get_me(user.access_token)
+
+Изоляция: пользователь в аренде не выдаётся другим тестам; тест, который меняет
+состояние пользователя (профиль, logout, удаление), вызывает ``user.retire()`` —
+такой пользователь (как и пользователь теста, упавшего с исключением) в пул не
+возвращается. Если свободных пользователей роли нет, новый создаётся на лету.
+Access token обновляется через ``auth_refresh`` (или повторный логин), когда до
+истечения (claim ``exp`` JWT) остаётся меньше ``refresh_margin_seconds``.
+"""
+
+from __future__ import annotations
+
+import base64
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional
+
+from . import data_factory
+from .http_client import ApiGatewayClient
+from .logging_utils import get_logger
+from .models import AuthResponse
+
+logger = get_logger(__name__)
+
+
+def jwt_expiry(token: str) -> Optional[float]:
+    """Claim exp из JWT (unix time) без проверки подписи; None для не-JWT токенов."""
+    parts = token.split(".")
+    if len(parts) != 3:
+        return None
+    body = parts[1] + "=" * (-len(parts[1]) % 4)
+    try:
+        claims = json.loads(base64.urlsafe_b64decode(body))
+    except ValueError:
+        return None
+    exp = claims.get("exp") if isinstance(claims, dict) else None
+    return float(exp) if isinstance(exp, (int, float)) else None
+
+
+@dataclass
+class PooledUser:
+    payload: Dict[str, str]  # данные регистрации: username, email, password, role
+    user_id: str
+    access_token: str
+    refresh_token: Optional[str]
+    expires_at: Optional[float]
+    retired: bool = field(default=False, repr=False)
+
+    @property
+    def email(self) -> str:
+        return self.payload["email"]
+
+    @property
+    def password(self) -> str:
+        return self.payload["password"]
+
+    @property
+    def role(self) -> str:
+        return self.payload["role"]
+
+    @property
+    def auth_headers(self) -> Dict[str, str]:
+        return {"Authorization": f"Bearer {self.access_token}"}
+
+    def retire(self) -> None:
+        """Не возвращать пользователя в пул после аренды (тест изменил его состояние)."""
+        self.retired = True
+
+    def _apply_tokens(self, body: Dict[str, Any]) -> None:
+        tokens = AuthResponse.model_validate(body)
+        self.access_token = tokens.access_token
+        self.refresh_token = tokens.refresh_token or self.refresh_token
+        self.expires_at = jwt_expiry(tokens.access_token)
+
+
+class UserPool:
+    """Потокобезопасный пул пользователей с арендой по ролям."""
+
+    def __init__(
+        self,
+        client: ApiGatewayClient,
+        *,
+        refresh_margin_seconds: float = 60.0,
+        max_workers: int = 8,
+    ) -> None:
+        self.client = client
+        self.refresh_margin_seconds = refresh_margin_seconds
+        self.max_workers = max_workers
+        self._idle: Dict[str, List[PooledUser]] = {}
+        self._lock = threading.Lock()
+        self.created = 0
+        self.leases = 0
+
+    def _create_user(self, role: str) -> PooledUser:
+        payload = data_factory.build_user_registration()
+        payload["role"] = role
+        registered = self.client.register_user(payload)
+        status = registered.status_code
+        assert status in (200, 201), f"Pool user registration failed: {status}"
+        auth = self.client.authenticate(
+            data_factory.build_login_payload(payload["email"], payload["password"])
+        )
+        assert auth.status_code == 200 and auth.json, f"Pool user login failed: {auth.status_code}"
+        tokens = AuthResponse.model_validate(auth.json)
+        me = self.client.get_me(tokens.access_token)
+        assert me.status_code == 200 and me.json and me.json.get("id"), "Pool user has no id"
+        with self._lock:
+            self.created += 1
+        return PooledUser(
+            payload=payload,
+            user_id=str(me.json["id"]),
+            access_token=tokens.access_token,
+            refresh_token=tokens.refresh_token,
+            expires_at=jwt_expiry(tokens.access_token),
+        )
+
+    def fill(self, role: str = "client", count: int = 4) -> None:
+        """Параллельно создаёт count пользователей роли и кладёт их в пул."""
+        if count <= 0:
+            return
+        started = time.perf_counter()
+        with ThreadPoolExecutor(
+            max_workers=min(self.max_workers, count), thread_name_prefix="user-pool"
+        ) as executor:
+            users = list(executor.map(lambda _: self._create_user(role), range(count)))
+        with self._lock:
+            self._idle.setdefault(role, []).extend(users)
+        logger.info(
+            "User pool filled",
+            extra={
+                "role": role,
+                "count": count,
+                "duration_seconds": round(time.perf_counter() - started, 3),
+            },
+        )
+
+    def _ensure_fresh(self, user: PooledUser) -> None:
+        if user.expires_at is None or user.expires_at - time.time() > self.refresh_margin_seconds:
+            return
+        if user.refresh_token:
+            resp = self.client.auth_refresh(data_factory.build_refresh_payload(user.refresh_token))
+            if resp.status_code == 200 and resp.json:
+                user._apply_tokens(resp.json)
+                return
+            logger.info(
+                "Pool user token refresh rejected, logging in again",
+                extra={"email": user.email, "status_code": resp.status_code},
+            )
+        # Refresh token истёк или отозван — повторный логин
+        auth = self.client.authenticate(data_factory.build_login_payload(user.email, user.password))
+        assert auth.status_code == 200 and auth.json, f"Pool user re-login failed: {user.email}"
+        user._apply_tokens(auth.json)
+
+    def acquire(self, role: str = "client") -> PooledUser:
+        with self._lock:
+            idle = self._idle.get(role)
+            user = idle.pop() if idle else None
+            self.leases += 1
+        if user is None:
+            user = self._create_user(role)
+        self._ensure_fresh(user)
+        return user
+
+    def release(self, user: PooledUser) -> None:
+        if user.retired:
+            return
+        with self._lock:
+            self._idle.setdefault(user.role, []).append(user)
+
+    @contextmanager
+    def lease(self, role: str = "client") -> Iterator[PooledUser]:
+        """Эксклюзивная аренда пользователя на время блока with."""
+        user = self.acquire(role)
+        try:
+            yield user
+        except BaseException:
+            # Состояние пользователя после упавшего теста неизвестно
+            user.retire()
+            raise
+        finally:
+            self.release(user)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "created": self.created,
+                "leases": self.leases,
+                "idle": {role: len(users) for role, users in self._idle.items()},
+            }
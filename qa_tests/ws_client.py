@@ -2,7 +2,7 @@ from __future__ import annotations
 
 import json
 from dataclasses import dataclass
-from typing import Any, AsyncIterator, Dict, Optional
+from typing import Any, AsyncIterator, Dict, Optional, Union
 
 from websockets.asyncio.client import ClientConnection, connect
 from websockets.exceptions import WebSocketException
@@ -13,6 +13,11 @@ from .retry import RetryConfig, retry_on_exceptions
 
 logger = get_logger(__name__)
 
+# Сколько символов текстового кадра попадает в лог; большие кадры логируются превью и размером
+LOG_PREVIEW_CHARS = 512
+
+BytesLike = Union[bytes, bytearray, memoryview]
+
 
 @dataclass
 class WebSocketMessage:
@@ -24,6 +29,8 @@ class WebSocketMessage:
 class WebSocketClient:
     url: str
     token: Optional[str] = None
+    # Максимальный размер входящего сообщения (websockets max_size); None — без ограничения
+    max_message_bytes: Optional[int] = 1 << 20
 
     _conn: Optional[ClientConnection] = None
 
@@ -34,7 +41,10 @@ class WebSocketClient:
             headers["Authorization"] = f"Bearer {self.token}"
 
         # ws16: additional_headers; extra_headers would be passed to event loop (TypeError)
-        connect_kwargs: Dict[str, Any] = {"ping_interval": 20}
+        connect_kwargs: Dict[str, Any] = {
+            "ping_interval": 20,
+            "max_size": self.max_message_bytes,
+        }
         if headers:
             connect_kwargs["additional_headers"] = headers
         async with measure_request_async(
@@ -51,9 +61,29 @@ class WebSocketClient:
         assert self._conn is not None
         message = json.dumps(payload)
         await self._conn.send(message)
-        logger.info("WebSocket send", extra={"payload": payload})
+        logger.info("WebSocket send", extra={"operation": "SEND", "payload": payload})
 
-    async def receive(self) -> WebSocketMessage:
+    async def send_text(self, message: str) -> None:
+        """Отправляет текстовый кадр как есть (без JSON-сериализации); в лог — только размер."""
+        if not self._conn:
+            await self.connect()
+        assert self._conn is not None
+        await self._conn.send(message)
+        logger.info("WebSocket send", extra={"operation": "SEND", "size": len(message)})
+
+    async def send_bytes(self, data: BytesLike, *, text: bool = False) -> None:
+        """Отправляет бинарный кадр без копирования и сериализации.
+
+        text=True — отправить готовые UTF-8 байты текстовым кадром (без decode/encode).
+        """
+        if not self._conn:
+            await self.connect()
+        assert self._conn is not None
+        await self._conn.send(data, text=text)
+        logger.info("WebSocket send", extra={"operation": "SEND", "size": len(data)})
+
+    async def receive(self, *, parse_json: bool = False) -> WebSocketMessage:
+        """Следующее сообщение как текст; JSON разбирается только при parse_json=True."""
         if not self._conn:
             await self.connect()
         assert self._conn is not None
@@ -61,13 +91,31 @@ class WebSocketClient:
         # websockets 16+ recv() may return bytes; normalize to str for WebSocketMessage.raw
         if isinstance(raw, bytes):
             raw = raw.decode("utf-8")
-        try:
-            payload = json.loads(raw)
-        except ValueError:
-            payload = None
-        logger.info("WebSocket receive", extra={"raw": raw})
+        payload = None
+        if parse_json:
+            try:
+                payload = json.loads(raw)
+            except ValueError:
+                payload = None
+        logger.info(
+            "WebSocket receive",
+            extra={"operation": "RECEIVE", "raw": raw[:LOG_PREVIEW_CHARS], "size": len(raw)},
+        )
         return WebSocketMessage(raw=raw, json=payload)
 
+    async def receive_raw(self) -> memoryview:
+        """Следующее сообщение как есть: байты кадра без UTF-8 декодирования и разбора JSON.
+
+        Текстовые кадры тоже возвращаются байтами (recv(decode=False)); memoryview
+        позволяет резать заголовок и полезную нагрузку без копирования.
+        """
+        if not self._conn:
+            await self.connect()
+        assert self._conn is not None
+        data = await self._conn.recv(decode=False)
+        logger.info("WebSocket receive", extra={"operation": "RECEIVE", "size": len(data)})
+        return memoryview(data)
+
     async def __aiter__(self) -> AsyncIterator[WebSocketMessage]:
         while True:
             yield await self.receive()
@@ -0,0 +1,324 @@
+"""Нагрузочный стенд fan-out WebSocket streaming-service: /ws/stream/:session_id/:user_id.
+
+На каждую сессию открываются publishers издателей и subscribers подписчиков; все
+соединения всех сессий живут в одном event loop. Издатели отправляют кадры с
+постоянной частотой (по расписанию, как в load.py), каждый кадр несёт заголовок
+``fo|<publisher>|<seq>|<send_ns>|`` и дополняется до payload_bytes. Подписчики
+разбирают заголовок и считают:
+
+- задержку доставки (send -> receive, часы perf_counter одного процесса);
+- потери: ожидается каждый кадр каждого издателя своей сессии;
+- дубликаты и нарушения порядка (seq меньше уже полученного от того же издателя).
+
+Кадры собираются и читаются как байты (``send_bytes`` / ``receive_raw``): подписчик
+разбирает только заголовок через memoryview, не декодируя и не копируя полезную
+нагрузку, — клиент не становится узким местом на кадрах в сотни килобайт.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, Set, Union
+
+from .hdr_histogram import LatencyHistogram
+from .load import PERCENTILES
+from .logging_utils import get_logger
+from .ws_client import WebSocketClient
+
+logger = get_logger(__name__)
+
+FRAME_PREFIX = b"fo"
+# Заголовок fo|<publisher>|<seq>|<send_ns>| заведомо короче — разбирается только этот срез
+FRAME_HEADER_MAX = 64
+# Запас к payload_bytes для max_size соединения (заголовок и служебные обёртки сервиса)
+FRAME_SIZE_SLACK = 4096
+
+
+def encode_frame(publisher: int, seq: int, payload_bytes: int) -> bytes:
+    """Кадр с заголовком и отметкой времени отправки, дополненный до payload_bytes."""
+    header = b"|".join(
+        (FRAME_PREFIX, b"%d" % publisher, b"%d" % seq, b"%d" % time.perf_counter_ns(), b"")
+    )
+    return header + b"x" * max(payload_bytes - len(header), 0)
+
+
+def decode_frame(frame: Union[bytes, memoryview]) -> Optional[tuple[int, int, int]]:
+    """(publisher, seq, send_ns) или None для чужих сообщений (служебные события сервиса)."""
+    parts = bytes(frame[:FRAME_HEADER_MAX]).split(b"|", 4)
+    if len(parts) < 5 or parts[0] != FRAME_PREFIX:
+        return None
+    try:
+        return int(parts[1]), int(parts[2]), int(parts[3])
+    except ValueError:
+        return None
+
+
+@dataclass(frozen=True)
+class FanoutConfig:
+    sessions: int = 10
+    publishers_per_session: int = 1
+    subscribers_per_session: int = 3
+    frames_per_publisher: int = 100
+    frame_rate: float = 25.0  # кадров в секунду на издателя
+    payload_bytes: int = 1024
+    # Бинарные кадры (как видеокадры); False — те же байты текстовыми кадрами
+    binary: bool = False
+    # Одновременных handshake при подключении (не перегружаем accept-очередь сервиса)
+    connect_concurrency: int = 50
+    # Сколько ждать недошедшие кадры после отправки последнего
+    drain_timeout: float = 5.0
+
+    @property
+    def expected_per_subscriber(self) -> int:
+        return self.publishers_per_session * self.frames_per_publisher
+
+
+@dataclass
+class SubscriberStats:
+    session_id: str
+    user_id: str
+    expected: int
+    received: int = 0
+    duplicates: int = 0
+    reordered: int = 0
+    _last_seq: Dict[int, int] = field(default_factory=dict, repr=False)
+    _seen: Set[tuple[int, int]] = field(default_factory=set, repr=False)
+
+    @property
+    def dropped(self) -> int:
+        return max(self.expected - len(self._seen), 0)
+
+    @property
+    def complete(self) -> bool:
+        return len(self._seen) >= self.expected
+
+    def observe(self, publisher: int, seq: int) -> bool:
+        """Учитывает кадр; False для дубликата."""
+        self.received += 1
+        key = (publisher, seq)
+        if key in self._seen:
+            self.duplicates += 1
+            return False
+        self._seen.add(key)
+        if seq < self._last_seq.get(publisher, -1):
+            self.reordered += 1
+        else:
+            self._last_seq[publisher] = seq
+        return True
+
+
+@dataclass
+class FanoutReport:
+    config: FanoutConfig
+    frames_sent: int
+    duration_seconds: float
+    latency: LatencyHistogram
+    subscribers: List[SubscriberStats]
+    connect_failures: int = 0
+
+    @property
+    def frames_delivered(self) -> int:
+        return self.latency.total_count
+
+    @property
+    def frames_per_second(self) -> float:
+        return self.frames_delivered / self.duration_seconds if self.duration_seconds else 0.0
+
+    @property
+    def dropped(self) -> int:
+        return sum(s.dropped for s in self.subscribers)
+
+    @property
+    def reordered(self) -> int:
+        return sum(s.reordered for s in self.subscribers)
+
+    @property
+    def duplicates(self) -> int:
+        return sum(s.duplicates for s in self.subscribers)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "sessions": self.config.sessions,
+            "publishers_per_session": self.config.publishers_per_session,
+            "subscribers_per_session": self.config.subscribers_per_session,
+            "payload_bytes": self.config.payload_bytes,
+            "binary": self.config.binary,
+            "frames_sent": self.frames_sent,
+            "frames_delivered": self.frames_delivered,
+            "frames_per_second": round(self.frames_per_second, 1),
+            "dropped": self.dropped,
+            "reordered": self.reordered,
+            "duplicates": self.duplicates,
+            "connect_failures": self.connect_failures,
+            "duration_seconds": round(self.duration_seconds, 3),
+            "latency_ms": self.latency.summary(PERCENTILES),
+            "incomplete_subscribers": [
+                {
+                    "session_id": s.session_id,
+                    "user_id": s.user_id,
+                    "dropped": s.dropped,
+                    "reordered": s.reordered,
+                }
+                for s in self.subscribers
+                if not s.complete or s.reordered
+            ],
+        }
+
+    def format_table(self) -> str:
+        summary = self.latency.summary(PERCENTILES)
+        pct = "  ".join(f"p{p:g}={summary[f'p{p:g}_ms']:.1f}ms" for p in PERCENTILES)
+        return (
+            f"sessions={self.config.sessions} publishers={self.config.publishers_per_session} "
+            f"subscribers={self.config.subscribers_per_session} "
+            f"payload={self.config.payload_bytes}B\n"
+            f"sent={self.frames_sent} delivered={self.frames_delivered} "
+            f"fps={self.frames_per_second:.1f} dropped={self.dropped} "
+            f"reordered={self.reordered} duplicates={self.duplicates} "
+            f"connect_failures={self.connect_failures}\n"
+            f"latency: {pct}  max={summary['max_ms']:.1f}ms"
+        )
+
+
+class WebSocketFanoutHarness:
+    """Открывает издателей и подписчиков по сессиям и гоняет через них кадры.
+
+    session_factory создаёт сессию streaming-service и возвращает (session_id,
+    owner_user_id) — владелец сессии становится первым издателем. Синхронные
+    вызовы REST-клиента выполняются в потоке (asyncio.to_thread).
+    """
+
+    def __init__(
+        self,
+        ws_base_url: str,
+        session_factory: Callable[[], tuple[str, str]],
+        config: FanoutConfig,
+    ) -> None:
+        self.ws_base_url = ws_base_url.rstrip("/")
+        self.session_factory = session_factory
+        self.config = config
+        self._latency = LatencyHistogram()
+        self._subscribers: List[SubscriberStats] = []
+        self._frames_sent = 0
+        self._connect_failures = 0
+        self._all_delivered = asyncio.Event()
+        self._pending_subscribers = 0
+
+    def _url(self, session_id: str, user_id: str) -> str:
+        return f"{self.ws_base_url}/ws/stream/{session_id}/{user_id}"
+
+    def _client(self, session_id: str, user_id: str) -> WebSocketClient:
+        return WebSocketClient(
+            url=self._url(session_id, user_id),
+            max_message_bytes=max(self.config.payload_bytes + FRAME_SIZE_SLACK, 1 << 20),
+        )
+
+    async def _connect(self, semaphore: asyncio.Semaphore, ws: WebSocketClient) -> bool:
+        async with semaphore:
+            try:
+                await ws.connect()
+                return True
+            except Exception as exc:
+                self._connect_failures += 1
+                logger.warning("Fan-out connect failed", extra={"url": ws.url, "error": repr(exc)})
+                return False
+
+    async def _publish(self, ws: WebSocketClient, publisher: int, origin: float) -> None:
+        interval = 1.0 / self.config.frame_rate
+        for seq in range(self.config.frames_per_publisher):
+            delay = origin + seq * interval - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            frame = encode_frame(publisher, seq, self.config.payload_bytes)
+            await ws.send_bytes(frame, text=not self.config.binary)
+            self._frames_sent += 1
+
+    async def _drain(self, ws: WebSocketClient) -> None:
+        # Издатель тоже получает кадры других издателей: читаем, чтобы не упереться в backpressure
+        while True:
+            await ws.receive_raw()
+
+    async def _subscribe(self, ws: WebSocketClient, stats: SubscriberStats) -> None:
+        while not stats.complete:
+            frame = await ws.receive_raw()
+            received_ns = time.perf_counter_ns()
+            decoded = decode_frame(frame)
+            if decoded is None:
+                continue
+            publisher, seq, sent_ns = decoded
+            if stats.observe(publisher, seq):
+                self._latency.record((received_ns - sent_ns) / 1e9)
+        self._pending_subscribers -= 1
+        if self._pending_subscribers == 0:
+            self._all_delivered.set()
+
+    async def run(self) -> FanoutReport:
+        cfg = self.config
+        sessions: List[tuple[str, str]] = list(
+            await asyncio.gather(
+                *(asyncio.to_thread(self.session_factory) for _ in range(cfg.sessions))
+            )
+        )
+        semaphore = asyncio.Semaphore(cfg.connect_concurrency)
+        publishers: List[tuple[WebSocketClient, int]] = []
+        subscribers: List[tuple[WebSocketClient, SubscriberStats]] = []
+        for session_id, owner_id in sessions:
+            for p in range(cfg.publishers_per_session):
+                user_id = owner_id if p == 0 else str(uuid.uuid4())
+                publishers.append((self._client(session_id, user_id), p))
+            for _ in range(cfg.subscribers_per_session):
+                user_id = str(uuid.uuid4())
+                stats = SubscriberStats(session_id, user_id, cfg.expected_per_subscriber)
+                subscribers.append((self._client(session_id, user_id), stats))
+
+        all_ws = [ws for ws, _ in publishers] + [ws for ws, _ in subscribers]
+        connected = await asyncio.gather(*(self._connect(semaphore, ws) for ws in all_ws))
+        logger.info(
+            "Fan-out connected",
+            extra={"connections": len(all_ws), "failed": connected.count(False)},
+        )
+        split = len(publishers)
+        live_publishers = [pub for pub, ok in zip(publishers, connected[:split]) if ok]
+        live_subscribers = [sub for sub, ok in zip(subscribers, connected[split:]) if ok]
+
+        self._subscribers = [s for _, s in subscribers]
+        self._pending_subscribers = len(live_subscribers)
+        tasks: List[asyncio.Task[None]] = [
+            *(asyncio.create_task(self._subscribe(ws, s)) for ws, s in live_subscribers),
+            *(asyncio.create_task(self._drain(ws)) for ws, _ in live_publishers),
+        ]
+
+        try:
+            started = time.perf_counter()
+            await asyncio.gather(*(self._publish(ws, p, started) for ws, p in live_publishers))
+            if self._pending_subscribers:
+                try:
+                    await asyncio.wait_for(self._all_delivered.wait(), cfg.drain_timeout)
+                except asyncio.TimeoutError:
+                    pass
+            duration = time.perf_counter() - started
+        finally:
+            await cancel_and_close(tasks, all_ws)
+
+        report = FanoutReport(
+            config=cfg,
+            frames_sent=self._frames_sent,
+            duration_seconds=duration,
+            latency=self._latency,
+            subscribers=self._subscribers,
+            connect_failures=self._connect_failures,
+        )
+        logger.info("Fan-out run finished", extra={"report": report.to_dict()})
+        return report
+
+
+async def cancel_and_close(
+    tasks: Sequence[asyncio.Task[None]], connections: Sequence[WebSocketClient]
+) -> None:
+    """Отменяет задачи чтения и закрывает соединения; ошибки закрытия не пробрасываются."""
+    for task in tasks:
+        task.cancel()
+    closers: List[Awaitable[Any]] = [*tasks, *(ws.close() for ws in connections)]
+    await asyncio.gather(*closers, return_exceptions=True)
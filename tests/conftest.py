@@ -2,11 +2,11 @@
 
 from __future__ import annotations
 
-import time
-
 import pytest
 import requests
 
+from qa_tests.readiness import format_readiness_report, services_for_items, wait_until_ready
+
 
 def pytest_collection_finish(session: pytest.Session) -> None:
     """
@@ -101,131 +101,35 @@ def pytest_collection_finish(session: pytest.Session) -> None:
     )
 
 
-def _only_streaming_tests_collected(session: pytest.Session) -> bool:
-    """True, если в сессии собраны только тесты из test_streaming_*.py."""
-    if not session.items:
-        return False
-    return all("test_streaming" in (getattr(item, "nodeid", "") or "") for item in session.items)
-
-
-def _only_operator_directory_tests_collected(session: pytest.Session) -> bool:
-    """True, если в сессии только тесты из test_operator_directory_*.py."""
-    if not session.items:
-        return False
-    return all(
-        "test_operator_directory" in (getattr(item, "nodeid", "") or "") for item in session.items
-    )
-
-
-def _only_operator_pool_tests_collected(session: pytest.Session) -> bool:
-    """True, если в сессии только тесты из test_operator_pool_*.py."""
-    if not session.items:
-        return False
-    return all(
-        "test_operator_pool" in (getattr(item, "nodeid", "") or "") for item in session.items
-    )
-
-
-def _only_notification_tests_collected(session: pytest.Session) -> bool:
-    """True, если в сессии только тесты из test_notification_*.py."""
-    if not session.items:
-        return False
-    return all("test_notification" in (getattr(item, "nodeid", "") or "") for item in session.items)
-
-
-def _only_search_tests_collected(session: pytest.Session) -> bool:
-    """True, если в сессии только тесты из test_search_*.py."""
-    if not session.items:
-        return False
-    return all("test_search" in (getattr(item, "nodeid", "") or "") for item in session.items)
-
-
-def _only_ticket_tests_collected(session: pytest.Session) -> bool:
-    """True, если в сессии только тесты из test_ticket_*.py."""
-    if not session.items:
-        return False
-    return all("test_ticket" in (getattr(item, "nodeid", "") or "") for item in session.items)
-
-
-def _only_data_channel_tests_collected(session: pytest.Session) -> bool:
-    """True, если в сессии только тесты из test_data_channel_*.py."""
-    if not session.items:
-        return False
-    return all("test_data_channel" in (getattr(item, "nodeid", "") or "") for item in session.items)
-
-
-def _only_session_manager_tests_collected(session: pytest.Session) -> bool:
-    """True, если в сессии только тесты из test_session_manager_*.py."""
-    if not session.items:
-        return False
-    return all(
-        "test_session_manager" in (getattr(item, "nodeid", "") or "") for item in session.items
-    )
+_READINESS_KEY = pytest.StashKey[str]()
 
 
 @pytest.fixture(scope="session", autouse=True)
 def wait_for_services(settings, request: pytest.FixtureRequest) -> None:
     """
-    Проверяет доступность сервисов по настроенным URL (сервисы уже запущены).
-    Если только тесты Streaming / Operator Directory / Operator Pool /
-    Notification / Search / Ticket / Data Channel / Session Manager —
-    проверяется этот сервис; иначе — API Gateway.
+    Проверяет готовность сервисов по настроенным URL (сервисы уже запущены).
+    Опрашиваются одновременно все сервисы, клиентские фикстуры которых используют
+    собранные тесты (/health, затем /ready); без клиентских фикстур — API Gateway.
     Не поднимает Docker — для локального прогона запустите нужные сервисы вручную
     или используйте: make test-with-docker.
     """
-    session = request.session
-    if _only_session_manager_tests_collected(session):
-        base_url = settings.session_manager_service.base_url.rstrip("/")
-        service_name = "Session Manager Service"
-        hint = "Запустите session-manager-service вручную или: make test-with-docker"
-    elif _only_data_channel_tests_collected(session):
-        base_url = settings.data_channel_service.base_url.rstrip("/")
-        service_name = "Data Channel Service"
-        hint = "Запустите data-channel-service вручную или: make test-with-docker"
-    elif _only_ticket_tests_collected(session):
-        base_url = settings.ticket_service.base_url.rstrip("/")
-        service_name = "Ticket Service"
-        hint = "Запустите ticket-service вручную или: make test-with-docker"
-    elif _only_search_tests_collected(session):
-        base_url = settings.search_service.base_url.rstrip("/")
-        service_name = "Search Service"
-        hint = "Запустите search-service вручную или: make test-with-docker"
-    elif _only_notification_tests_collected(session):
-        base_url = settings.notification_service.base_url.rstrip("/")
-        service_name = "Notification Service"
-        hint = "Запустите notification-service вручную или: make test-with-docker"
-    elif _only_operator_pool_tests_collected(session):
-        base_url = settings.operator_pool_service.base_url.rstrip("/")
-        service_name = "Operator Pool Service"
-        hint = "Запустите operator-pool-service вручную или: make test-with-docker"
-    elif _only_operator_directory_tests_collected(session):
-        base_url = settings.operator_directory_service.base_url.rstrip("/")
-        service_name = "Operator Directory Service"
-        hint = "Запустите operator-directory-service вручную или: make test-with-docker"
-    elif _only_streaming_tests_collected(session):
-        base_url = settings.streaming_service.base_url.rstrip("/")
-        service_name = "Streaming Service"
-        hint = "Запустите streaming-service вручную или выполните: make test-with-docker"
-    else:
-        base_url = settings.api_gateway.base_url.rstrip("/")
-        service_name = "API Gateway"
-        hint = "Запустите api-gateway и user-service вручную или выполните: make test-with-docker"
-
-    health_url = f"{base_url}/health"
-    timeout_sec = 30.0
-    pause_sec = 2.0
-    deadline = time.monotonic() + timeout_sec
-
-    while time.monotonic() < deadline:
-        try:
-            resp = requests.get(health_url, timeout=3)
-            if resp.status_code == 200:
-                return
-        except Exception:
-            pass
-        time.sleep(pause_sec)
-
-    pytest.exit(
-        f"{service_name} недоступен по адресу {health_url}. {hint}",
-        returncode=2,
-    )
+    targets = services_for_items(request.session.items, settings)
+    results = wait_until_ready(targets, timeout=settings.service_ready_timeout_seconds)
+    report = format_readiness_report(results)
+    request.config.stash[_READINESS_KEY] = report
+
+    not_ready = [r for r in results if not r.ready]
+    if not_ready:
+        messages = [
+            f"{r.target.display_name} недоступен по адресу {r.target.base_url}/health. "
+            f"{r.target.hint}"
+            for r in not_ready
+        ]
+        pytest.exit("\n".join([*messages, "", report]), returncode=2)
+
+
+def pytest_terminal_summary(terminalreporter, exitstatus: int, config: pytest.Config) -> None:
+    report = config.stash.get(_READINESS_KEY, None)
+    if report:
+        terminalreporter.write_sep("-", "service readiness (time to ready)")
+        terminalreporter.write_line(report)
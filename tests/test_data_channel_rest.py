@@ -37,6 +37,16 @@ def test_get_history_with_limit(
     assert isinstance(resp.json["messages"], list)
 
 
+@pytest.mark.smoke
+def test_iter_history_empty(
+    data_channel_service_client: DataChannelServiceClient,
+) -> None:
+    """Потоковое чтение истории новой сессии: 200 и ни одного сообщения."""
+    with data_channel_service_client.iter_history(str(uuid.uuid4()), limit=10) as messages:
+        assert messages.status_code == 200
+        assert list(messages) == []
+
+
 @pytest.mark.negative
 def test_get_history_invalid_session_id(
     data_channel_service_client: DataChannelServiceClient,
@@ -0,0 +1,44 @@
+"""Нагрузочный сценарий data-channel-service: пропускная способность POST /data/file."""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import allure
+import pytest
+
+from qa_tests.allure_utils import allure_step, attach_json, attach_text, mark_feature, mark_story
+from qa_tests.http_client import DataChannelServiceClient
+from qa_tests.metrics import measure_test_case
+from qa_tests.upload_bench import UploadBenchConfig, UploadBenchmark
+
+
+@pytest.mark.load
+@allure.tag("data-channel", "upload", "load")
+def test_data_channel_upload_throughput(
+    data_channel_service_client: DataChannelServiceClient, settings, tmp_path: Path
+) -> None:
+    """Матрица размер × параллельность: MB/s, TTFB и время приёма файла сервисом."""
+    mark_feature("Data channel")
+    mark_story("Пропускная способность загрузки файлов")
+
+    load_cfg = settings.load
+    config = UploadBenchConfig(
+        sizes_mb=load_cfg.upload_sizes_mb,
+        concurrency=load_cfg.upload_concurrency,
+        repeats=load_cfg.upload_repeats,
+        sessions=load_cfg.upload_sessions,
+        chunk_size=load_cfg.upload_chunk_kb * 1024,
+    )
+
+    with measure_test_case("test_data_channel_upload_throughput"):
+        with allure_step(
+            f"Загрузка: размеры {list(config.sizes_mb)} MB × параллельность "
+            f"{list(config.concurrency)}"
+        ):
+            report = UploadBenchmark(data_channel_service_client, config, tmp_path).run()
+            attach_text("upload_benchmark", report.format_table())
+            attach_json("upload_benchmark_json", json.dumps(report.to_dict(), indent=2))
+
+    assert report.failures == 0, "Часть загрузок не удалась:\n" + report.format_table()
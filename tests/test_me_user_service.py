@@ -7,7 +7,6 @@ import json
 import allure
 import pytest
 
-from qa_tests import data_factory
 from qa_tests.allure_utils import (
     allure_step,
     attach_json,
@@ -18,11 +17,14 @@ from qa_tests.allure_utils import (
 )
 from qa_tests.http_client import ApiGatewayClient
 from qa_tests.metrics import measure_test_case
+from qa_tests.user_pool import PooledUser
 
 
 @pytest.mark.smoke
 @allure.tag("me", "user-service")
-def test_get_me_authenticated(api_gateway_client: ApiGatewayClient) -> None:
+def test_get_me_authenticated(
+    api_gateway_client: ApiGatewayClient, pooled_user: PooledUser
+) -> None:
     """GET /users/me с валидным токеном возвращает данные пользователя."""
     mark_feature("User Management")
     mark_story("Текущий пользователь (me)")
@@ -30,23 +32,14 @@ def test_get_me_authenticated(api_gateway_client: ApiGatewayClient) -> None:
     link_jira("PSDS-102")
 
     with measure_test_case("test_get_me_authenticated"):
-        with allure_step("Регистрация и логин"):
-            payload = data_factory.build_user_registration()
-            api_gateway_client.register_user(payload)
-            auth_resp = api_gateway_client.authenticate(
-                {"email": payload["email"], "password": payload["password"]}
-            )
-            assert auth_resp.status_code == 200 and auth_resp.json
-            token = auth_resp.json.get("accessToken") or auth_resp.json.get("access_token")
-
         with allure_step("Запрос GET /users/me"):
-            resp = api_gateway_client.get_me(token)
+            resp = api_gateway_client.get_me(pooled_user.access_token)
             attach_json("me_response", json.dumps(resp.json or {}, ensure_ascii=False, indent=2))
 
         assert resp.status_code == 200
         assert resp.json
         assert resp.json.get("id") or resp.json.get("email")
-        assert resp.json.get("email") == payload["email"]
+        assert resp.json.get("email") == pooled_user.email
 
 
 @pytest.mark.negative
@@ -69,7 +62,9 @@ def test_get_me_unauthorized(api_gateway_client: ApiGatewayClient) -> None:
 
 @pytest.mark.smoke
 @allure.tag("me", "user-service")
-def test_update_me_authenticated_returns_200(api_gateway_client: ApiGatewayClient) -> None:
+def test_update_me_authenticated_returns_200(
+    api_gateway_client: ApiGatewayClient, pooled_user: PooledUser
+) -> None:
     """PUT /users/me с валидным токеном обновляет профиль (One Behavior Per Test: 200 only)."""
     mark_feature("User Management")
     mark_story("Обновление профиля (me)")
@@ -77,14 +72,9 @@ def test_update_me_authenticated_returns_200(api_gateway_client: ApiGatewayClien
     link_jira("PSDS-103")
 
     with measure_test_case("test_update_me_authenticated_returns_200"):
-        with allure_step("Регистрация и логин"):
-            payload = data_factory.build_user_registration()
-            api_gateway_client.register_user(payload)
-            auth_resp = api_gateway_client.authenticate(
-                {"email": payload["email"], "password": payload["password"]}
-            )
-            assert auth_resp.status_code == 200 and auth_resp.json
-            token = auth_resp.json.get("accessToken") or auth_resp.json.get("access_token")
+        token = pooled_user.access_token
+        # Профиль меняется — пользователь не возвращается в пул
+        pooled_user.retire()
 
         with allure_step("Получение текущего профиля для полного payload"):
             me_resp = api_gateway_client.get_me(token)
@@ -149,7 +139,9 @@ def test_update_me_unauthorized(api_gateway_client: ApiGatewayClient) -> None:
 
 @pytest.mark.negative
 @allure.tag("me", "user-service")
-def test_update_me_invalid_status(api_gateway_client: ApiGatewayClient) -> None:
+def test_update_me_invalid_status(
+    api_gateway_client: ApiGatewayClient, pooled_user: PooledUser
+) -> None:
     """PUT /users/me с недопустимым status возвращает 400."""
     mark_feature("User Management")
     mark_story("Валидация обновления me")
@@ -157,12 +149,9 @@ def test_update_me_invalid_status(api_gateway_client: ApiGatewayClient) -> None:
     link_jira("PSDS-401")
 
     with measure_test_case("test_update_me_invalid_status"):
-        payload = data_factory.build_user_registration()
-        api_gateway_client.register_user(payload)
-        auth_resp = api_gateway_client.authenticate(
-            {"email": payload["email"], "password": payload["password"]}
-        )
-        token = auth_resp.json.get("accessToken") or auth_resp.json.get("access_token")
+        token = pooled_user.access_token
+        # При 500 часть полей могла сохраниться — пользователь не возвращается в пул
+        pooled_user.retire()
         me_resp = api_gateway_client.get_me(token)
         assert me_resp.status_code == 200 and me_resp.json
         me = me_resp.json
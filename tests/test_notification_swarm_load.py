@@ -0,0 +1,65 @@
+"""Нагрузочный сценарий notification-service: рой подписчиков /ws/notify и пачки уведомлений."""
+
+from __future__ import annotations
+
+import json
+from typing import AsyncIterator
+
+import allure
+import pytest
+
+from qa_tests.allure_utils import allure_step, attach_json, attach_text, mark_feature, mark_story
+from qa_tests.async_http_client import AsyncNotificationServiceClient
+from qa_tests.metrics import measure_test_case
+from qa_tests.notify_swarm import NotificationSwarm, SwarmConfig
+
+# Допустимая доля недоставленных событий за прогон
+MAX_DROP_RATE = 0.001
+
+
+@pytest.fixture
+async def notify_client(settings) -> AsyncIterator[AsyncNotificationServiceClient]:
+    """Асинхронный клиент с пулом соединений на все одновременные notify_session."""
+    client = AsyncNotificationServiceClient(
+        base_url=settings.notification_service.base_url,
+        pool_size=max(settings.notification_service.pool_size, SwarmConfig().notify_concurrency),
+    )
+    yield client
+    await client.aclose()
+
+
+@pytest.mark.load
+@pytest.mark.asyncio
+@allure.tag("notification", "websocket", "load")
+async def test_notification_swarm_delivery(
+    notify_client: AsyncNotificationServiceClient, settings
+) -> None:
+    """LOAD_NOTIFY_SUBSCRIBERS сокетов простаивают, затем получают пачки notify_session."""
+    mark_feature("Notifications")
+    mark_story("Fan-out уведомлений на рой подписчиков")
+
+    load_cfg = settings.load
+    config = SwarmConfig(
+        subscribers=load_cfg.notify_subscribers,
+        sessions=load_cfg.notify_sessions,
+        bursts=load_cfg.notify_bursts,
+        events_per_burst=load_cfg.notify_events_per_burst,
+        idle_seconds=load_cfg.notify_idle_seconds,
+    )
+
+    with measure_test_case("test_notification_swarm_delivery"):
+        swarm = NotificationSwarm(settings.notification_ws.base_url, notify_client, config)
+        with allure_step(
+            f"Рой: {config.subscribers} подписчиков, {config.sessions} сессий, "
+            f"{config.bursts}×{config.events_per_burst} событий"
+        ):
+            report = await swarm.run()
+            attach_text("swarm_report", report.format_table())
+            attach_json("swarm_report_json", json.dumps(report.to_dict(), indent=2))
+
+    expected = config.expected_per_subscriber * report.connected
+    assert report.connect_failures == 0, f"Не удалось подключиться: {report.connect_failures}"
+    assert report.notify_failures == 0, f"Ошибки notify_session: {report.notify_failures}"
+    assert (
+        report.dropped <= expected * MAX_DROP_RATE
+    ), f"Не доставлено событий: {report.dropped} из {expected}"
@@ -63,7 +63,7 @@ async def test_notification_websocket_receive_broadcast(
         assert notify_resp.status_code == 200
 
         # Ждём сообщение через WebSocket
-        msg = await asyncio.wait_for(ws.receive(), timeout=3.0)
+        msg = await asyncio.wait_for(ws.receive(parse_json=True), timeout=3.0)
         assert msg.raw is not None
         if msg.json:
             assert "event" in msg.json
@@ -0,0 +1,58 @@
+"""Нагрузочный сценарий operator-pool-service: одновременные GET /operator/next."""
+
+from __future__ import annotations
+
+import json
+from typing import Iterator
+
+import allure
+import pytest
+
+from qa_tests.allure_utils import allure_step, attach_json, attach_text, mark_feature, mark_story
+from qa_tests.http_client import OperatorPoolServiceClient
+from qa_tests.metrics import measure_test_case
+from qa_tests.operator_pool_bench import OperatorPoolBenchConfig, OperatorPoolBenchmark
+
+
+@pytest.fixture
+def contention_client(settings) -> Iterator[OperatorPoolServiceClient]:
+    """Клиент с пулом соединений на всех одновременных вызывающих волны."""
+    client = OperatorPoolServiceClient(
+        base_url=settings.operator_pool_service.base_url,
+        pool_size=max(
+            settings.operator_pool_service.pool_size, settings.load.operator_pool_callers
+        ),
+    )
+    yield client
+    client.close()
+
+
+@pytest.mark.load
+@allure.tag("operator-pool", "load")
+def test_operator_next_contention(contention_client: OperatorPoolServiceClient, settings) -> None:
+    """Волны одновременных GET /operator/next: задержка, справедливость, перегрузка операторов."""
+    mark_feature("Operator pool")
+    mark_story("Конкуренция за следующего оператора")
+    load_cfg = settings.load
+    config = OperatorPoolBenchConfig(
+        operators=load_cfg.operator_pool_operators,
+        max_sessions=load_cfg.operator_pool_max_sessions,
+        callers=load_cfg.operator_pool_callers,
+        waves=load_cfg.operator_pool_waves or None,
+    )
+
+    with measure_test_case("test_operator_next_contention"):
+        with allure_step(
+            f"{config.operators} операторов, волны по {config.callers} одновременных вызовов"
+        ):
+            report = OperatorPoolBenchmark(contention_client, config).run()
+        attach_text("Operator pool contention", report.format_table())
+        attach_json("Operator pool contention json", json.dumps(report.to_dict(), indent=2))
+
+    assert report.errors == 0, report.format_table()
+    over = report.over_assigned()
+    assert not over, (
+        f"{len(over)} операторов получили назначения сверх max_sessions "
+        f"({sum(over.values())} лишних сессий)\n{report.format_table()}"
+    )
+    assert report.premature_not_found() == 0, report.format_table()
@@ -5,10 +5,10 @@ from __future__ import annotations
 import allure
 import pytest
 
-from qa_tests import data_factory
 from qa_tests.allure_utils import allure_step, link_jira, mark_feature, mark_severity, mark_story
 from qa_tests.http_client import ApiGatewayClient
 from qa_tests.metrics import measure_test_case
+from qa_tests.user_pool import UserPool
 
 
 @pytest.mark.smoke
@@ -48,7 +48,9 @@ def test_operators_stats(api_gateway_client: ApiGatewayClient) -> None:
 
 @pytest.mark.smoke
 @allure.tag("operators", "user-service")
-def test_operators_availability_authenticated(api_gateway_client: ApiGatewayClient) -> None:
+def test_operators_availability_authenticated(
+    api_gateway_client: ApiGatewayClient, user_pool: UserPool
+) -> None:
     """PUT /operators/availability с токеном обновляет доступность оператора."""
     mark_feature("Operators")
     mark_story("Обновление доступности оператора")
@@ -56,19 +58,15 @@ def test_operators_availability_authenticated(api_gateway_client: ApiGatewayClie
     link_jira("PSDS-303")
 
     with measure_test_case("test_operators_availability_authenticated"):
-        payload = data_factory.build_user_registration()
-        payload["role"] = "operator"
-        api_gateway_client.register_user(payload)
-        auth_resp = api_gateway_client.authenticate(
-            {"email": payload["email"], "password": payload["password"]}
-        )
-        assert auth_resp.status_code == 200 and auth_resp.json
-        token = auth_resp.json.get("accessToken") or auth_resp.json.get("access_token")
-
-        with allure_step("Установка доступности"):
-            resp = api_gateway_client.operators_availability(token, available=True)
-        assert resp.status_code == 200
-        assert resp.json is not None
+        with user_pool.lease("operator") as operator:
+            # Доступность оператора меняется — пользователь не возвращается в пул
+            operator.retire()
+            with allure_step("Установка доступности"):
+                resp = api_gateway_client.operators_availability(
+                    operator.access_token, available=True
+                )
+            assert resp.status_code == 200
+            assert resp.json is not None
 
 
 @pytest.mark.negative
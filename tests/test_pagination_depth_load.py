@@ -0,0 +1,68 @@
+"""Нагрузочный сценарий: задержка страниц list-эндпоинтов в зависимости от глубины offset."""
+
+from __future__ import annotations
+
+import json
+
+import allure
+import pytest
+
+from qa_tests.allure_utils import allure_step, attach_json, attach_text, mark_feature, mark_story
+from qa_tests.http_client import OperatorDirectoryServiceClient, TicketServiceClient
+from qa_tests.metrics import measure_test_case
+from qa_tests.pagination import PageScanner, scan_operators, scan_tickets
+
+# Во сколько раз медиана самых глубоких страниц может превышать медиану первых
+MAX_DEPTH_SLOWDOWN = 5.0
+
+
+def _walk(scanner: PageScanner, title: str) -> None:
+    with allure_step(title):
+        ids = [item.get("id") for item in scanner if isinstance(item, dict)]
+        profile = scanner.depth_profile()
+        attach_text(f"{scanner.name} depth profile", profile.format_table())
+        attach_json(f"{scanner.name} depth profile json", json.dumps(profile.to_dict(), indent=2))
+    assert all(page.status_code == 200 for page in scanner.pages), [
+        (page.offset, page.status_code) for page in scanner.pages if page.status_code != 200
+    ]
+    # Набор данных на время нагрузочного прогона не меняется — сдвигов offset нет
+    repeated = len(ids) - len(set(ids))
+    assert not repeated, f"{scanner.name}: {repeated} элементов повторяются на разных страницах"
+    slowdown = profile.slowdown
+    assert (
+        slowdown is None or slowdown <= MAX_DEPTH_SLOWDOWN
+    ), f"{scanner.name}: задержка растёт с offset в {slowdown:.1f} раз\n{profile.format_table()}"
+
+
+@pytest.mark.load
+@allure.tag("tickets", "pagination", "load")
+def test_ticket_list_depth_latency(ticket_service_client: TicketServiceClient, settings) -> None:
+    """GET /api/v1/tickets: обход всех страниц, задержка по порядкам offset."""
+    mark_feature("Tickets")
+    mark_story("Пагинация на глубоких offset")
+    load_cfg = settings.load
+    scanner = scan_tickets(
+        ticket_service_client,
+        page_size=load_cfg.pagination_page_size,
+        max_pages=load_cfg.pagination_max_pages,
+    )
+    with measure_test_case("test_ticket_list_depth_latency"):
+        _walk(scanner, f"Обход тикетов страницами по {scanner.page_size}")
+
+
+@pytest.mark.load
+@allure.tag("operators", "pagination", "load")
+def test_operator_list_depth_latency(
+    operator_directory_service_client: OperatorDirectoryServiceClient, settings
+) -> None:
+    """GET /api/v1/operators: обход всех страниц, задержка по порядкам offset."""
+    mark_feature("Operators")
+    mark_story("Пагинация на глубоких offset")
+    load_cfg = settings.load
+    scanner = scan_operators(
+        operator_directory_service_client,
+        page_size=load_cfg.pagination_page_size,
+        max_pages=load_cfg.pagination_max_pages,
+    )
+    with measure_test_case("test_operator_list_depth_latency"):
+        _walk(scanner, f"Обход операторов страницами по {scanner.page_size}")
@@ -0,0 +1,97 @@
+"""Нагрузочная характеризация rate limiter'а API Gateway: лимит, burst и точность Retry-After."""
+
+from __future__ import annotations
+
+import json
+from typing import Iterator, List
+
+import allure
+import pytest
+
+from qa_tests.allure_utils import allure_step, attach_json, attach_text, mark_feature, mark_story
+from qa_tests.http_client import ApiGatewayClient
+from qa_tests.metrics import measure_test_case
+from qa_tests.rate_limit_bench import RateLimitBenchConfig, RateLimitBenchmark
+from qa_tests.user_pool import PooledUser, UserPool
+
+# Допуск измеренных пополнения и ёмкости бакета относительно настроенной квоты
+QUOTA_TOLERANCE = 0.2
+# Запрос ровно через Retry-After может прийти чуть раньше пополнения — запас на опрос и RTT
+RETRY_AFTER_SLACK_SECONDS = 0.25
+
+
+@pytest.fixture
+def limiter_client(settings) -> Iterator[ApiGatewayClient]:
+    """Клиент gateway с пулом соединений на все одновременные вызовы бенчмарка."""
+    config = RateLimitBenchConfig()
+    client = ApiGatewayClient(
+        base_url=settings.api_gateway.base_url,
+        api_paths=settings.api_paths,
+        pool_size=max(settings.api_gateway.pool_size, config.max_in_flight),
+    )
+    yield client
+    client.close()
+
+
+@pytest.fixture
+def limiter_users(user_pool: UserPool, settings) -> Iterator[List[PooledUser]]:
+    """Пользователи-токены бенчмарка; после прогона их бакеты пусты — в пул не возвращаются."""
+    users = [user_pool.acquire("client") for _ in range(settings.load.rate_limit_tokens)]
+    yield users
+    for user in users:
+        user.retire()
+        user_pool.release(user)
+
+
+@pytest.mark.load
+@allure.tag("gateway", "rate-limiting", "load")
+def test_rate_limiter_characterization(
+    limiter_client: ApiGatewayClient, limiter_users: List[PooledUser], settings
+) -> None:
+    """Ступени частоты с несколькими токенами: пополнение, burst, граница 429 и Retry-After."""
+    mark_feature("API Gateway")
+    mark_story("Rate limiting: характеризация лимитера")
+    load_cfg = settings.load
+    config = RateLimitBenchConfig(
+        tokens=len(limiter_users),
+        rates=load_cfg.rate_limit_rates,
+        step_seconds=load_cfg.rate_limit_step_seconds,
+        burst_requests=load_cfg.rate_limit_burst_requests,
+        cooldown_seconds=load_cfg.rate_limit_cooldown_seconds,
+    )
+
+    probe = limiter_client.rate_limited_endpoint(limiter_users[0].access_token)
+    if probe.status_code == 404:
+        pytest.skip("API Gateway не реализует эндпоинт rate limiting (404) — тест пропущен.")
+
+    with measure_test_case("test_rate_limiter_characterization"):
+        with allure_step(
+            f"{config.tokens} токенов, ступени {list(config.rates)} rps на токен "
+            f"по {config.step_seconds}s"
+        ):
+            tokens = [user.access_token for user in limiter_users]
+            report = RateLimitBenchmark(limiter_client, tokens, config).run()
+        attach_text("Rate limiter characterization", report.format_table())
+        attach_json("Rate limiter characterization json", json.dumps(report.to_dict(), indent=2))
+
+    assert report.errors == 0, report.format_table()
+    assert report.limited_steps(), (
+        f"Ни одна ступень до {max(config.rates)} rps на токен не получила 429\n"
+        f"{report.format_table()}"
+    )
+    problems = report.mismatches(
+        settings.rate_limit_expected_rps, settings.rate_limit_expected_burst, QUOTA_TOLERANCE
+    )
+    assert not problems, "\n".join([*problems, report.format_table()])
+    assert report.missing_retry_after == 0, report.format_table()
+    late = [
+        c
+        for c in report.retry_checks
+        if c.limited
+        and (
+            c.actual is None
+            or c.advertised is None
+            or c.actual > c.advertised + RETRY_AFTER_SLACK_SECONDS
+        )
+    ]
+    assert not late, f"Retry-After занижен или не соблюдается: {late}\n{report.format_table()}"
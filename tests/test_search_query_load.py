@@ -0,0 +1,57 @@
+"""Нагрузочный сценарий: задержка поиска по размеру индекса, классу запроса и limit."""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import allure
+import pytest
+
+from qa_tests.allure_utils import allure_step, attach_json, attach_text, mark_feature, mark_story
+from qa_tests.http_client import SearchServiceClient
+from qa_tests.metrics import measure_test_case
+from qa_tests.search_bench import SearchBenchConfig, SearchBenchmark
+from qa_tests.seeding import SeedManifest
+
+# Во сколько раз p95 на наибольшем индексе может превышать p95 на наименьшем
+MAX_INDEX_SLOWDOWN = 10.0
+
+
+@pytest.mark.load
+@allure.tag("search", "load")
+def test_search_query_latency_matrix(
+    search_service_client: SearchServiceClient, settings, tmp_path: Path
+) -> None:
+    """GET /search/*?q=...: матрица сегмент × размер индекса × класс запроса × limit."""
+    mark_feature("Search")
+    mark_story("Задержка поиска в зависимости от запроса и размера индекса")
+    load_cfg = settings.load
+    config = SearchBenchConfig(
+        index_sizes=load_cfg.search_index_sizes,
+        limits=load_cfg.search_limits,
+        queries=load_cfg.search_queries,
+        concurrency=load_cfg.search_concurrency,
+    )
+    manifest = SeedManifest(settings.seed_manifest or tmp_path / "seed-manifest.sqlite3")
+
+    with measure_test_case("test_search_query_latency_matrix"):
+        with allure_step(
+            f"Индексы {list(config.index_sizes)}, limit {list(config.limits)}, "
+            f"{config.queries} запросов на класс"
+        ):
+            report = SearchBenchmark(search_service_client, manifest, config).run()
+        attach_text("Search latency matrix", report.format_table())
+        attach_json("Search latency matrix json", json.dumps(report.to_dict(), indent=2))
+
+    assert report.errors == 0, report.format_table()
+    # Индексация не досоздала записи — ячейки измерены не на заявленном размере индекса
+    short = sorted({(c.segment, c.index_size, c.indexed) for c in report.incomplete})
+    assert not short, f"Индекс не дозаполнен (сегмент, размер, в индексе): {short}"
+    # Запросы без совпадений не должны возвращать записи: иначе q не применяется
+    leaking = [c.to_dict() for c in report.cells if c.query_class == "no_hit" and any(c.hits)]
+    assert not leaking, f"no_hit-запросы вернули результаты: {leaking}"
+    slow = {
+        key: round(ratio, 1) for key, ratio in report.growth().items() if ratio > MAX_INDEX_SLOWDOWN
+    }
+    assert not slow, f"p95 растёт с размером индекса: {slow}\n{report.format_table()}"
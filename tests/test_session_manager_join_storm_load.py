@@ -0,0 +1,65 @@
+"""Нагрузочный сценарий session-manager-service: join storm — всплеск присоединений к сессиям."""
+
+from __future__ import annotations
+
+import json
+from typing import AsyncIterator
+
+import allure
+import pytest
+
+from qa_tests.allure_utils import allure_step, attach_json, attach_text, mark_feature, mark_story
+from qa_tests.async_http_client import AsyncSessionManagerServiceClient
+from qa_tests.join_storm import JoinStorm, JoinStormConfig
+from qa_tests.metrics import measure_test_case
+
+# Допустимая доля 5xx и ошибок соединения среди join_session
+MAX_ERROR_RATE = 0.01
+# Список участников должен догнать последний успешный join не позже чем за столько секунд
+MAX_CONVERGENCE_SECONDS = 5.0
+
+
+@pytest.fixture
+async def storm_client(settings) -> AsyncIterator[AsyncSessionManagerServiceClient]:
+    """Асинхронный клиент с пулом соединений на все одновременные join."""
+    client = AsyncSessionManagerServiceClient(
+        base_url=settings.session_manager_service.base_url,
+        pool_size=max(
+            settings.session_manager_service.pool_size, settings.load.join_storm_concurrency
+        ),
+    )
+    yield client
+    await client.aclose()
+
+
+@pytest.mark.load
+@pytest.mark.asyncio
+@allure.tag("session-manager", "load")
+async def test_session_join_storm(storm_client: AsyncSessionManagerServiceClient, settings) -> None:
+    """Тысячи join_session по PIN и по id на сессию за секунды, с опросом участников."""
+    mark_feature("Session manager")
+    mark_story("Всплеск присоединений к сессии")
+    load_cfg = settings.load
+    config = JoinStormConfig(
+        sessions=load_cfg.join_storm_sessions,
+        joins_per_session=load_cfg.join_storm_joins,
+        pin_share=load_cfg.join_storm_pin_share,
+        burst_seconds=load_cfg.join_storm_burst_seconds,
+        concurrency=load_cfg.join_storm_concurrency,
+        convergence_timeout=MAX_CONVERGENCE_SECONDS * 2,
+    )
+
+    with measure_test_case("test_session_join_storm"):
+        with allure_step(
+            f"{config.sessions} сессий × {config.joins_per_session} join "
+            f"за {config.burst_seconds}s, в полёте до {config.concurrency}"
+        ):
+            report = await JoinStorm(storm_client, config).run()
+        attach_text("Join storm", report.format_table())
+        attach_json("Join storm json", json.dumps(report.to_dict(), indent=2))
+
+    assert report.create_failures == 0, f"Не созданы сессии: {report.create_failures}"
+    assert report.join_error_rate <= MAX_ERROR_RATE, report.format_table()
+    assert report.lost_participants == 0, report.format_table()
+    assert report.unconverged == 0, report.format_table()
+    assert report.convergence().max <= MAX_CONVERGENCE_SECONDS, report.format_table()
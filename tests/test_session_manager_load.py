@@ -0,0 +1,79 @@
+"""Нагрузочный сценарий session-manager-service: POST /session/join по open-loop профилю."""
+
+from __future__ import annotations
+
+import json
+import uuid
+from typing import Iterator
+
+import allure
+import pytest
+
+from qa_tests.allure_utils import allure_step, attach_json, attach_text, mark_feature, mark_story
+from qa_tests.http_client import SessionManagerServiceClient
+from qa_tests.load import LoadOperation, OpenLoopLoadGenerator, ramp_profile
+from qa_tests.metrics import measure_test_case
+
+# Допустимая доля 5xx/ошибок соединения за прогон
+MAX_ERROR_RATE = 0.01
+
+
+@pytest.fixture
+def load_client(settings) -> Iterator[SessionManagerServiceClient]:
+    """Клиент с пулом соединений на все потоки генератора: иначе в задержку попадают handshake."""
+    client = SessionManagerServiceClient(
+        base_url=settings.session_manager_service.base_url,
+        pool_size=max(settings.session_manager_service.pool_size, settings.load.max_workers),
+    )
+    yield client
+    client.close()
+
+
+@pytest.mark.load
+@allure.tag("session-manager", "load")
+def test_join_session_open_loop_load(load_client: SessionManagerServiceClient, settings) -> None:
+    """POST /session/join и GET /session/{id} под нагрузкой LOAD_TARGET_RPS без 5xx."""
+    mark_feature("Session Manager")
+    mark_story("Нагрузка на присоединение к сессии")
+
+    with measure_test_case("test_join_session_open_loop_load"):
+        with allure_step("Создание сессии для присоединения"):
+            create = load_client.create_session(str(uuid.uuid4()))
+            assert create.status_code in (200, 201) and create.json is not None
+            session_id = create.json["id"]
+            pin = create.json["pin"]
+
+        load_cfg = settings.load
+        operations = [
+            LoadOperation(
+                "POST /session/join",
+                lambda i: load_client.join_session(
+                    session_id, pin, f"load-user-{i}-{uuid.uuid4()}"
+                ),
+                weight=3.0,
+            ),
+            LoadOperation(
+                "GET /session/{id}",
+                lambda i: load_client.get_session(session_id),
+            ),
+        ]
+        phases = ramp_profile(
+            target_rps=load_cfg.target_rps,
+            ramp_up=load_cfg.ramp_up_seconds,
+            steady=load_cfg.steady_seconds,
+            ramp_down=load_cfg.ramp_down_seconds,
+        )
+
+        with allure_step(f"Open-loop нагрузка до {load_cfg.target_rps} rps"):
+            report = OpenLoopLoadGenerator(
+                operations, phases, max_workers=load_cfg.max_workers
+            ).run()
+            attach_text("load_report", report.format_table())
+            attach_json("load_report_json", json.dumps(report.to_dict(), indent=2))
+
+        assert report.dropped == 0, f"Генератор не успевал отправлять запросы: {report.dropped}"
+        for name, stats in report.operations.items():
+            assert stats.count > 0, f"{name}: нет выполненных запросов"
+            assert (
+                stats.error_rate <= MAX_ERROR_RATE
+            ), f"{name}: доля ошибок {stats.error_rate:.2%} > {MAX_ERROR_RATE:.0%}"
@@ -18,27 +18,12 @@ from qa_tests.allure_utils import (
 )
 from qa_tests.http_client import ApiGatewayClient
 from qa_tests.metrics import measure_test_case
-
-
-def _register_and_get_token(api_gateway_client: ApiGatewayClient) -> tuple[dict, str, str]:
-    """Регистрация, логин, возврат (payload, token, user_id)."""
-    payload = data_factory.build_user_registration()
-    api_gateway_client.register_user(payload)
-    auth_resp = api_gateway_client.authenticate(
-        {"email": payload["email"], "password": payload["password"]}
-    )
-    assert auth_resp.status_code == 200 and auth_resp.json
-    token = auth_resp.json.get("accessToken") or auth_resp.json.get("access_token")
-    me_resp = api_gateway_client.get_me(token)
-    assert me_resp.status_code == 200 and me_resp.json
-    user_id = me_resp.json.get("id")
-    assert user_id
-    return payload, token, user_id
+from qa_tests.user_pool import PooledUser
 
 
 @pytest.mark.smoke
 @allure.tag("sessions", "user-service")
-def test_create_session(api_gateway_client: ApiGatewayClient) -> None:
+def test_create_session(api_gateway_client: ApiGatewayClient, pooled_user: PooledUser) -> None:
     """POST /users/{id}/sessions создаёт сессию и возвращает 201."""
     mark_feature("Sessions")
     mark_story("Создание сессии")
@@ -46,7 +31,7 @@ def test_create_session(api_gateway_client: ApiGatewayClient) -> None:
     link_jira("PSDS-201")
 
     with measure_test_case("test_create_session"):
-        _, token, user_id = _register_and_get_token(api_gateway_client)
+        token, user_id = pooled_user.access_token, pooled_user.user_id
         session_payload = data_factory.build_create_session_payload(
             session_type="consultation", participant_role="host"
         )
@@ -61,7 +46,7 @@ def test_create_session(api_gateway_client: ApiGatewayClient) -> None:
 
 @pytest.mark.smoke
 @allure.tag("sessions", "user-service")
-def test_list_user_sessions(api_gateway_client: ApiGatewayClient) -> None:
+def test_list_user_sessions(api_gateway_client: ApiGatewayClient, pooled_user: PooledUser) -> None:
     """GET /users/{id}/sessions возвращает список сессий."""
     mark_feature("Sessions")
     mark_story("Список сессий пользователя")
@@ -69,7 +54,7 @@ def test_list_user_sessions(api_gateway_client: ApiGatewayClient) -> None:
     link_jira("PSDS-202")
 
     with measure_test_case("test_list_user_sessions"):
-        _, token, user_id = _register_and_get_token(api_gateway_client)
+        token, user_id = pooled_user.access_token, pooled_user.user_id
         resp = api_gateway_client.list_user_sessions(token, user_id, limit=10, offset=0)
         assert resp.status_code == 200
         assert resp.json is not None
@@ -78,7 +63,9 @@ def test_list_user_sessions(api_gateway_client: ApiGatewayClient) -> None:
 
 @pytest.mark.smoke
 @allure.tag("sessions", "user-service")
-def test_list_active_sessions(api_gateway_client: ApiGatewayClient) -> None:
+def test_list_active_sessions(
+    api_gateway_client: ApiGatewayClient, pooled_user: PooledUser
+) -> None:
     """GET /users/{id}/active-sessions возвращает активные сессии."""
     mark_feature("Sessions")
     mark_story("Активные сессии")
@@ -86,7 +73,7 @@ def test_list_active_sessions(api_gateway_client: ApiGatewayClient) -> None:
     link_jira("PSDS-203")
 
     with measure_test_case("test_list_active_sessions"):
-        _, token, user_id = _register_and_get_token(api_gateway_client)
+        token, user_id = pooled_user.access_token, pooled_user.user_id
         resp = api_gateway_client.list_active_sessions(token, user_id)
         assert resp.status_code == 200
         assert resp.json is not None
@@ -95,7 +82,7 @@ def test_list_active_sessions(api_gateway_client: ApiGatewayClient) -> None:
 
 @pytest.mark.smoke
 @allure.tag("sessions", "user-service")
-def test_validate_session(api_gateway_client: ApiGatewayClient) -> None:
+def test_validate_session(api_gateway_client: ApiGatewayClient, pooled_user: PooledUser) -> None:
     """POST /sessions/validate проверяет доступ к сессии."""
     mark_feature("Sessions")
     mark_story("Валидация сессии")
@@ -103,8 +90,7 @@ def test_validate_session(api_gateway_client: ApiGatewayClient) -> None:
     link_jira("PSDS-204")
 
     with measure_test_case("test_validate_session"):
-        _, token, user_id = _register_and_get_token(api_gateway_client)
-        payload = data_factory.build_validate_session_payload(user_id=user_id)
+        payload = data_factory.build_validate_session_payload(user_id=pooled_user.user_id)
         resp = api_gateway_client.validate_session(payload)
         assert resp.status_code == 200
         assert resp.json is not None
@@ -113,7 +99,9 @@ def test_validate_session(api_gateway_client: ApiGatewayClient) -> None:
 
 @pytest.mark.negative
 @allure.tag("sessions", "user-service")
-def test_create_session_invalid_type(api_gateway_client: ApiGatewayClient) -> None:
+def test_create_session_invalid_type(
+    api_gateway_client: ApiGatewayClient, pooled_user: PooledUser
+) -> None:
     """Создание сессии с невалидным session_type возвращает 400."""
     mark_feature("Sessions")
     mark_story("Валидация создания сессии")
@@ -121,7 +109,7 @@ def test_create_session_invalid_type(api_gateway_client: ApiGatewayClient) -> No
     link_jira("PSDS-401")
 
     with measure_test_case("test_create_session_invalid_type"):
-        _, token, user_id = _register_and_get_token(api_gateway_client)
+        token, user_id = pooled_user.access_token, pooled_user.user_id
         payload = data_factory.build_create_session_payload(
             session_type="invalid_type",
             participant_role="host",
@@ -138,7 +126,9 @@ def test_create_session_invalid_type(api_gateway_client: ApiGatewayClient) -> No
 
 @pytest.mark.negative
 @allure.tag("sessions", "user-service")
-def test_list_sessions_unauthorized_returns_401(api_gateway_client: ApiGatewayClient) -> None:
+def test_list_sessions_unauthorized_returns_401(
+    api_gateway_client: ApiGatewayClient, pooled_user: PooledUser
+) -> None:
     """GET /users/{id}/sessions без токена возвращает 401 (One Behavior Per Test)."""
     mark_feature("Sessions")
     mark_story("Список сессий")
@@ -146,7 +136,7 @@ def test_list_sessions_unauthorized_returns_401(api_gateway_client: ApiGatewayCl
     link_jira("PSDS-402")
 
     with measure_test_case("test_list_sessions_unauthorized_returns_401"):
-        _, _, user_id = _register_and_get_token(api_gateway_client)
+        user_id = pooled_user.user_id
         resp = api_gateway_client._request(
             "GET",
             api_gateway_client._p("users_sessions", id=user_id),
@@ -157,7 +147,9 @@ def test_list_sessions_unauthorized_returns_401(api_gateway_client: ApiGatewayCl
 
 @pytest.mark.negative
 @allure.tag("sessions", "user-service")
-def test_create_session_unauthorized_returns_401(api_gateway_client: ApiGatewayClient) -> None:
+def test_create_session_unauthorized_returns_401(
+    api_gateway_client: ApiGatewayClient, pooled_user: PooledUser
+) -> None:
     """POST /users/{id}/sessions без токена возвращает 401 (One Behavior Per Test)."""
     mark_feature("Sessions")
     mark_story("Создание сессии")
@@ -165,7 +157,7 @@ def test_create_session_unauthorized_returns_401(api_gateway_client: ApiGatewayC
     link_jira("PSDS-402")
 
     with measure_test_case("test_create_session_unauthorized_returns_401"):
-        _, _, user_id = _register_and_get_token(api_gateway_client)
+        user_id = pooled_user.user_id
         payload = data_factory.build_create_session_payload()
         resp = api_gateway_client._request(
             "POST",
@@ -0,0 +1,62 @@
+"""Нагрузочный сценарий streaming-service: fan-out кадров WebSocket на операторов и супервизоров."""
+
+from __future__ import annotations
+
+import json
+import uuid
+
+import allure
+import pytest
+
+from qa_tests.allure_utils import allure_step, attach_json, attach_text, mark_feature, mark_story
+from qa_tests.http_client import StreamingServiceClient
+from qa_tests.metrics import measure_test_case
+from qa_tests.ws_fanout import FanoutConfig, WebSocketFanoutHarness
+
+# Допустимая доля недоставленных кадров за прогон
+MAX_DROP_RATE = 0.001
+
+
+@pytest.mark.load
+@pytest.mark.asyncio
+@allure.tag("streaming", "websocket", "load")
+async def test_stream_broadcast_fanout_load(
+    streaming_service_client: StreamingServiceClient, settings
+) -> None:
+    """N издателей и M подписчиков в каждой из LOAD_WS_SESSIONS сессий: кадры доходят без потерь."""
+    mark_feature("Streaming")
+    mark_story("Fan-out трансляции на операторов")
+
+    load_cfg = settings.load
+    config = FanoutConfig(
+        sessions=load_cfg.ws_sessions,
+        publishers_per_session=load_cfg.ws_publishers,
+        subscribers_per_session=load_cfg.ws_subscribers,
+        frames_per_publisher=load_cfg.ws_frames,
+        frame_rate=load_cfg.ws_frame_rate,
+        payload_bytes=load_cfg.ws_payload_bytes,
+        binary=load_cfg.ws_binary_frames,
+    )
+
+    def create_session() -> tuple[str, str]:
+        client_id = str(uuid.uuid4())
+        create = streaming_service_client.create_session(client_id)
+        assert create.status_code == 201 and create.json is not None
+        return create.json["session_id"], client_id
+
+    with measure_test_case("test_stream_broadcast_fanout_load"):
+        harness = WebSocketFanoutHarness(settings.streaming_ws.base_url, create_session, config)
+        with allure_step(
+            f"Fan-out: {config.sessions} сессий × "
+            f"{config.publishers_per_session}→{config.subscribers_per_session}"
+        ):
+            report = await harness.run()
+            attach_text("fanout_report", report.format_table())
+            attach_json("fanout_report_json", json.dumps(report.to_dict(), indent=2))
+
+    expected = config.expected_per_subscriber * config.sessions * config.subscribers_per_session
+    assert report.connect_failures == 0, f"Не удалось подключиться: {report.connect_failures}"
+    assert (
+        report.dropped <= expected * MAX_DROP_RATE
+    ), f"Потеряно кадров: {report.dropped} из {expected}"
+    assert report.reordered == 0, f"Нарушен порядок кадров: {report.reordered}"
@@ -7,6 +7,7 @@ import uuid
 import pytest
 
 from qa_tests.http_client import TicketServiceClient
+from qa_tests.pagination import scan_tickets
 
 # ID тикета — число (uint64), не UUID
 NONEXISTENT_TICKET_ID = "999999"
@@ -34,6 +35,38 @@ def test_list_tickets_with_params(ticket_service_client: TicketServiceClient) ->
     assert "total" in resp.json
 
 
+@pytest.mark.regression
+def test_list_tickets_pagination_walk(ticket_service_client: TicketServiceClient) -> None:
+    """Обход GET /api/v1/tickets страницами limit/offset: все ответы 200, страницы не больше limit.
+
+    Отсутствие повторов между страницами проверяет нагрузочный обход
+    (test_pagination_depth_load.py): здесь параллельные тесты создают тикеты между
+    запросами страниц и сдвигают offset.
+    """
+    scanner = scan_tickets(ticket_service_client, page_size=5, max_pages=4)
+    for _ in scanner:
+        pass
+    assert scanner.pages, "Ни одной страницы не получено"
+    assert all(page.status_code == 200 for page in scanner.pages)
+    assert all(len(page.items) <= page.limit for page in scanner.pages)
+    assert [page.offset for page in scanner.pages] == [5 * i for i in range(len(scanner.pages))]
+
+
+@pytest.mark.regression
+def test_iter_tickets_matches_list(ticket_service_client: TicketServiceClient) -> None:
+    """Потоковое чтение GET /api/v1/tickets отдаёт те же тикеты, что и обычный ответ."""
+    resp = ticket_service_client.list_tickets(limit=50, offset=0)
+    assert resp.status_code == 200 and resp.json is not None
+    with ticket_service_client.iter_tickets(limit=50, offset=0) as tickets:
+        assert tickets.status_code == 200
+        streamed = [ticket.get("id") for ticket in tickets]
+    expected = {ticket.get("id") for ticket in resp.json.get("tickets") or []}
+    assert len(streamed) == len(set(streamed)) <= 50, f"Тикеты повторяются: {streamed}"
+    # Параллельные тесты могли создать тикеты между запросами и сдвинуть полную страницу
+    missing = expected - set(streamed)
+    assert not missing or len(streamed) == 50, f"Потоковое чтение потеряло тикеты: {missing}"
+
+
 @pytest.mark.smoke
 def test_create_and_get_ticket(ticket_service_client: TicketServiceClient) -> None:
     """POST /api/v1/tickets создаёт тикет, GET возвращает его."""
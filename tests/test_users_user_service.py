@@ -9,11 +9,12 @@ from qa_tests import data_factory
 from qa_tests.allure_utils import allure_step, link_jira, mark_feature, mark_severity, mark_story
 from qa_tests.http_client import ApiGatewayClient
 from qa_tests.metrics import measure_test_case
+from qa_tests.user_pool import PooledUser
 
 
 @pytest.mark.smoke
 @allure.tag("users", "user-service")
-def test_get_user_by_id_self(api_gateway_client: ApiGatewayClient) -> None:
+def test_get_user_by_id_self(api_gateway_client: ApiGatewayClient, pooled_user: PooledUser) -> None:
     """GET /users/{id} с токеном своего пользователя возвращает 200."""
     mark_feature("User Management")
     mark_story("Получение пользователя по ID")
@@ -21,38 +22,20 @@ def test_get_user_by_id_self(api_gateway_client: ApiGatewayClient) -> None:
     link_jira("PSDS-104")
 
     with measure_test_case("test_get_user_by_id_self"):
-        with allure_step("Регистрация и логин"):
-            payload = data_factory.build_user_registration()
-            reg = api_gateway_client.register_user(payload)
-            assert reg.status_code in (200, 201) and reg.json
-            user_id = None
-            if reg.json.get("user") and reg.json["user"].get("id"):
-                user_id = reg.json["user"]["id"]
-            if not user_id and reg.json.get("user", {}).get("id"):
-                user_id = reg.json["user"]["id"]
-            auth_resp = api_gateway_client.authenticate(
-                {"email": payload["email"], "password": payload["password"]}
-            )
-            assert auth_resp.status_code == 200 and auth_resp.json
-            token = auth_resp.json.get("accessToken") or auth_resp.json.get("access_token")
-            if not user_id:
-                me_resp = api_gateway_client.get_me(token)
-                assert me_resp.status_code == 200 and me_resp.json
-                user_id = me_resp.json.get("id")
+        token, user_id = pooled_user.access_token, pooled_user.user_id
 
         with allure_step("Запрос GET /users/{id}"):
-            assert user_id, "user_id должен быть получен из me или register"
             resp = api_gateway_client.get_user(token, user_id)
 
         assert resp.status_code == 200
         assert resp.json and (
-            resp.json.get("id") == user_id or resp.json.get("email") == payload["email"]
+            resp.json.get("id") == user_id or resp.json.get("email") == pooled_user.email
         )
 
 
 @pytest.mark.negative
 @allure.tag("users", "user-service")
-def test_get_user_not_found(api_gateway_client: ApiGatewayClient) -> None:
+def test_get_user_not_found(api_gateway_client: ApiGatewayClient, pooled_user: PooledUser) -> None:
     """GET /users/{id} с несуществующим ID возвращает 404."""
     mark_feature("User Management")
     mark_story("Получение пользователя по ID")
@@ -60,16 +43,10 @@ def test_get_user_not_found(api_gateway_client: ApiGatewayClient) -> None:
     link_jira("PSDS-404")
 
     with measure_test_case("test_get_user_not_found"):
-        payload = data_factory.build_user_registration()
-        api_gateway_client.register_user(payload)
-        auth_resp = api_gateway_client.authenticate(
-            {"email": payload["email"], "password": payload["password"]}
-        )
-        token = auth_resp.json.get("accessToken") or auth_resp.json.get("access_token")
         resp = api_gateway_client._request(
             "GET",
             api_gateway_client._p("users_by_id", id="00000000-0000-0000-0000-000000000000"),
-            headers={"Authorization": f"Bearer {token}"},
+            headers=pooled_user.auth_headers,
             expected_status=None,
         )
         assert resp.status_code == 404
@@ -137,7 +114,9 @@ def test_delete_user_unauthorized_returns_401_or_404(api_gateway_client: ApiGate
 
 @pytest.mark.smoke
 @allure.tag("users", "presence", "user-service")
-def test_update_presence_authenticated(api_gateway_client: ApiGatewayClient) -> None:
+def test_update_presence_authenticated(
+    api_gateway_client: ApiGatewayClient, pooled_user: PooledUser
+) -> None:
     """PUT /users/{user_id}/presence с токеном своего user_id возвращает 200."""
     mark_feature("User Management")
     mark_story("Presence")
@@ -145,17 +124,11 @@ def test_update_presence_authenticated(api_gateway_client: ApiGatewayClient) ->
     link_jira("PSDS-106")
 
     with measure_test_case("test_update_presence_authenticated"):
-        payload = data_factory.build_user_registration()
-        api_gateway_client.register_user(payload)
-        auth_resp = api_gateway_client.authenticate(
-            {"email": payload["email"], "password": payload["password"]}
+        # Presence меняется — пользователь не возвращается в пул
+        pooled_user.retire()
+        resp = api_gateway_client.update_presence(
+            pooled_user.access_token, pooled_user.user_id, is_online=True
         )
-        token = auth_resp.json.get("accessToken") or auth_resp.json.get("access_token")
-        me_resp = api_gateway_client.get_me(token)
-        assert me_resp.status_code == 200 and me_resp.json
-        user_id = me_resp.json.get("id")
-        assert user_id
-        resp = api_gateway_client.update_presence(token, user_id, is_online=True)
         assert resp.status_code == 200
 
 
@@ -17,7 +17,7 @@ from qa_tests.allure_utils import (
     mark_severity,
     mark_story,
 )
-from qa_tests.http_client import ApiGatewayClient
+from qa_tests.async_http_client import AsyncApiGatewayClient
 from qa_tests.metrics import measure_test_case
 from qa_tests.models import AuthRequest, CreateSessionRequest, CreateSessionResponse
 from qa_tests.ws_client import WebSocketClient
@@ -26,7 +26,9 @@ from qa_tests.ws_client import WebSocketClient
 @pytest.mark.websocket
 @pytest.mark.asyncio
 @allure.tag("video", "websocket")
-async def test_video_session_message_exchange(api_gateway_client: ApiGatewayClient) -> None:
+async def test_video_session_message_exchange(
+    async_api_gateway_client: AsyncApiGatewayClient,
+) -> None:
     """Создание видеосессии, подключение оператора и обмен сообщениями по WebSocket."""
     mark_feature("Video Consultation")
     mark_story("Создание сессии и real-time чат")
@@ -37,10 +39,10 @@ async def test_video_session_message_exchange(api_gateway_client: ApiGatewayClie
         # Arrange: пользователь и оператор
         with allure_step("Подготовка пользователя и получение токена"):
             user_payload = data_factory.build_user_registration()
-            reg_resp = api_gateway_client.register_user(user_payload)
+            reg_resp = await async_api_gateway_client.register_user(user_payload)
             assert reg_resp.status_code == 201
 
-            auth = api_gateway_client.authenticate(
+            auth = await async_api_gateway_client.authenticate(
                 AuthRequest(
                     email=user_payload["email"], password=user_payload["password"]
                 ).model_dump()
@@ -51,7 +53,9 @@ async def test_video_session_message_exchange(api_gateway_client: ApiGatewayClie
         with allure_step("Создание видеосессии пользователем"):
             user_id = reg_resp.json["id"]  # type: ignore[index]
             session_req = CreateSessionRequest(user_id=user_id, reason="e2e test").model_dump()
-            session_resp = api_gateway_client.create_video_session(user_token, session_req)
+            session_resp = await async_api_gateway_client.create_video_session(
+                user_token, session_req
+            )
             assert session_resp.status_code == 201 and session_resp.json is not None
             attach_json(
                 "create_session_response",
@@ -61,7 +65,7 @@ async def test_video_session_message_exchange(api_gateway_client: ApiGatewayClie
 
         with allure_step("Подключение оператора к сессии"):
             operator_id = "operator-e2e-1"
-            join_resp = api_gateway_client.join_video_session(
+            join_resp = await async_api_gateway_client.join_video_session(
                 user_token, session.session_id, operator_id
             )
             assert join_resp.status_code == 200
@@ -83,7 +87,7 @@ async def test_video_session_message_exchange(api_gateway_client: ApiGatewayClie
                     "sent_at": time.time(),
                 }
                 await user_ws.send_json(message_payload)
-                received = await operator_ws.receive()
+                received = await operator_ws.receive(parse_json=True)
                 attach_json("received_message", received.raw)
 
                 assert received.json is not None